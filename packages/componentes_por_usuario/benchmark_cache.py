@@ -0,0 +1,209 @@
+# archivo: benchmark_cache.py
+"""Benchmarks del sistema de cache.
+
+Uso:
+    python benchmark_cache.py
+"""
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sistema_de_cache import (CacheItem, CacheManager, EVICTION_POLICIES,
+                               ShardedCacheManager)
+
+HILOS = [1, 2, 4, 8, 16, 32]
+OPERACIONES_POR_HILO = 20_000
+NUM_CLAVES = 10_000
+
+
+def _trabajo(cache, claves: List[str], operaciones: int, barrera: threading.Barrier):
+    """Mezcla 80% lecturas / 20% escrituras sobre claves aleatorias."""
+    rng = random.Random()
+    barrera.wait()
+    for _ in range(operaciones):
+        clave = claves[rng.randrange(len(claves))]
+        if rng.random() < 0.8:
+            cache.get(clave)
+        else:
+            cache.set(clave, clave)
+
+
+def medir_contencion(fabrica: Callable[[], object], num_hilos: int,
+                     operaciones: int = OPERACIONES_POR_HILO) -> float:
+    """Ejecuta el trabajo con ``num_hilos`` hilos y retorna operaciones por segundo."""
+    cache = fabrica()
+    claves = [f"clave:{i}" for i in range(NUM_CLAVES)]
+    for clave in claves:
+        cache.set(clave, clave)
+
+    barrera = threading.Barrier(num_hilos + 1)
+    hilos = [threading.Thread(target=_trabajo, args=(cache, claves, operaciones, barrera))
+             for _ in range(num_hilos)]
+    for hilo in hilos:
+        hilo.start()
+
+    barrera.wait()
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    return num_hilos * operaciones / duracion
+
+
+def benchmark_contencion():
+    """Compara el cache de un solo lock contra el particionado de 1 a 32 hilos."""
+    implementaciones = {
+        'CacheManager': lambda: CacheManager(max_size=NUM_CLAVES),
+        'ShardedCacheManager(16)': lambda: ShardedCacheManager(max_size=NUM_CLAVES, num_shards=16),
+    }
+
+    print("\n=== Contención: operaciones/segundo (80% get / 20% set) ===")
+    print(f"{'hilos':>6} " + " ".join(f"{nombre:>24}" for nombre in implementaciones))
+    for num_hilos in HILOS:
+        resultados = [medir_contencion(fabrica, num_hilos) for fabrica in implementaciones.values()]
+        print(f"{num_hilos:>6} " + " ".join(f"{r:>24,.0f}" for r in resultados))
+
+
+class CacheItemDatetime:
+    """Representación anterior de ``CacheItem`` (datetime + __dict__), como referencia."""
+
+    def __init__(self, value, ttl_seconds=None):
+        self.value = value
+        self.created_at = datetime.now()
+        self.expires_at = None
+        if ttl_seconds:
+            self.expires_at = self.created_at + timedelta(seconds=ttl_seconds)
+
+    def is_expired(self) -> bool:
+        if self.expires_at is None:
+            return False
+        return datetime.now() > self.expires_at
+
+
+def _bytes_por_elemento(clase, n: int = 100_000) -> float:
+    """Mide con tracemalloc la memoria promedio de ``n`` elementos con TTL."""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    elementos = [clase(None, 60) for _ in range(n)]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del elementos
+    return total / n
+
+
+def _ops_por_segundo(funcion: Callable[[int], None], n: int) -> float:
+    inicio = time.perf_counter()
+    funcion(n)
+    return n / (time.perf_counter() - inicio)
+
+
+def benchmark_elementos(n: int = 200_000):
+    """Compara la representación datetime contra la monotónica con __slots__."""
+    print("\n=== CacheItem: creación + is_expired() y memoria por elemento ===")
+    print(f"{'representación':>20} {'ops/s':>14} {'bytes/elemento':>16}")
+    for nombre, clase in (('datetime', CacheItemDatetime), ('monotonic+slots', CacheItem)):
+        def crear_y_consultar(k, clase=clase):
+            for _ in range(k):
+                clase(None, 60).is_expired()
+        ops = _ops_por_segundo(crear_y_consultar, n)
+        print(f"{nombre:>20} {ops:>14,.0f} {_bytes_por_elemento(clase):>16.1f}")
+
+    cache = CacheManager(max_size=NUM_CLAVES, default_ttl=60)
+    claves = [f"clave:{i}" for i in range(NUM_CLAVES)]
+
+    def sets(k):
+        for i in range(k):
+            cache.set(claves[i % NUM_CLAVES], i)
+
+    def gets(k):
+        for i in range(k):
+            cache.get(claves[i % NUM_CLAVES])
+
+    print(f"CacheManager.set: {_ops_por_segundo(sets, n):,.0f} ops/s")
+    print(f"CacheManager.get: {_ops_por_segundo(gets, n):,.0f} ops/s")
+
+
+def generar_traza(n: int = 300_000, num_claves: int = 50_000, zipf_s: float = 1.0,
+                  prob_recorrido: float = 0.3, largo_recorrido: int = 5_000,
+                  semilla: int = 42) -> List[str]:
+    """Genera una traza Zipf intercalada con recorridos secuenciales (scans)."""
+    rng = random.Random(semilla)
+    pesos_acumulados = []
+    total = 0.0
+    for i in range(1, num_claves + 1):
+        total += 1 / i ** zipf_s
+        pesos_acumulados.append(total)
+
+    traza = []
+    siguiente_scan = 0
+    while len(traza) < n:
+        if rng.random() < prob_recorrido / 100:
+            # Recorrido de claves que no se repiten
+            traza.extend(f"scan:{siguiente_scan + i}" for i in range(largo_recorrido))
+            siguiente_scan += largo_recorrido
+        else:
+            claves = rng.choices(range(num_claves), cum_weights=pesos_acumulados, k=100)
+            traza.extend(f"clave:{c}" for c in claves)
+    return traza[:n]
+
+
+def reproducir_traza(cache, traza: List[str]) -> dict:
+    """Reproduce la traza (get y, si falla, set) y retorna tasa de aciertos y ops/s."""
+    inicio = time.perf_counter()
+    for clave in traza:
+        if cache.get(clave) is None:
+            cache.set(clave, clave)
+    duracion = time.perf_counter() - inicio
+    return {
+        'hit_rate_percent': cache.get_stats()['hit_rate_percent'],
+        'ops_por_segundo': len(traza) / duracion,
+    }
+
+
+def benchmark_politicas(capacidad: int = 2_000):
+    """Compara las políticas de expulsión sobre la misma traza."""
+    traza = generar_traza()
+    print(f"\n=== Políticas de expulsión (capacidad={capacidad}, {len(traza):,} accesos) ===")
+    print(f"{'política':>10} {'aciertos %':>12} {'ops/s':>14}")
+    for nombre in EVICTION_POLICIES:
+        resultado = reproducir_traza(CacheManager(max_size=capacidad, policy=nombre), traza)
+        print(f"{nombre:>10} {resultado['hit_rate_percent']:>12.2f} "
+              f"{resultado['ops_por_segundo']:>14,.0f}")
+
+
+def benchmark_lotes(repeticiones: int = 200_000):
+    """Compara el costo por clave de get() en bucle contra get_many() por tamaño de lote."""
+    cache = CacheManager(max_size=NUM_CLAVES)
+    claves = [f"clave:{i}" for i in range(NUM_CLAVES)]
+    cache.set_many({clave: clave for clave in claves})
+
+    print("\n=== Operaciones en lote: nanosegundos por clave ===")
+    print(f"{'lote':>6} {'get() en bucle':>16} {'get_many()':>12} {'set_many()':>12}")
+    for tamano in (1, 10, 100, 1000):
+        lotes = [claves[i:i + tamano] for i in range(0, NUM_CLAVES - tamano + 1, tamano)]
+        num_lotes = max(1, repeticiones // tamano)
+
+        def medir(operacion):
+            inicio = time.perf_counter()
+            for i in range(num_lotes):
+                operacion(lotes[i % len(lotes)])
+            return (time.perf_counter() - inicio) / (num_lotes * tamano) * 1e9
+
+        def en_bucle(lote):
+            for clave in lote:
+                cache.get(clave)
+
+        bucle = medir(en_bucle)
+        get_many = medir(cache.get_many)
+        set_many = medir(lambda lote: cache.set_many(dict.fromkeys(lote, 0)))
+        print(f"{tamano:>6} {bucle:>16.0f} {get_many:>12.0f} {set_many:>12.0f}")
+
+
+if __name__ == "__main__":
+    benchmark_elementos()
+    benchmark_lotes()
+    benchmark_politicas()
+    benchmark_contencion()
@@ -0,0 +1,172 @@
+# archivo: benchmark_usuarios.py
+"""Benchmarks del sistema de gestión de usuarios.
+
+Uso:
+    python benchmark_usuarios.py [num_usuarios]
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from gestor_usuarios_sqlite import GestorUsuariosSQLite
+from sistema_de_gestion_de_usuarios import GestorUsuarios, GestorUsuariosConcurrente
+
+NUM_USUARIOS = 1_000_000
+
+
+def _medir(funcion) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def benchmark_email(n: int = NUM_USUARIOS, consultas: int = 100_000):
+    """Mide la creación masiva y la búsqueda por email con el índice."""
+    gestor = GestorUsuarios()
+    emails = [f"usuario{i}@ejemplo.com" for i in range(n)]
+
+    def crear():
+        for i, email in enumerate(emails):
+            gestor.crear_usuario(f"Usuario {i}", email)
+
+    duracion_crear = _medir(crear)
+    muestra = random.Random(0).choices(emails, k=consultas)
+
+    def buscar():
+        for email in muestra:
+            gestor.buscar_por_email(email.upper())
+
+    duracion_buscar = _medir(buscar)
+
+    print(f"\n=== Índice de email ({n:,} usuarios) ===")
+    print(f"crear_usuario:    {duracion_crear:8.2f} s  ({n / duracion_crear:,.0f} usuarios/s)")
+    print(f"buscar_por_email: {duracion_buscar / consultas * 1e6:8.2f} µs por consulta")
+    return gestor
+
+
+def _bytes_por_usuario(compacto: bool, n: int) -> float:
+    """Memoria de los registros de usuario (sin el índice de email) medida con tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    gestor = GestorUsuarios(compacto=compacto)
+    for i in range(n):
+        gestor.crear_usuario(f"Usuario {i % 1000}", f"usuario{i}@ejemplo.com")
+        if i % 3 == 0:
+            gestor.usuarios[i + 1].registrar_acceso()
+    indice = gestor._indice_email
+    gestor._indice_email = {}
+    del indice
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return total / n
+
+
+def benchmark_memoria(n: int = 200_000):
+    """Compara los bytes por usuario del dict de objetos contra el almacén columnar."""
+    print(f"\n=== Memoria por usuario ({n:,} usuarios) ===")
+    for nombre, compacto in (('dict[int, Usuario]', False), ('AlmacenUsuariosCompacto', True)):
+        print(f"{nombre:>24}: {_bytes_por_usuario(compacto, n):8.1f} bytes/usuario")
+
+
+class _GestorConLockGlobal:
+    """Referencia: GestorUsuarios con un único lock alrededor de cada llamada."""
+
+    def __init__(self):
+        self.gestor = GestorUsuarios()
+        self.lock = threading.Lock()
+
+    def crear_usuario(self, nombre, email):
+        with self.lock:
+            return self.gestor.crear_usuario(nombre, email)
+
+    def registrar_acceso(self, id_usuario):
+        with self.lock:
+            return self.gestor.registrar_acceso(id_usuario)
+
+
+def _escritores(gestor, num_hilos: int, usuarios_por_hilo: int, accesos_por_usuario: int) -> float:
+    barrera = threading.Barrier(num_hilos + 1)
+
+    def trabajo(hilo):
+        rng = random.Random(hilo)
+        ids = []
+        barrera.wait()
+        for i in range(usuarios_por_hilo):
+            ids.append(gestor.crear_usuario(f"Usuario {i}", f"h{hilo}-u{i}@ejemplo.com").id_usuario)
+            for _ in range(accesos_por_usuario):
+                gestor.registrar_acceso(ids[rng.randrange(len(ids))])
+
+    hilos = [threading.Thread(target=trabajo, args=(h,)) for h in range(num_hilos)]
+    for hilo in hilos:
+        hilo.start()
+    barrera.wait()
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    return time.perf_counter() - inicio
+
+
+def benchmark_concurrencia(num_hilos: int = 16, usuarios_por_hilo: int = 5_000,
+                           accesos_por_usuario: int = 10):
+    """Compara un lock global con el gestor concurrente y sus accesos en lote."""
+    operaciones = num_hilos * usuarios_por_hilo * (1 + accesos_por_usuario)
+    print(f"\n=== {num_hilos} escritores concurrentes ({operaciones:,} operaciones) ===")
+    for nombre, fabrica in (('lock global', _GestorConLockGlobal),
+                            ('GestorUsuariosConcurrente', GestorUsuariosConcurrente)):
+        gestor = fabrica()
+        duracion = _escritores(gestor, num_hilos, usuarios_por_hilo, accesos_por_usuario)
+        if isinstance(gestor, GestorUsuariosConcurrente):
+            inicio = time.perf_counter()
+            gestor.vaciar_accesos()
+            duracion += time.perf_counter() - inicio
+        print(f"{nombre:>26}: {duracion:6.2f} s  ({operaciones / duracion:,.0f} ops/s)")
+
+
+def benchmark_sqlite(n: int = NUM_USUARIOS, consultas: int = 100_000):
+    """Compara dict+JSON contra SQLite: creación, búsqueda por email y carga."""
+    emails = [f"usuario{i}@ejemplo.com" for i in range(n)]
+    muestra = random.Random(0).choices(emails, k=consultas)
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_json = os.path.join(directorio, 'usuarios.json')
+        ruta_db = os.path.join(directorio, 'usuarios.db')
+
+        gestor = GestorUsuarios()
+        crear = _medir(lambda: [gestor.crear_usuario(f"Usuario {i}", e) for i, e in enumerate(emails)])
+        buscar = _medir(lambda: [gestor.buscar_por_email(e) for e in muestra])
+        gestor.guardar_en_archivo(ruta_json)
+        del gestor
+        cargar = _medir(lambda: GestorUsuarios().cargar_desde_archivo(ruta_json))
+        resultados['dict + JSON'] = (crear, buscar, cargar)
+
+        sqlite = GestorUsuariosSQLite(ruta_db)
+        crear = _medir(lambda: sqlite.crear_usuarios((f"Usuario {i}", e) for i, e in enumerate(emails)))
+        buscar = _medir(lambda: [sqlite.buscar_por_email(e) for e in muestra])
+        sqlite.cerrar()
+
+        def abrir_y_consultar():
+            gestor_db = GestorUsuariosSQLite(ruta_db)
+            gestor_db.buscar_por_email(emails[-1])
+            gestor_db.cerrar()
+
+        cargar = _medir(abrir_y_consultar)
+        resultados['SQLite (WAL)'] = (crear, buscar, cargar)
+
+    print(f"\n=== dict+JSON vs SQLite ({n:,} usuarios) ===")
+    print(f"{'almacenamiento':>16} {'crear (s)':>10} {'buscar (µs)':>12} {'cargar (s)':>11}")
+    for nombre, (crear, buscar, cargar) in resultados.items():
+        print(f"{nombre:>16} {crear:>10.2f} {buscar / consultas * 1e6:>12.2f} {cargar:>11.3f}")
+
+
+if __name__ == "__main__":
+    num_usuarios = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_USUARIOS
+    benchmark_email(num_usuarios)
+    benchmark_memoria(min(num_usuarios, 200_000))
+    benchmark_concurrencia()
+    benchmark_sqlite(num_usuarios)
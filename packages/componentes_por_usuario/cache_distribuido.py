@@ -0,0 +1,175 @@
+# archivo: cache_distribuido.py
+from typing import Any, Callable, Dict, Iterable, Optional
+import json
+import pickle
+import uuid
+
+try:
+    import redis
+except ImportError:  # redis es opcional: solo se necesita para el nivel L2
+    redis = None
+
+from sistema_de_cache import CacheManager
+
+_MISSING = object()
+
+class TieredCache:
+    """Cache de dos niveles: ``CacheManager`` en proceso (L1) delante de Redis (L2).
+
+    Las lecturas consultan primero L1 y, si fallan, Redis; lo encontrado en
+    Redis se copia a L1 con el TTL que le queda. Las escrituras y borrados van
+    a ambos niveles y se anuncian por pub/sub para que los demás procesos
+    invaliden su L1 y todos los workers vean datos coherentes.
+    """
+
+    def __init__(self, redis_client=None, l1: Optional[CacheManager] = None,
+                 url: str = 'redis://localhost:6379/0', max_connections: int = 50,
+                 prefix: str = 'cache:', default_ttl: Optional[int] = None,
+                 dumps: Callable[[Any], bytes] = pickle.dumps,
+                 loads: Callable[[bytes], Any] = pickle.loads,
+                 channel: str = 'cache:invalidaciones', listen: bool = True):
+        if redis_client is None:
+            if redis is None:
+                raise ImportError("TieredCache requiere el paquete 'redis' (pip install redis)")
+            pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+            redis_client = redis.Redis(connection_pool=pool)
+        self.redis = redis_client
+        self.l1 = l1 if l1 is not None else CacheManager(default_ttl=default_ttl)
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.dumps = dumps
+        self.loads = loads
+        self.channel = channel
+        self._origin = uuid.uuid4().hex
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._invalidations = 0
+        self._pubsub = None
+        self._listener = None
+        if listen:
+            self.start_listener()
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _ttl_ms(self, ttl: Optional[float]) -> Optional[int]:
+        ttl = ttl if ttl is not None else self.default_ttl
+        return int(ttl * 1000) if ttl else None
+
+    def _fill_l1(self, key: str, value: Any, pttl: int) -> None:
+        """Copia a L1 un valor leído de Redis con su TTL restante."""
+        self.l1.set(key, value, pttl / 1000 if pttl and pttl > 0 else None)
+
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Obtiene un valor de L1 o, si no está, de Redis."""
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self._key(key))
+        pipe.pttl(self._key(key))
+        data, pttl = pipe.execute()
+        if data is None:
+            self._l2_misses += 1
+            return default
+
+        self._l2_hits += 1
+        value = self.loads(data)
+        self._fill_l1(key, value, pttl)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Obtiene varias claves; las que faltan en L1 se piden a Redis en un solo pipeline."""
+        keys = list(keys)
+        resultado = self.l1.get_many(keys)
+        faltantes = [key for key in keys if key not in resultado]
+
+        if faltantes:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in faltantes:
+                pipe.get(self._key(key))
+                pipe.pttl(self._key(key))
+            respuestas = pipe.execute()
+            for i, key in enumerate(faltantes):
+                data, pttl = respuestas[2 * i], respuestas[2 * i + 1]
+                if data is None:
+                    self._l2_misses += 1
+                    continue
+                self._l2_hits += 1
+                value = self.loads(data)
+                self._fill_l1(key, value, pttl)
+                resultado[key] = value
+        return resultado
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Escribe en ambos niveles e invalida la clave en los demás procesos."""
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Escribe varias claves con un solo pipeline y un solo aviso de invalidación."""
+        if not items:
+            return
+        ttl_ms = self._ttl_ms(ttl)
+        pipe = self.redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._key(key), self.dumps(value), px=ttl_ms)
+        self._publish(pipe, list(items))
+        pipe.execute()
+        self.l1.set_many(items, ttl)
+
+    def delete(self, key: str) -> bool:
+        """Elimina la clave de ambos niveles y la invalida en los demás procesos."""
+        self.l1.delete(key)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(self._key(key))
+        self._publish(pipe, [key])
+        borradas, _ = pipe.execute()
+        return borradas > 0
+
+    def clear_local(self) -> None:
+        """Limpia solo el nivel L1 de este proceso."""
+        self.l1.clear()
+
+    def _publish(self, pipe, keys) -> None:
+        mensaje = json.dumps({'origin': self._origin, 'keys': keys})
+        pipe.publish(self.channel, mensaje)
+
+    def _on_message(self, message: dict) -> None:
+        """Procesa un aviso de invalidación recibido por pub/sub."""
+        try:
+            datos = json.loads(message['data'])
+        except (TypeError, ValueError):
+            return
+        if datos.get('origin') == self._origin:
+            return
+        for key in datos.get('keys') or ():
+            self.l1.delete(key)
+        self._invalidations += 1
+
+    def start_listener(self) -> None:
+        """Suscribe este proceso al canal de invalidaciones en un hilo aparte."""
+        if self._listener is not None:
+            return
+        self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(sleep_time=0.1, daemon=True)
+
+    def close(self) -> None:
+        """Detiene el hilo de invalidaciones y cierra la suscripción."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def get_stats(self) -> dict:
+        """Obtiene estadísticas de L1 más los aciertos/fallos en Redis."""
+        stats = self.l1.get_stats()
+        stats.update({
+            'l2_hits': self._l2_hits,
+            'l2_misses': self._l2_misses,
+            'invalidations_received': self._invalidations,
+        })
+        return stats
@@ -0,0 +1,259 @@
+# archivo: gestor_usuarios_sqlite.py
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+import json
+import sqlite3
+
+from sistema_de_gestion_de_usuarios import (
+    Usuario, _a_microsegundos, _desde_microsegundos, normalizar_email
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_usuario        INTEGER PRIMARY KEY,
+    nombre            TEXT    NOT NULL,
+    email             TEXT    NOT NULL,
+    email_normalizado TEXT    NOT NULL,
+    fecha_creacion    INTEGER NOT NULL,
+    activo            INTEGER NOT NULL DEFAULT 1,
+    ultimo_acceso     INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios (email_normalizado);
+CREATE INDEX IF NOT EXISTS idx_usuarios_activos ON usuarios (id_usuario) WHERE activo = 1;
+CREATE INDEX IF NOT EXISTS idx_usuarios_acceso ON usuarios (ultimo_acceso, id_usuario);
+CREATE TABLE IF NOT EXISTS metadatos (clave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+"""
+
+_COLUMNAS = "id_usuario, nombre, email, fecha_creacion, activo, ultimo_acceso"
+
+# Sentencias fijas: el módulo sqlite3 las prepara una vez y las reutiliza
+_INSERTAR = ("INSERT INTO usuarios (id_usuario, nombre, email, email_normalizado, "
+             "fecha_creacion, activo, ultimo_acceso) VALUES (?, ?, ?, ?, ?, ?, ?)")
+_POR_ID = f"SELECT {_COLUMNAS} FROM usuarios WHERE id_usuario = ?"
+_POR_EMAIL = f"SELECT {_COLUMNAS} FROM usuarios WHERE email_normalizado = ?"
+_ACTIVOS = (f"SELECT {_COLUMNAS} FROM usuarios WHERE activo = 1 AND id_usuario >= ? "
+            "ORDER BY id_usuario")
+_POR_ACCESO = (f"SELECT {_COLUMNAS} FROM usuarios WHERE ultimo_acceso >= ? AND ultimo_acceso < ? "
+               "ORDER BY ultimo_acceso, id_usuario")
+_ACTIVOS_LIMITE = f"{_ACTIVOS} LIMIT ?"
+_SIN_ACCESO = f"SELECT {_COLUMNAS} FROM usuarios WHERE ultimo_acceso IS NULL ORDER BY id_usuario"
+_SIN_ACCESO_LIMITE = f"{_SIN_ACCESO} LIMIT ?"
+_GUARDAR_PROXIMO_ID = "INSERT OR REPLACE INTO metadatos (clave, valor) VALUES ('proximo_id', ?)"
+
+class GestorUsuariosSQLite:
+    """Gestor de usuarios con almacenamiento en SQLite y la misma API que ``GestorUsuarios``.
+
+    Los datos viven en disco, así que el tamaño no está limitado por la
+    memoria. La base se abre en modo WAL, el email normalizado tiene un
+    índice único y hay índices para usuarios activos y por último acceso.
+    Los ``Usuario`` retornados quedan vinculados al gestor: ``activar``,
+    ``desactivar`` y ``registrar_acceso`` se guardan en la base.
+
+    La conexión pertenece al hilo que crea el gestor.
+    """
+
+    def __init__(self, ruta: str = 'usuarios.db'):
+        self.ruta = ruta
+        self._conexion = sqlite3.connect(ruta, cached_statements=64)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(_ESQUEMA)
+        self._conexion.commit()
+
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos."""
+        self._conexion.close()
+
+    @property
+    def proximo_id(self) -> int:
+        fila = self._conexion.execute(
+            "SELECT MAX(COALESCE((SELECT valor FROM metadatos WHERE clave = 'proximo_id'), 1), "
+            "COALESCE((SELECT MAX(id_usuario) FROM usuarios), 0) + 1)").fetchone()
+        return fila[0]
+
+    @proximo_id.setter
+    def proximo_id(self, valor: int) -> None:
+        with self._conexion:
+            self._conexion.execute(_GUARDAR_PROXIMO_ID, (valor,))
+
+    def _a_usuario(self, fila: Optional[tuple]) -> Optional[Usuario]:
+        """Construye un ``Usuario`` vinculado al gestor a partir de una fila."""
+        if fila is None:
+            return None
+        id_usuario, nombre, email, fecha_creacion, activo, ultimo_acceso = fila
+        usuario = Usuario(id_usuario, nombre, email)
+        usuario.fecha_creacion = _desde_microsegundos(fecha_creacion)
+        usuario.activo = bool(activo)
+        if ultimo_acceso is not None:
+            usuario.ultimo_acceso = _desde_microsegundos(ultimo_acceso)
+        usuario._observador = self
+        return usuario
+
+    @staticmethod
+    def _a_fila(usuario: Usuario) -> tuple:
+        return (usuario.id_usuario, usuario.nombre, usuario.email,
+                normalizar_email(usuario.email), _a_microsegundos(usuario.fecha_creacion),
+                int(usuario.activo),
+                _a_microsegundos(usuario.ultimo_acceso) if usuario.ultimo_acceso else None)
+
+    def _usuario_modificado(self, usuario: Usuario, campo: str) -> None:
+        """Llamado por ``Usuario`` cuando uno de sus métodos lo modifica."""
+        with self._conexion:
+            if campo == 'activo':
+                self._conexion.execute("UPDATE usuarios SET activo = ? WHERE id_usuario = ?",
+                                       (int(usuario.activo), usuario.id_usuario))
+            elif campo == 'ultimo_acceso':
+                self._conexion.execute("UPDATE usuarios SET ultimo_acceso = ? WHERE id_usuario = ?",
+                                       (_a_microsegundos(usuario.ultimo_acceso), usuario.id_usuario))
+
+    def crear_usuario(self, nombre: str, email: str) -> Usuario:
+        """Crea un nuevo usuario."""
+        usuario = Usuario(self.proximo_id, nombre, email)
+        try:
+            # El próximo id se guarda en la misma transacción: los ids de
+            # usuarios eliminados no se reutilizan
+            with self._conexion:
+                self._conexion.execute(_INSERTAR, self._a_fila(usuario))
+                self._conexion.execute(_GUARDAR_PROXIMO_ID, (usuario.id_usuario + 1,))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Ya existe un usuario con el email {email}") from None
+        usuario._observador = self
+        return usuario
+
+    def crear_usuarios(self, datos: Iterable[Tuple[str, str]]) -> int:
+        """Crea muchos usuarios ``(nombre, email)`` en una sola transacción con ``executemany``.
+
+        Si algún email está repetido no se crea ninguno.
+
+        Returns:
+            Cantidad de usuarios creados
+        """
+        siguiente = self.proximo_id
+        ahora = _a_microsegundos(datetime.now())
+        filas = []
+        for nombre, email in datos:
+            filas.append((siguiente, nombre, email, normalizar_email(email), ahora, 1, None))
+            siguiente += 1
+        try:
+            with self._conexion:
+                self._conexion.executemany(_INSERTAR, filas)
+                self._conexion.execute(_GUARDAR_PROXIMO_ID, (siguiente,))
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Email duplicado en la carga masiva: {e}") from None
+        return len(filas)
+
+    def obtener_usuario(self, id_usuario: int) -> Optional[Usuario]:
+        """Obtiene un usuario por su ID."""
+        return self._a_usuario(self._conexion.execute(_POR_ID, (id_usuario,)).fetchone())
+
+    def buscar_por_email(self, email: str) -> Optional[Usuario]:
+        """Busca un usuario por su email (sin distinguir mayúsculas)."""
+        fila = self._conexion.execute(_POR_EMAIL, (normalizar_email(email),)).fetchone()
+        return self._a_usuario(fila)
+
+    def actualizar_email(self, id_usuario: int, nuevo_email: str) -> bool:
+        """Cambia el email de un usuario."""
+        try:
+            with self._conexion:
+                cursor = self._conexion.execute(
+                    "UPDATE usuarios SET email = ?, email_normalizado = ? WHERE id_usuario = ?",
+                    (nuevo_email, normalizar_email(nuevo_email), id_usuario))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Ya existe un usuario con el email {nuevo_email}") from None
+        return cursor.rowcount > 0
+
+    def registrar_acceso(self, id_usuario: int) -> bool:
+        """Registra el acceso de un usuario por su ID."""
+        with self._conexion:
+            cursor = self._conexion.execute(
+                "UPDATE usuarios SET ultimo_acceso = ? WHERE id_usuario = ?",
+                (_a_microsegundos(datetime.now()), id_usuario))
+        return cursor.rowcount > 0
+
+    def listar_usuarios_activos(self, desde_id: int = 0,
+                                limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios activos en orden de id."""
+        if limite is None:
+            filas = self._conexion.execute(_ACTIVOS, (desde_id,))
+        else:
+            filas = self._conexion.execute(_ACTIVOS_LIMITE, (desde_id, limite))
+        return [self._a_usuario(f) for f in filas]
+
+    def iterar_activos(self, desde_id: int = 0) -> Iterator[Usuario]:
+        """Itera los usuarios activos en orden de id."""
+        for fila in self._conexion.execute(_ACTIVOS, (desde_id,)):
+            yield self._a_usuario(fila)
+
+    def contar_activos(self) -> int:
+        """Retorna la cantidad de usuarios activos."""
+        return self._conexion.execute("SELECT COUNT(*) FROM usuarios WHERE activo = 1").fetchone()[0]
+
+    def iterar_por_acceso(self, desde: Optional[datetime] = None,
+                          hasta: Optional[datetime] = None) -> Iterator[Usuario]:
+        """Itera en orden de último acceso los usuarios con acceso en [desde, hasta)."""
+        rango = (_a_microsegundos(desde) if desde else -(2 ** 63),
+                 _a_microsegundos(hasta) if hasta else 2 ** 63 - 1)
+        for fila in self._conexion.execute(_POR_ACCESO, rango):
+            yield self._a_usuario(fila)
+
+    def usuarios_por_acceso(self, desde: Optional[datetime] = None,
+                            hasta: Optional[datetime] = None,
+                            limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios con último acceso en [desde, hasta), del más antiguo al más reciente."""
+        resultado = []
+        for usuario in self.iterar_por_acceso(desde, hasta):
+            if limite is not None and len(resultado) >= limite:
+                break
+            resultado.append(usuario)
+        return resultado
+
+    def usuarios_sin_acceso_desde(self, fecha: datetime, incluir_sin_acceso: bool = True,
+                                  limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios no vistos desde ``fecha``."""
+        resultado = []
+        if incluir_sin_acceso:
+            if limite is None:
+                filas = self._conexion.execute(_SIN_ACCESO)
+            else:
+                filas = self._conexion.execute(_SIN_ACCESO_LIMITE, (limite,))
+            resultado = [self._a_usuario(f) for f in filas]
+        restantes = None if limite is None else limite - len(resultado)
+        if restantes is None or restantes > 0:
+            resultado.extend(self.usuarios_por_acceso(hasta=fecha, limite=restantes))
+        return resultado
+
+    def eliminar_usuario(self, id_usuario: int) -> bool:
+        """Elimina un usuario del sistema."""
+        with self._conexion:
+            cursor = self._conexion.execute("DELETE FROM usuarios WHERE id_usuario = ?",
+                                            (id_usuario,))
+        return cursor.rowcount > 0
+
+    def guardar_en_archivo(self, nombre_archivo: str):
+        """Exporta todos los usuarios al formato JSON de ``GestorUsuarios``."""
+        with open(nombre_archivo, 'w', encoding='utf-8') as archivo:
+            archivo.write('{"usuarios": [')
+            filas = self._conexion.execute(f"SELECT {_COLUMNAS} FROM usuarios ORDER BY id_usuario")
+            for i, fila in enumerate(filas):
+                if i:
+                    archivo.write(', ')
+                json.dump(self._a_usuario(fila).to_dict(), archivo, ensure_ascii=False)
+            archivo.write(f'], "proximo_id": {self.proximo_id}}}')
+
+    def cargar_desde_archivo(self, nombre_archivo: str):
+        """Reemplaza el contenido de la base con un archivo JSON de ``GestorUsuarios``."""
+        try:
+            with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
+                datos = json.load(archivo)
+        except FileNotFoundError:
+            print(f"Archivo {nombre_archivo} no encontrado. Iniciando con lista vacía.")
+            return
+
+        filas = (self._a_fila(Usuario.from_dict(d)) for d in datos['usuarios'])
+        with self._conexion:
+            self._conexion.execute("DELETE FROM usuarios")
+            self._conexion.executemany(_INSERTAR, filas)
+            self._conexion.execute(_GUARDAR_PROXIMO_ID, (datos['proximo_id'],))
+
+    def __len__(self) -> int:
+        return self._conexion.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
@@ -1,89 +1,492 @@
 # archivo: cache_manager.py
-from typing import Any, Optional
-from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from time import monotonic
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import logging
+import os
+import pickle
+import sys
 import threading
+import time
 from collections import OrderedDict
 
+logger = logging.getLogger(__name__)
+
 class CacheItem:
-    """Elemento individual del cache."""
+    """Elemento individual del cache.
+    
+    Usa ``__slots__`` y guarda la expiración como un instante de
+    ``time.monotonic()``, de modo que consultar la expiración no crea objetos
+    ``datetime`` y no se ve afectado por cambios en el reloj del sistema.
+    """
+    
+    __slots__ = ('value', 'expires_at', 'size')
     
-    def __init__(self, value: Any, ttl_seconds: Optional[int] = None):
+    def __init__(self, value: Any, ttl_seconds: Optional[float] = None, size: int = 0):
         self.value = value
-        self.created_at = datetime.now()
-        self.expires_at = None
-        if ttl_seconds:
-            self.expires_at = self.created_at + timedelta(seconds=ttl_seconds)
+        self.expires_at = monotonic() + ttl_seconds if ttl_seconds else None
+        self.size = size
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Verifica si el elemento ha expirado."""
         if self.expires_at is None:
             return False
-        return datetime.now() > self.expires_at
+        return (monotonic() if now is None else now) > self.expires_at
+
+class EvictionPolicy:
+    """Interfaz de política de expulsión para ``CacheManager``.
+    
+    El gestor notifica los accesos, inserciones y retiradas de claves, y
+    cuando necesita espacio pide a la política una víctima entre las claves
+    almacenadas. Todos los métodos se llaman con el lock del cache tomado.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+    
+    def record_access(self, key: str) -> None:
+        """Registra un acierto sobre una clave almacenada."""
+    
+    def record_miss(self, key: str) -> None:
+        """Registra un fallo de lectura sobre una clave."""
+    
+    def record_insert(self, key: str) -> None:
+        """Registra la inserción de una clave nueva."""
+    
+    def record_remove(self, key: str) -> None:
+        """Registra que una clave dejó de estar en el cache."""
+    
+    def victim(self, cache: OrderedDict) -> str:
+        """Retorna la clave a expulsar. ``cache`` está en orden LRU."""
+        raise NotImplementedError
+
+class LRUPolicy(EvictionPolicy):
+    """Expulsa la clave usada menos recientemente."""
+    
+    name = 'lru'
+    
+    def victim(self, cache: OrderedDict) -> str:
+        # El gestor ya mantiene el OrderedDict en orden de uso
+        return next(iter(cache))
+
+class LFUPolicy(EvictionPolicy):
+    """Expulsa la clave con menor frecuencia de uso (LRU entre empates) en O(1)."""
+    
+    name = 'lfu'
+    
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self._freqs = {}     # clave -> frecuencia
+        self._buckets = {}   # frecuencia -> OrderedDict de claves (orden LRU)
+        self._min_freq = 0
+    
+    def _bucket(self, freq: int) -> OrderedDict:
+        bucket = self._buckets.get(freq)
+        if bucket is None:
+            bucket = self._buckets[freq] = OrderedDict()
+        return bucket
+    
+    def record_access(self, key: str) -> None:
+        freq = self._freqs[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freqs[key] = freq + 1
+        self._bucket(freq + 1)[key] = None
+    
+    def record_insert(self, key: str) -> None:
+        self._freqs[key] = 1
+        self._bucket(1)[key] = None
+        self._min_freq = 1
+    
+    def record_remove(self, key: str) -> None:
+        freq = self._freqs.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+    
+    def victim(self, cache: OrderedDict) -> str:
+        if self._min_freq not in self._buckets:
+            # min_freq quedó obsoleto tras retiradas explícitas
+            self._min_freq = min(self._buckets)
+        return next(iter(self._buckets[self._min_freq]))
+
+class CountMinSketch:
+    """Estimador aproximado de frecuencias con envejecimiento periódico.
+    
+    Cuando el número de incrementos alcanza ``sample_size`` todos los
+    contadores se dividen a la mitad, para que la popularidad antigua decaiga.
+    """
+    
+    def __init__(self, width: int, depth: int = 4, sample_size: Optional[int] = None):
+        self.width = max(16, width)
+        self.depth = depth
+        self.sample_size = sample_size or 10 * self.width
+        self._tables = [[0] * self.width for _ in range(depth)]
+        self._seeds = [0x9E3779B1 * (i + 1) for i in range(depth)]
+        self._additions = 0
+    
+    def _indexes(self, key):
+        h = hash(key)
+        return [((h ^ seed) * 0x85EBCA6B >> 7) % self.width for seed in self._seeds]
+    
+    def increment(self, key) -> None:
+        for table, i in zip(self._tables, self._indexes(key)):
+            if table[i] < 15:  # contadores saturados de 4 bits
+                table[i] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self._reset()
+    
+    def estimate(self, key) -> int:
+        return min(table[i] for table, i in zip(self._tables, self._indexes(key)))
+    
+    def _reset(self) -> None:
+        for table in self._tables:
+            for i, count in enumerate(table):
+                table[i] = count >> 1
+        self._additions //= 2
+
+class WTinyLFUPolicy(EvictionPolicy):
+    """W-TinyLFU: ventana LRU pequeña delante de una región principal SLRU.
+    
+    Las claves nuevas entran en la ventana. Cuando hace falta espacio, la
+    clave más antigua de la ventana (candidata) compite con la víctima de la
+    región principal y, según el ``CountMinSketch``, se conserva la de mayor
+    frecuencia. Así un recorrido secuencial no desplaza a las claves populares.
+    """
+    
+    name = 'tinylfu'
+    
+    def __init__(self, capacity: int, window_percent: float = 0.01,
+                 protected_percent: float = 0.8):
+        super().__init__(capacity)
+        self.window_capacity = max(1, int(capacity * window_percent))
+        main_capacity = max(1, capacity - self.window_capacity)
+        self.main_capacity = main_capacity
+        self.protected_capacity = max(1, int(main_capacity * protected_percent))
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self.sketch = CountMinSketch(capacity)
+    
+    def record_access(self, key: str) -> None:
+        self.sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            # Promover a la región protegida
+            del self._probation[key]
+            self._protected[key] = None
+            if len(self._protected) > self.protected_capacity:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+    
+    def record_miss(self, key: str) -> None:
+        self.sketch.increment(key)
+    
+    def record_insert(self, key: str) -> None:
+        self._window[key] = None
+        # Mientras la región principal tenga espacio, la ventana desborda sin competir
+        while (len(self._window) > self.window_capacity and
+               len(self._probation) + len(self._protected) < self.main_capacity):
+            candidate, _ = self._window.popitem(last=False)
+            self._probation[candidate] = None
+    
+    def record_remove(self, key: str) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+    
+    def _main_victim(self) -> Optional[str]:
+        for segment in (self._probation, self._protected):
+            if segment:
+                return next(iter(segment))
+        return None
+    
+    def victim(self, cache: OrderedDict) -> str:
+        main_victim = self._main_victim()
+        if len(self._window) < self.window_capacity and main_victim is not None:
+            return main_victim
+        if not self._window:
+            return main_victim
+        candidate = next(iter(self._window))
+        if main_victim is None:
+            return candidate
+        # Filtro de admisión: la candidata entra solo si es más frecuente
+        if self.sketch.estimate(candidate) > self.sketch.estimate(main_victim):
+            del self._window[candidate]
+            self._probation[candidate] = None
+            return main_victim
+        return candidate
+
+EVICTION_POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'tinylfu': WTinyLFUPolicy,
+}
+
+def make_policy(policy: Union[str, EvictionPolicy], capacity: int) -> EvictionPolicy:
+    """Construye una política a partir de su nombre o retorna la instancia dada."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return EVICTION_POLICIES[policy](capacity)
+    except KeyError:
+        raise ValueError(f"Política desconocida: {policy!r}. "
+                         f"Opciones: {', '.join(EVICTION_POLICIES)}") from None
+
+def dataframe_sizer(value: Any) -> int:
+    """Estima el tamaño en bytes de un valor.
+    
+    Para objetos de pandas (``DataFrame``/``Series``) usa
+    ``memory_usage(deep=True)``; para el resto, ``sys.getsizeof``.
+    """
+    memory_usage = getattr(value, 'memory_usage', None)
+    if memory_usage is not None:
+        try:
+            uso = memory_usage(deep=True)
+            return int(uso.sum()) if hasattr(uso, 'sum') else int(uso)
+        except TypeError:
+            pass
+    return sys.getsizeof(value)
+
+SNAPSHOT_MAGIC = b'CACHESNAP1\n'
+
+def write_snapshot(path: str, entries: Iterable[Tuple[str, CacheItem]]) -> int:
+    """Escribe entradas ``(clave, item)`` en un archivo binario de snapshot.
+    
+    Cada entrada se serializa con pickle en cuanto se lee, sin construir el
+    archivo en memoria, y se guarda con su TTL restante; las expiradas se
+    omiten. Se escribe en un archivo temporal que luego reemplaza al destino,
+    de modo que un fallo a mitad de escritura no deja un snapshot corrupto.
+    
+    Returns:
+        Cantidad de entradas escritas
+    """
+    tmp_path = f"{path}.tmp"
+    written = 0
+    with open(tmp_path, 'wb') as archivo:
+        archivo.write(SNAPSHOT_MAGIC)
+        pickler = pickle.Pickler(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.dump(time.time())
+        now = monotonic()
+        for key, item in entries:
+            if item.expires_at is None:
+                remaining = None
+            else:
+                remaining = item.expires_at - now
+                if remaining <= 0:
+                    continue
+            pickler.dump((key, item.value, remaining))
+            # Evitar que el memo de pickle retenga todos los objetos escritos
+            pickler.clear_memo()
+            written += 1
+        pickler.dump(None)
+    os.replace(tmp_path, path)
+    return written
+
+def read_snapshot(path: str) -> Iterator[Tuple[str, Any, Optional[float]]]:
+    """Lee un snapshot entrada por entrada como ``(clave, valor, ttl_restante)``.
+    
+    El TTL restante descuenta el tiempo transcurrido desde que se escribió el
+    snapshot, y las entradas que ya expiraron no se devuelven.
+    """
+    with open(path, 'rb') as archivo:
+        if archivo.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} no es un snapshot de cache válido")
+        unpickler = pickle.Unpickler(archivo)
+        elapsed = max(0.0, time.time() - unpickler.load())
+        while True:
+            record = unpickler.load()
+            if record is None:
+                return
+            key, value, remaining = record
+            if remaining is not None:
+                remaining -= elapsed
+                if remaining <= 0:
+                    continue
+            yield key, value, remaining
 
 class CacheManager:
-    """Gestor de cache thread-safe con TTL y límite de tamaño."""
+    """Gestor de cache thread-safe con TTL y límite de tamaño.
+    
+    Además de ``max_size`` (número de entradas) se puede limitar la memoria
+    con ``max_bytes``: el tamaño de cada valor se calcula con ``sizer``
+    (por defecto ``sys.getsizeof``) y se expulsan entradas hasta respetar
+    el presupuesto. Un valor más grande que ``max_bytes`` no se almacena; se
+    cuenta en ``get_stats()['rejected_oversized']``.
     
-    def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = None):
+    La víctima de cada expulsión la elige ``policy``: ``'lru'`` (por defecto),
+    ``'lfu'``, ``'tinylfu'`` o una instancia de ``EvictionPolicy``.
+    """
+    
+    def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 sizer: Optional[Callable[[Any], int]] = None,
+                 policy: Union[str, EvictionPolicy] = 'lru'):
         self.max_size = max_size
+        self._policy = make_policy(policy, max_size)
         self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        if sizer is None and max_bytes is not None:
+            sizer = sys.getsizeof
+        self.sizer = sizer
+        self._current_bytes = 0
         self._cache = OrderedDict()
         self._lock = threading.RLock()
         self._hits = 0
         self._misses = 0
+        self._batch_operations = 0
+        self._batch_keys = 0
+        self._rejected_oversized = 0
+        # Índice de expiración: min-heap de (expires_at, seq, key). Las entradas
+        # de claves sobrescritas o eliminadas se descartan de forma perezosa.
+        self._expiry_heap = []
+        self._expiry_seq = itertools.count()
+        self._sweeper = None
     
-    def get(self, key: str) -> Optional[Any]:
-        """Obtiene un valor del cache."""
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Obtiene un valor del cache (o ``default`` si no está)."""
         with self._lock:
-            if key not in self._cache:
+            item = self._cache.get(key)
+            if item is None:
                 self._misses += 1
-                return None
-            
-            item = self._cache[key]
+                self._policy.record_miss(key)
+                return default
             
             # Verificar expiración
-            if item.is_expired():
-                del self._cache[key]
+            if item.expires_at is not None and monotonic() > item.expires_at:
+                self._discard(key)
                 self._misses += 1
-                return None
+                self._policy.record_miss(key)
+                return default
             
             # Mover al final (LRU)
             self._cache.move_to_end(key)
+            self._policy.record_access(key)
             self._hits += 1
             return item.value
     
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Obtiene varias claves tomando el lock una sola vez.
+        
+        Retorna un diccionario solo con las claves encontradas.
+        """
+        resultado = {}
+        with self._lock:
+            # Misma lógica que get(), con búsquedas locales y contadores acumulados
+            cache = self._cache
+            policy = self._policy
+            now = monotonic()
+            hits = misses = 0
+            for key in keys:
+                item = cache.get(key)
+                if item is None or (item.expires_at is not None and now > item.expires_at):
+                    if item is not None:
+                        self._discard(key)
+                    misses += 1
+                    policy.record_miss(key)
+                    continue
+                cache.move_to_end(key)
+                policy.record_access(key)
+                hits += 1
+                resultado[key] = item.value
+            self._hits += hits
+            self._misses += misses
+            self._record_batch(hits + misses)
+        return resultado
+    
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """Establece un valor en el cache."""
+        # Medir el valor fuera del lock: el sizer puede recorrer estructuras grandes
+        size = self.sizer(value) if self.sizer is not None else 0
         with self._lock:
-            # Usar TTL específico o por defecto
-            ttl_to_use = ttl if ttl is not None else self.default_ttl
-            
-            # Crear nuevo item
-            item = CacheItem(value, ttl_to_use)
-            
-            # Si la clave ya existe, actualizarla
-            if key in self._cache:
-                self._cache[key] = item
-                self._cache.move_to_end(key)
-                return
-            
-            # Si el cache está lleno, remover el más antiguo
-            if len(self._cache) >= self.max_size:
-                self._cache.popitem(last=False)  # Remover el primero (más antiguo)
-            
-            self._cache[key] = item
+            self._set_locked(key, value, ttl, size)
+    
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Establece varias claves tomando el lock una sola vez."""
+        sizer = self.sizer
+        sized = [(key, value, sizer(value) if sizer is not None else 0)
+                 for key, value in items.items()]
+        with self._lock:
+            for key, value, size in sized:
+                self._set_locked(key, value, ttl, size)
+            self._record_batch(len(sized))
+    
+    def _set_locked(self, key: str, value: Any, ttl: Optional[int], size: int) -> None:
+        """Inserta o reemplaza una clave de ``size`` bytes (debe llamarse con el lock tomado)."""
+        # Un valor que no cabe en todo el presupuesto no se almacena
+        if self.max_bytes is not None and size > self.max_bytes:
+            self._discard(key)
+            self._rejected_oversized += 1
+            return
+        
+        # Usar TTL específico o por defecto
+        ttl_to_use = ttl if ttl is not None else self.default_ttl
+        
+        # Crear nuevo item
+        item = CacheItem(value, ttl_to_use, size)
+        
+        # Si la clave ya existe, retirarla para reinsertarla al final
+        self._discard(key)
+        
+        # Si el cache está lleno, expulsar según la política
+        cache = self._cache
+        while cache and (len(cache) >= self.max_size or
+                         (self.max_bytes is not None and
+                          self._current_bytes + item.size > self.max_bytes)):
+            self._discard(self._policy.victim(cache))
+        
+        cache[key] = item
+        self._current_bytes += item.size
+        self._policy.record_insert(key)
+        # Después de guardar el item: si el índice se compacta, la clave ya está en el cache
+        if item.expires_at is not None:
+            self._schedule_expiry(key, item.expires_at)
     
     def delete(self, key: str) -> bool:
         """Elimina una clave del cache."""
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+            return self._discard(key)
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Elimina varias claves tomando el lock una sola vez.
+        
+        Retorna la cantidad de claves que estaban en el cache.
+        """
+        with self._lock:
+            total = 0
+            eliminadas = 0
+            for key in keys:
+                total += 1
+                eliminadas += self._discard(key)
+            self._record_batch(total)
+            return eliminadas
     
     def clear(self) -> None:
         """Limpia todo el cache."""
         with self._lock:
+            for key in self._cache:
+                self._policy.record_remove(key)
             self._cache.clear()
+            self._expiry_heap.clear()
+            self._current_bytes = 0
     
     def size(self) -> int:
         """Retorna el tamaño actual del cache."""
@@ -102,18 +505,521 @@ class CacheManager:
                 'total_requests': total_requests,
                 'hit_rate_percent': round(hit_rate, 2),
                 'current_size': len(self._cache),
-                'max_size': self.max_size
+                'max_size': self.max_size,
+                'current_bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'policy': self._policy.name,
+                'batch_operations': self._batch_operations,
+                'batch_keys': self._batch_keys,
+                'avg_batch_size': round(self._batch_keys / self._batch_operations, 2)
+                                  if self._batch_operations else 0,
+                'rejected_oversized': self._rejected_oversized
             }
     
-    def cleanup_expired(self) -> int:
-        """Limpia elementos expirados y retorna la cantidad eliminada."""
+    def cleanup_expired(self, limit: Optional[int] = None) -> int:
+        """Limpia elementos expirados y retorna la cantidad eliminada.
+        
+        Solo recorre el índice de expiración, nunca las claves vigentes. Con
+        ``limit`` se procesan como máximo ese número de entradas del índice, lo
+        que acota el tiempo que se mantiene el lock.
+        """
         with self._lock:
-            expired_keys = []
-            for key, item in self._cache.items():
-                if item.is_expired():
-                    expired_keys.append(key)
+            now = monotonic()
+            heap = self._expiry_heap
+            removed = 0
+            processed = 0
+            while heap and heap[0][0] <= now:
+                if limit is not None and processed >= limit:
+                    break
+                _, _, key = heapq.heappop(heap)
+                processed += 1
+                item = self._cache.get(key)
+                # La entrada puede ser obsoleta (clave sobrescrita o eliminada)
+                if item is not None and item.is_expired(now):
+                    self._discard(key)
+                    removed += 1
+            return removed
+    
+    def snapshot(self, path: str) -> int:
+        """Guarda las entradas vigentes en ``path``, en orden LRU, con su TTL restante.
+        
+        Bajo el lock solo se copian las referencias; la serialización y la
+        escritura en disco ocurren fuera del lock.
+        
+        Returns:
+            Cantidad de entradas guardadas
+        """
+        with self._lock:
+            entries = list(self._cache.items())
+        return write_snapshot(path, entries)
+    
+    def restore(self, path: str) -> int:
+        """Carga un snapshot creado con ``snapshot()`` omitiendo lo ya expirado.
+        
+        Las entradas se insertan de la más antigua a la más reciente, así el
+        orden LRU se conserva y, si no caben todas, se quedan las más recientes.
+        
+        Returns:
+            Cantidad de entradas cargadas
+        """
+        restored = 0
+        for key, value, remaining in read_snapshot(path):
+            # ttl=0 indica "sin expiración" (el ttl None usaría default_ttl)
+            self.set(key, value, remaining if remaining is not None else 0)
+            restored += 1
+        return restored
+    
+    def start_sweeper(self, interval: float = 1.0, batch_size: int = 1000) -> None:
+        """Inicia un hilo en segundo plano que elimina elementos expirados."""
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = ExpirySweeper(self, interval, batch_size)
+            self._sweeper.start()
+    
+    def stop_sweeper(self) -> None:
+        """Detiene el hilo de limpieza en segundo plano, si existe."""
+        if self._sweeper is not None:
+            self._sweeper.stop()
+            self._sweeper = None
+    
+    def _record_batch(self, num_keys: int) -> None:
+        self._batch_operations += 1
+        self._batch_keys += num_keys
+    
+    def _discard(self, key: str) -> bool:
+        """Retira una clave actualizando el contador de bytes (con el lock tomado)."""
+        item = self._cache.pop(key, None)
+        if item is None:
+            return False
+        self._current_bytes -= item.size
+        self._policy.record_remove(key)
+        return True
+    
+    def _schedule_expiry(self, key: str, expires_at: float) -> None:
+        """Registra la expiración de una clave (debe llamarse con el lock tomado)."""
+        heap = self._expiry_heap
+        heapq.heappush(heap, (expires_at, next(self._expiry_seq), key))
+        # Compactar si las entradas obsoletas dominan el índice
+        if len(heap) > 2 * len(self._cache) + 1024:
+            self._expiry_heap = [
+                (item.expires_at, next(self._expiry_seq), k)
+                for k, item in self._cache.items() if item.expires_at is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+
+class ExpirySweeper(threading.Thread):
+    """Hilo que limpia periódicamente los elementos expirados de un cache.
+    
+    En cada ronda llama a ``cleanup_expired(batch_size)`` hasta que no quedan
+    elementos por limpiar, liberando el lock entre lotes para no bloquear a
+    los lectores.
+    """
+    
+    def __init__(self, cache, interval: float = 1.0, batch_size: int = 1000):
+        super().__init__(name="cache-expiry-sweeper", daemon=True)
+        self.cache = cache
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+    
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            while self.cache.cleanup_expired(self.batch_size) > 0:
+                if self._stop_event.is_set():
+                    return
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Solicita la detención del hilo y espera a que termine."""
+        self._stop_event.set()
+        self.join(timeout)
+
+class ShardedCacheManager:
+    """Cache thread-safe particionado en segmentos independientes (lock striping).
+    
+    Cada clave se asigna por hash a un segmento, que es un ``CacheManager``
+    con su propio ``OrderedDict``, lock y LRU. Así, hilos que trabajan con
+    claves distintas rara vez compiten por el mismo lock.
+    
+    ``max_size`` y ``max_bytes`` se reparten entre los segmentos: cada uno
+    tiene ``shard_max_bytes`` (``max_bytes // num_shards``) bytes, así que un
+    valor más grande que eso no se almacena aunque quepa en ``max_bytes``
+    y se cuenta en ``get_stats()['rejected_oversized']``.
+    """
+    
+    def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = None,
+                 num_shards: int = 16, max_bytes: Optional[int] = None,
+                 sizer: Optional[Callable[[Any], int]] = None, policy: str = 'lru'):
+        if num_shards < 1:
+            raise ValueError("num_shards debe ser al menos 1")
+        if not isinstance(policy, str):
+            raise ValueError("Cada segmento necesita su propia política: indique su nombre")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.num_shards = num_shards
+        self.max_bytes = max_bytes
+        # Repartir la capacidad total entre los segmentos (redondeando hacia arriba)
+        shard_size = max(1, -(-max_size // num_shards))
+        self.shard_max_bytes = max(1, max_bytes // num_shards) if max_bytes is not None else None
+        self._shards = [CacheManager(shard_size, default_ttl, self.shard_max_bytes, sizer, policy)
+                        for _ in range(num_shards)]
+        self._sweeper = None
+    
+    def _shard_for(self, key: str) -> CacheManager:
+        """Retorna el segmento responsable de una clave."""
+        return self._shards[hash(key) % self.num_shards]
+    
+    def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Obtiene un valor del cache (o ``default`` si no está)."""
+        return self._shard_for(key).get(key, default)
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Establece un valor en el cache."""
+        self._shard_for(key).set(key, value, ttl)
+    
+    def _group_by_shard(self, keys: Iterable[str]) -> Dict[int, list]:
+        """Agrupa las claves por segmento para tomar cada lock una sola vez."""
+        grupos = {}
+        num_shards = self.num_shards
+        for key in keys:
+            grupos.setdefault(hash(key) % num_shards, []).append(key)
+        return grupos
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Obtiene varias claves tomando una vez el lock de cada segmento implicado."""
+        resultado = {}
+        for indice, claves in self._group_by_shard(keys).items():
+            resultado.update(self._shards[indice].get_many(claves))
+        return resultado
+    
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Establece varias claves tomando una vez el lock de cada segmento implicado."""
+        for indice, claves in self._group_by_shard(items).items():
+            self._shards[indice].set_many({k: items[k] for k in claves}, ttl)
+    
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Elimina varias claves y retorna cuántas estaban en el cache."""
+        return sum(self._shards[indice].delete_many(claves)
+                   for indice, claves in self._group_by_shard(keys).items())
+    
+    def delete(self, key: str) -> bool:
+        """Elimina una clave del cache."""
+        return self._shard_for(key).delete(key)
+    
+    def clear(self) -> None:
+        """Limpia todos los segmentos."""
+        for shard in self._shards:
+            shard.clear()
+    
+    def size(self) -> int:
+        """Retorna el tamaño actual del cache."""
+        return sum(shard.size() for shard in self._shards)
+    
+    def get_stats(self) -> dict:
+        """Obtiene estadísticas agregadas de todos los segmentos."""
+        shard_stats = [shard.get_stats() for shard in self._shards]
+        hits = sum(s['hits'] for s in shard_stats)
+        misses = sum(s['misses'] for s in shard_stats)
+        total_requests = hits + misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+        # Cada lote se cuenta por segmento: el promedio es por lock tomado
+        batch_operations = sum(s['batch_operations'] for s in shard_stats)
+        batch_keys = sum(s['batch_keys'] for s in shard_stats)
+        
+        return {
+            'hits': hits,
+            'misses': misses,
+            'total_requests': total_requests,
+            'hit_rate_percent': round(hit_rate, 2),
+            'current_size': sum(s['current_size'] for s in shard_stats),
+            'max_size': self.max_size,
+            'current_bytes': sum(s['current_bytes'] for s in shard_stats),
+            'max_bytes': self.max_bytes,
+            'shard_max_bytes': self.shard_max_bytes,
+            'rejected_oversized': sum(s['rejected_oversized'] for s in shard_stats),
+            'policy': shard_stats[0]['policy'],
+            'batch_operations': batch_operations,
+            'batch_keys': batch_keys,
+            'avg_batch_size': round(batch_keys / batch_operations, 2) if batch_operations else 0,
+            'num_shards': self.num_shards,
+            'shard_sizes': [s['current_size'] for s in shard_stats]
+        }
+    
+    def cleanup_expired(self, limit: Optional[int] = None) -> int:
+        """Limpia elementos expirados de todos los segmentos.
+        
+        ``limit`` se aplica por segmento, así cada lock se mantiene un tiempo acotado.
+        """
+        return sum(shard.cleanup_expired(limit) for shard in self._shards)
+    
+    def snapshot(self, path: str) -> int:
+        """Guarda las entradas vigentes de todos los segmentos en ``path``."""
+        entries = []
+        for shard in self._shards:
+            with shard._lock:
+                entries.extend(shard._cache.items())
+        return write_snapshot(path, entries)
+    
+    def restore(self, path: str) -> int:
+        """Carga un snapshot creado con ``snapshot()`` omitiendo lo ya expirado."""
+        restored = 0
+        for key, value, remaining in read_snapshot(path):
+            self.set(key, value, remaining if remaining is not None else 0)
+            restored += 1
+        return restored
+    
+    def start_sweeper(self, interval: float = 1.0, batch_size: int = 1000) -> None:
+        """Inicia un hilo en segundo plano que limpia todos los segmentos."""
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = ExpirySweeper(self, interval, batch_size)
+            self._sweeper.start()
+    
+    def stop_sweeper(self) -> None:
+        """Detiene el hilo de limpieza en segundo plano, si existe."""
+        if self._sweeper is not None:
+            self._sweeper.stop()
+            self._sweeper = None
+
+_MISSING = object()
+
+class AsyncCacheManager:
+    """Interfaz asíncrona sobre un ``CacheManager`` para servidores asyncio.
+    
+    Las operaciones sobre el cache en memoria son O(1) y no esperan E/S, por
+    lo que se ejecutan directamente en el event loop. ``get_or_compute`` agrupa
+    los fallos concurrentes de una misma clave en un único cálculo, y las
+    funciones síncronas se ejecutan en un executor para no bloquear el loop.
+    Comparte la semántica de TTL, expulsión y estadísticas del cache subyacente.
+    """
+    
+    def __init__(self, cache: Optional[CacheManager] = None, **kwargs):
+        self.cache = cache if cache is not None else CacheManager(**kwargs)
+        self._pending = {}  # clave -> asyncio.Task del cálculo en curso
+        self._coalesced = 0
+    
+    async def get(self, key: str, default: Any = None) -> Optional[Any]:
+        """Obtiene un valor del cache (o ``default`` si no está)."""
+        return self.cache.get(key, default)
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Establece un valor en el cache."""
+        self.cache.set(key, value, ttl)
+    
+    async def delete(self, key: str) -> bool:
+        """Elimina una clave del cache."""
+        return self.cache.delete(key)
+    
+    async def clear(self) -> None:
+        """Limpia todo el cache."""
+        self.cache.clear()
+    
+    async def get_or_compute(self, key: str, factory: Callable[[], Any],
+                             ttl: Optional[int] = None) -> Any:
+        """Retorna el valor de ``key`` o lo calcula con ``factory`` y lo guarda.
+        
+        ``factory`` puede ser una función ``async def`` o una función síncrona
+        (que se ejecuta en el executor por defecto del loop). Si ya hay un
+        cálculo en curso para la clave, se espera ese mismo resultado.
+        
+        El cálculo corre en su propia tarea: cancelar a uno de los que esperan
+        (incluido el que lo inició) no cancela el cálculo ni a los demás.
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        task = self._pending.get(key)
+        if task is not None:
+            self._coalesced += 1
+        else:
+            task = asyncio.get_running_loop().create_task(self._compute(key, factory, ttl))
+            task.add_done_callback(_retrieve_exception)
+            self._pending[key] = task
+        return await asyncio.shield(task)
+    
+    async def _compute(self, key: str, factory: Callable[[], Any], ttl: Optional[int]) -> Any:
+        try:
+            if inspect.iscoroutinefunction(factory):
+                value = await factory()
+            else:
+                value = await asyncio.get_running_loop().run_in_executor(None, factory)
+                # Una lambda o un partial que envuelve una corrutina devuelve un awaitable
+                if inspect.isawaitable(value):
+                    value = await value
+            self.cache.set(key, value, ttl)
+            return value
+        finally:
+            del self._pending[key]
+    
+    def size(self) -> int:
+        """Retorna el tamaño actual del cache."""
+        return self.cache.size()
+    
+    def get_stats(self) -> dict:
+        """Obtiene estadísticas del cache, incluidas las peticiones agrupadas."""
+        stats = self.cache.get_stats()
+        stats['coalesced_requests'] = self._coalesced
+        stats['in_flight'] = len(self._pending)
+        return stats
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    """Marca la excepción de ``task`` como recuperada aunque nadie la haya esperado."""
+    if not task.cancelled():
+        task.exception()
+
+class _Flight:
+    """Cálculo en curso para una clave (single-flight en código síncrono)."""
+    
+    __slots__ = ('event', 'value', 'error')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+def _default_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    """Construye la clave de cache a partir de la función y sus argumentos."""
+    return f"{func.__module__}.{func.__qualname__}:{args!r}:{sorted(kwargs.items())!r}"
+
+def cached(cache, ttl: Optional[float] = None, stale_ttl: float = 0,
+           key: Optional[Callable[..., str]] = None):
+    """Decorador que memoiza una función (síncrona o ``async def``) en ``cache``.
+    
+    - Single-flight: si varias llamadas piden la misma clave ausente, solo una
+      ejecuta la función y las demás esperan su resultado.
+    - Stale-while-revalidate: durante ``stale_ttl`` segundos después de que un
+      valor deja de estar fresco (``ttl``), se sigue devolviendo mientras se
+      recalcula en segundo plano. Si el refresco falla, el error se registra
+      con ``logging`` y se sigue sirviendo el valor obsoleto.
+    
+    Args:
+        cache: ``CacheManager`` o cualquier objeto con ``get``/``set``/``delete``
+        ttl: Segundos que un valor se considera fresco (None usa el del cache)
+        stale_ttl: Segundos adicionales en que se sirve el valor obsoleto
+        key: Función ``key(*args, **kwargs)`` que genera la clave de cache
+    
+    Returns:
+        Decorador; la función decorada expone ``invalidate(*args, **kwargs)``
+    """
+    if stale_ttl and not ttl:
+        raise ValueError("stale_ttl requiere un ttl")
+    # El cache guarda (valor, fresco_hasta) para distinguir valores None y obsoletos
+    cache_ttl = ttl + stale_ttl if ttl else None
+    
+    def decorator(func):
+        def make_key(args, kwargs):
+            return key(*args, **kwargs) if key is not None else _default_key(func, args, kwargs)
+        
+        def store(cache_key, value):
+            fresh_until = monotonic() + ttl if ttl else None
+            cache.set(cache_key, (value, fresh_until), cache_ttl)
+        
+        def lookup(cache_key):
+            """Retorna (encontrado, valor, obsoleto)."""
+            entry = cache.get(cache_key)
+            if entry is None:
+                return False, None, False
+            value, fresh_until = entry
+            return True, value, fresh_until is not None and monotonic() > fresh_until
+        
+        def invalidate(*args, **kwargs):
+            return cache.delete(make_key(args, kwargs))
+        
+        if inspect.iscoroutinefunction(func):
+            pending = {}  # clave -> asyncio.Task del cálculo en curso
+            refreshes = set()  # refrescos en segundo plano; el loop solo guarda referencias débiles
+            
+            async def compute(cache_key, args, kwargs):
+                try:
+                    value = await func(*args, **kwargs)
+                    store(cache_key, value)
+                    return value
+                finally:
+                    del pending[cache_key]
+            
+            def start(cache_key, args, kwargs):
+                """Retorna la tarea en curso de la clave o lanza una nueva."""
+                task = pending.get(cache_key)
+                if task is None:
+                    task = asyncio.get_running_loop().create_task(compute(cache_key, args, kwargs))
+                    task.add_done_callback(_retrieve_exception)
+                    pending[cache_key] = task
+                return task
             
-            for key in expired_keys:
-                del self._cache[key]
+            def refresh_done(task):
+                refreshes.discard(task)
+                if not task.cancelled() and task.exception() is not None:
+                    logger.warning("Error al refrescar %s en segundo plano",
+                                   func.__qualname__, exc_info=task.exception())
             
-            return len(expired_keys)
\ No newline at end of file
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = make_key(args, kwargs)
+                found, value, stale = lookup(cache_key)
+                if not found:
+                    # shield: cancelar a un llamador no cancela el cálculo compartido
+                    return await asyncio.shield(start(cache_key, args, kwargs))
+                if stale and cache_key not in pending:
+                    task = start(cache_key, args, kwargs)
+                    refreshes.add(task)
+                    task.add_done_callback(refresh_done)
+                return value
+            
+            async_wrapper.invalidate = invalidate
+            return async_wrapper
+        
+        flights = {}  # clave -> _Flight del cálculo en curso
+        flights_lock = threading.Lock()
+        
+        def start_flight(cache_key):
+            """Retorna (flight, es_lider)."""
+            with flights_lock:
+                flight = flights.get(cache_key)
+                if flight is not None:
+                    return flight, False
+                flight = flights[cache_key] = _Flight()
+                return flight, True
+        
+        def run_flight(cache_key, flight, args, kwargs):
+            try:
+                flight.value = func(*args, **kwargs)
+                store(cache_key, flight.value)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with flights_lock:
+                    del flights[cache_key]
+                flight.event.set()
+        
+        def refresh(cache_key, flight, args, kwargs):
+            """Recalcula en segundo plano; el error solo se registra."""
+            run_flight(cache_key, flight, args, kwargs)
+            if flight.error is not None:
+                logger.warning("Error al refrescar %s en segundo plano",
+                               func.__qualname__, exc_info=flight.error)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = make_key(args, kwargs)
+            found, value, stale = lookup(cache_key)
+            if found and not stale:
+                return value
+            
+            flight, leader = start_flight(cache_key)
+            if found:
+                # Servir el valor obsoleto y refrescar en segundo plano
+                if leader:
+                    threading.Thread(target=refresh, daemon=True,
+                                     args=(cache_key, flight, args, kwargs)).start()
+                return value
+            
+            if leader:
+                run_flight(cache_key, flight, args, kwargs)
+            else:
+                flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        
+        wrapper.invalidate = invalidate
+        return wrapper
+    
+    return decorator
\ No newline at end of file
@@ -1,11 +1,25 @@
 # archivo: usuario_manager.py
-from datetime import datetime
-from typing import List, Optional
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Iterator, List, Optional
+import functools
 import json
+import os
+import sys
+import threading
+import time
 
 class Usuario:
     """Componente que representa un usuario del sistema."""
     
+    # Objeto notificado cuando un método cambia el usuario (lo asigna GestorUsuarios)
+    _observador = None
+    
     def __init__(self, id_usuario: int, nombre: str, email: str):
         self.id_usuario = id_usuario
         self.nombre = nombre
@@ -17,14 +31,22 @@ class Usuario:
     def activar(self):
         """Activa el usuario."""
         self.activo = True
+        self._notificar_cambio('activo')
     
     def desactivar(self):
         """Desactiva el usuario."""
         self.activo = False
+        self._notificar_cambio('activo')
     
     def registrar_acceso(self):
         """Registra el último acceso del usuario."""
         self.ultimo_acceso = datetime.now()
+        self._notificar_cambio('ultimo_acceso')
+    
+    def _notificar_cambio(self, campo: str):
+        """Avisa al gestor (si hay uno) de que un campo del usuario fue modificado."""
+        if self._observador is not None:
+            self._observador._usuario_modificado(self, campo)
     
     def to_dict(self) -> dict:
         """Convierte el usuario a diccionario para serialización."""
@@ -50,44 +72,533 @@ class Usuario:
     def __str__(self):
         return f"Usuario({self.id_usuario}, {self.nombre}, {self.email})"
 
-class GestorUsuarios:
-    """Componente para gestionar múltiples usuarios."""
+_EPOCH = datetime(1970, 1, 1)
+_MICROSEGUNDO = timedelta(microseconds=1)
+_SIN_ACCESO = -(2 ** 63)
+
+def _a_microsegundos(fecha: datetime) -> int:
+    """Convierte un datetime (sin zona horaria) a microsegundos desde 1970."""
+    return (fecha - _EPOCH) // _MICROSEGUNDO
+
+def _desde_microsegundos(valor: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=valor)
+
+class UsuarioVista:
+    """Vista sobre una fila de ``AlmacenUsuariosCompacto`` con la interfaz de ``Usuario``.
+    
+    No copia datos: lee y escribe directamente en las columnas del almacén.
+    """
+    
+    __slots__ = ('_almacen', 'id_usuario')
+    
+    @property
+    def _observador(self):
+        return self._almacen.observador
+    
+    def __init__(self, almacen: 'AlmacenUsuariosCompacto', id_usuario: int):
+        self._almacen = almacen
+        self.id_usuario = id_usuario
+    
+    @property
+    def nombre(self) -> str:
+        return self._almacen._nombres[self.id_usuario]
+    
+    @nombre.setter
+    def nombre(self, valor: str):
+        self._almacen._nombres[self.id_usuario] = sys.intern(valor)
+    
+    @property
+    def email(self) -> str:
+        return self._almacen._emails[self.id_usuario]
+    
+    @email.setter
+    def email(self, valor: str):
+        self._almacen._emails[self.id_usuario] = valor
+    
+    @property
+    def fecha_creacion(self) -> datetime:
+        return _desde_microsegundos(self._almacen._creacion[self.id_usuario])
+    
+    @fecha_creacion.setter
+    def fecha_creacion(self, valor: datetime):
+        self._almacen._creacion[self.id_usuario] = _a_microsegundos(valor)
+    
+    @property
+    def activo(self) -> bool:
+        return self._almacen._activo_en(self.id_usuario)
+    
+    @activo.setter
+    def activo(self, valor: bool):
+        self._almacen._marcar_activo(self.id_usuario, valor)
+    
+    @property
+    def ultimo_acceso(self) -> Optional[datetime]:
+        valor = self._almacen._acceso[self.id_usuario]
+        return None if valor == _SIN_ACCESO else _desde_microsegundos(valor)
+    
+    @ultimo_acceso.setter
+    def ultimo_acceso(self, valor: Optional[datetime]):
+        self._almacen._acceso[self.id_usuario] = (
+            _SIN_ACCESO if valor is None else _a_microsegundos(valor))
+    
+    activar = Usuario.activar
+    desactivar = Usuario.desactivar
+    registrar_acceso = Usuario.registrar_acceso
+    _notificar_cambio = Usuario._notificar_cambio
+    to_dict = Usuario.to_dict
+    __str__ = Usuario.__str__
+    
+    def __eq__(self, otro):
+        if isinstance(otro, UsuarioVista):
+            return self._almacen is otro._almacen and self.id_usuario == otro.id_usuario
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash((id(self._almacen), self.id_usuario))
+    
+    def a_usuario(self) -> Usuario:
+        """Retorna una copia independiente como ``Usuario``."""
+        return Usuario.from_dict(self.to_dict())
+
+class AlmacenUsuariosCompacto(MutableMapping):
+    """Almacén columnar de usuarios con la interfaz de un ``dict[int, Usuario]``.
+    
+    En lugar de un objeto por usuario guarda columnas indexadas por id:
+    listas de nombres (internados) y emails, fechas como enteros de
+    microsegundos en ``array('q')`` y bitsets para ``activo`` y la presencia
+    de cada id. Los ids se asignan secuencialmente, así que el id es
+    directamente la posición en las columnas. Entrega ``UsuarioVista``.
+    """
     
     def __init__(self):
-        self.usuarios: dict[int, Usuario] = {}
+        self.observador = None
+        self.clear()
+    
+    def clear(self) -> None:
+        self._nombres: List[Optional[str]] = []
+        self._emails: List[Optional[str]] = []
+        self._creacion = array('q')
+        self._acceso = array('q')
+        self._presentes = bytearray()
+        self._activos = bytearray()
+        self._cantidad = 0
+    
+    def _asegurar_capacidad(self, id_usuario: int) -> None:
+        faltan = id_usuario + 1 - len(self._nombres)
+        if faltan > 0:
+            self._nombres.extend([None] * faltan)
+            self._emails.extend([None] * faltan)
+            self._creacion.extend([0] * faltan)
+            self._acceso.extend([_SIN_ACCESO] * faltan)
+        bytes_necesarios = id_usuario // 8 + 1
+        if bytes_necesarios > len(self._presentes):
+            extra = bytes_necesarios - len(self._presentes)
+            self._presentes.extend(bytes(extra))
+            self._activos.extend(bytes(extra))
+    
+    def _activo_en(self, id_usuario: int) -> bool:
+        return bool(self._activos[id_usuario >> 3] & (1 << (id_usuario & 7)))
+    
+    def _marcar_activo(self, id_usuario: int, valor: bool) -> None:
+        if valor:
+            self._activos[id_usuario >> 3] |= 1 << (id_usuario & 7)
+        else:
+            self._activos[id_usuario >> 3] &= ~(1 << (id_usuario & 7)) & 0xFF
+    
+    def __contains__(self, id_usuario) -> bool:
+        return (isinstance(id_usuario, int) and 0 <= id_usuario < len(self._nombres)
+                and bool(self._presentes[id_usuario >> 3] & (1 << (id_usuario & 7))))
+    
+    def __getitem__(self, id_usuario: int) -> UsuarioVista:
+        if id_usuario not in self:
+            raise KeyError(id_usuario)
+        return UsuarioVista(self, id_usuario)
+    
+    def __setitem__(self, id_usuario: int, usuario) -> None:
+        """Guarda (copiando sus campos) un ``Usuario`` o una vista."""
+        if id_usuario < 0:
+            raise KeyError(id_usuario)
+        self._asegurar_capacidad(id_usuario)
+        if id_usuario not in self:
+            self._presentes[id_usuario >> 3] |= 1 << (id_usuario & 7)
+            self._cantidad += 1
+        vista = UsuarioVista(self, id_usuario)
+        vista.nombre = usuario.nombre
+        vista.email = usuario.email
+        vista.fecha_creacion = usuario.fecha_creacion
+        vista.activo = usuario.activo
+        vista.ultimo_acceso = usuario.ultimo_acceso
+    
+    def __delitem__(self, id_usuario: int) -> None:
+        if id_usuario not in self:
+            raise KeyError(id_usuario)
+        self._presentes[id_usuario >> 3] &= ~(1 << (id_usuario & 7)) & 0xFF
+        self._nombres[id_usuario] = None
+        self._emails[id_usuario] = None
+        self._cantidad -= 1
+    
+    def pop(self, id_usuario: int, *default):
+        """Retira un usuario y lo retorna como ``Usuario`` independiente."""
+        if id_usuario not in self:
+            if default:
+                return default[0]
+            raise KeyError(id_usuario)
+        usuario = UsuarioVista(self, id_usuario).a_usuario()
+        del self[id_usuario]
+        return usuario
+    
+    def __iter__(self) -> Iterator[int]:
+        presentes = self._presentes
+        for id_usuario in range(len(self._nombres)):
+            if presentes[id_usuario >> 3] & (1 << (id_usuario & 7)):
+                yield id_usuario
+    
+    def __len__(self) -> int:
+        return self._cantidad
+
+def _truncar_linea_incompleta(nombre_archivo: str, bloque: int = 65536) -> None:
+    """Elimina del final del archivo una línea sin terminar (escritura interrumpida)."""
+    with open(nombre_archivo, 'r+b') as archivo:
+        fin = archivo.seek(0, os.SEEK_END)
+        posicion = fin
+        while posicion > 0:
+            inicio = max(0, posicion - bloque)
+            archivo.seek(inicio)
+            datos = archivo.read(posicion - inicio)
+            if posicion == fin and datos.endswith(b'\n'):
+                return
+            salto = datos.rfind(b'\n')
+            if salto != -1:
+                archivo.truncate(inicio + salto + 1)
+                return
+            posicion = inicio
+        archivo.truncate(0)
+
+def normalizar_email(email: str) -> str:
+    """Normaliza un email para compararlo sin distinguir mayúsculas ni espacios."""
+    return email.strip().casefold()
+
+class GestorUsuarios:
+    """Componente para gestionar múltiples usuarios.
+    
+    Mantiene un índice email normalizado -> id para que buscar por email y
+    comprobar duplicados al crear usuarios sea O(1). Con ``compacto=True``
+    los usuarios se guardan en un ``AlmacenUsuariosCompacto`` (columnar) y se
+    entregan como ``UsuarioVista``.
+    
+    Además del volcado JSON completo (``guardar_en_archivo``) ofrece un
+    registro JSON Lines de solo-anexar: ``guardar_cambios`` escribe únicamente
+    los usuarios creados, modificados o eliminados desde el último guardado, y
+    ``cargar_registro`` lee el archivo línea a línea. Los cambios solo se
+    siguen mientras se usa el registro, así que quien solo usa el volcado
+    JSON no acumula ids pendientes.
+    
+    Para las consultas de actividad mantiene un ``array('q')`` ordenado de ids
+    activos y un índice ordenado por último acceso (dos ``array('q')``
+    paralelos), actualizados por ``activar``, ``desactivar`` y
+    ``registrar_acceso``; al cargar desde archivo se construyen ordenando una
+    sola vez. Los cambios hechos asignando atributos directamente (sin esos
+    métodos) no se reflejan en los índices.
+    """
+    
+    def __init__(self, compacto: bool = False):
+        if compacto:
+            self.usuarios: MutableMapping = AlmacenUsuariosCompacto()
+            self.usuarios.observador = self
+        else:
+            self.usuarios = {}
+        self._indice_email: dict[str, int] = {}
+        self._limpiar_indices_actividad()
+        # Durante una carga los índices ordenados se construyen al final
+        self._cargando = False
         self.proximo_id = 1
+        # Cambios pendientes de anexar al registro. Solo se registran mientras
+        # el archivo de registro está al día (tras cargarlo, compactarlo o
+        # anexarle cambios); si no, el próximo guardar_cambios lo compacta.
+        self._modificados: set[int] = set()
+        self._eliminados: set[int] = set()
+        self._registro_activo = False
+        self._entradas_registro = 0
+    
+    def _limpiar_indices_actividad(self) -> None:
+        # Ids activos ordenados
+        self._ids_activos = array('q')
+        # Índice de accesos ordenado por instante: _accesos_us[i] es el acceso
+        # (en microsegundos) de _accesos_ids[i]. Las entradas viejas se
+        # descartan de forma perezosa comparándolas con _acceso_actual.
+        self._accesos_us = array('q')
+        self._accesos_ids = array('q')
+        # Por id: último acceso (o _SIN_ACCESO) y marca de "nunca accedió"
+        self._acceso_actual = array('q')
+        self._sin_acceso = bytearray()
+        self._con_acceso = 0
+    
+    def _asegurar_indices(self, id_usuario: int) -> None:
+        faltan = id_usuario + 1 - len(self._acceso_actual)
+        if faltan == 1:  # el caso habitual: ids consecutivos
+            self._acceso_actual.append(_SIN_ACCESO)
+            self._sin_acceso.append(0)
+        elif faltan > 0:
+            self._acceso_actual.extend([_SIN_ACCESO] * faltan)
+            self._sin_acceso.extend(bytes(faltan))
+    
+    def _acceso_de(self, id_usuario: int) -> int:
+        """Último acceso indexado de un usuario en microsegundos, o ``_SIN_ACCESO``."""
+        if 0 <= id_usuario < len(self._acceso_actual):
+            return self._acceso_actual[id_usuario]
+        return _SIN_ACCESO
+    
+    def _guardar_usuario(self, usuario: Usuario) -> None:
+        """Guarda un usuario en el almacén, lo vincula al gestor y lo indexa."""
+        id_usuario = usuario.id_usuario
+        self.usuarios[id_usuario] = usuario
+        if isinstance(self.usuarios, dict):
+            usuario._observador = self
+        self._indice_email[normalizar_email(usuario.email)] = id_usuario
+        self._asegurar_indices(id_usuario)
+        if usuario.activo:
+            self._agregar_activo(id_usuario)
+        if usuario.ultimo_acceso is None:
+            self._sin_acceso[id_usuario] = 1
+        else:
+            self._indexar_acceso(id_usuario, _a_microsegundos(usuario.ultimo_acceso))
+    
+    def _desindexar(self, usuario: Usuario) -> None:
+        """Retira a un usuario de todos los índices."""
+        id_usuario = usuario.id_usuario
+        clave = normalizar_email(usuario.email)
+        # Al reproducir el registro el email puede pertenecer ya a otro usuario
+        if self._indice_email.get(clave) == id_usuario:
+            del self._indice_email[clave]
+        self._quitar_activo(id_usuario)
+        if id_usuario < len(self._acceso_actual):
+            self._sin_acceso[id_usuario] = 0
+            if self._acceso_actual[id_usuario] != _SIN_ACCESO:
+                self._acceso_actual[id_usuario] = _SIN_ACCESO
+                self._con_acceso -= 1
+    
+    def _desvincular(self, usuario) -> None:
+        """Deja de observar un ``Usuario`` que ya no está en el almacén."""
+        if isinstance(usuario, Usuario):
+            usuario._observador = None
+    
+    def _marcar_modificado(self, id_usuario: int) -> None:
+        if self._registro_activo:
+            self._modificados.add(id_usuario)
+    
+    def _marcar_eliminado(self, id_usuario: int) -> None:
+        if self._registro_activo:
+            self._modificados.discard(id_usuario)
+            self._eliminados.add(id_usuario)
+    
+    def _usuario_modificado(self, usuario: Usuario, campo: str) -> None:
+        """Llamado por ``Usuario`` cuando uno de sus métodos lo modifica."""
+        id_usuario = usuario.id_usuario
+        # Ignorar objetos que ya no son los del almacén (eliminados, reemplazados
+        # o de antes de una recarga) y vistas de filas eliminadas
+        if isinstance(self.usuarios, dict):
+            if self.usuarios.get(id_usuario) is not usuario:
+                return
+        elif id_usuario not in self.usuarios:
+            return
+        self._marcar_modificado(id_usuario)
+        if campo == 'activo':
+            if usuario.activo:
+                self._agregar_activo(id_usuario)
+            else:
+                self._quitar_activo(id_usuario)
+        elif campo == 'ultimo_acceso':
+            self._indexar_acceso(id_usuario, _a_microsegundos(usuario.ultimo_acceso))
+    
+    def _agregar_activo(self, id_usuario: int) -> None:
+        if self._cargando:
+            return
+        ids = self._ids_activos
+        if not ids or id_usuario > ids[-1]:
+            ids.append(id_usuario)
+            return
+        i = bisect_left(ids, id_usuario)
+        if i == len(ids) or ids[i] != id_usuario:
+            ids.insert(i, id_usuario)
+    
+    def _quitar_activo(self, id_usuario: int) -> None:
+        if self._cargando:
+            return
+        ids = self._ids_activos
+        i = bisect_left(ids, id_usuario)
+        if i < len(ids) and ids[i] == id_usuario:
+            del ids[i]
+    
+    def _indexar_acceso(self, id_usuario: int, acceso_us: int) -> None:
+        # Mismo instante que el ya indexado (reloj de baja resolución): nada que hacer
+        if self._acceso_de(id_usuario) == acceso_us:
+            return
+        self._asegurar_indices(id_usuario)
+        if self._acceso_actual[id_usuario] == _SIN_ACCESO:
+            self._con_acceso += 1
+        self._acceso_actual[id_usuario] = acceso_us
+        self._sin_acceso[id_usuario] = 0
+        if self._cargando:
+            return
+        
+        instantes = self._accesos_us
+        # Los accesos nuevos casi siempre son los más recientes: anexar es O(1)
+        if not instantes or acceso_us >= instantes[-1]:
+            instantes.append(acceso_us)
+            self._accesos_ids.append(id_usuario)
+        else:
+            i = bisect_right(instantes, acceso_us)
+            instantes.insert(i, acceso_us)
+            self._accesos_ids.insert(i, id_usuario)
+        if len(instantes) > 2 * self._con_acceso + 1024:
+            self._reconstruir_accesos()
+    
+    def _reconstruir_accesos(self) -> None:
+        """Reconstruye el índice de accesos sin entradas obsoletas, ordenando una vez."""
+        actual = self._acceso_actual
+        ids = sorted((i for i in range(len(actual)) if actual[i] != _SIN_ACCESO),
+                     key=actual.__getitem__)
+        self._accesos_ids = array('q', ids)
+        self._accesos_us = array('q', [actual[i] for i in ids])
+    
+    def _reconstruir_indices_actividad(self) -> None:
+        """Construye los índices ordenados tras una carga en lote."""
+        self._ids_activos = array('q', sorted(
+            id_usuario for id_usuario, usuario in self.usuarios.items() if usuario.activo))
+        self._reconstruir_accesos()
     
     def crear_usuario(self, nombre: str, email: str) -> Usuario:
         """Crea un nuevo usuario."""
-        if self.buscar_por_email(email):
+        clave = normalizar_email(email)
+        if clave in self._indice_email:
             raise ValueError(f"Ya existe un usuario con el email {email}")
         
-        usuario = Usuario(self.proximo_id, nombre, email)
-        self.usuarios[self.proximo_id] = usuario
+        id_usuario = self.proximo_id
+        self._guardar_usuario(Usuario(id_usuario, nombre, email))
+        self._marcar_modificado(id_usuario)
         self.proximo_id += 1
-        return usuario
+        return self.usuarios[id_usuario]
     
     def obtener_usuario(self, id_usuario: int) -> Optional[Usuario]:
         """Obtiene un usuario por su ID."""
         return self.usuarios.get(id_usuario)
     
     def buscar_por_email(self, email: str) -> Optional[Usuario]:
-        """Busca un usuario por su email."""
-        for usuario in self.usuarios.values():
-            if usuario.email == email:
-                return usuario
-        return None
+        """Busca un usuario por su email (sin distinguir mayúsculas)."""
+        id_usuario = self._indice_email.get(normalizar_email(email))
+        if id_usuario is None:
+            return None
+        return self.usuarios.get(id_usuario)
+    
+    def actualizar_email(self, id_usuario: int, nuevo_email: str) -> bool:
+        """Cambia el email de un usuario manteniendo el índice consistente."""
+        usuario = self.usuarios.get(id_usuario)
+        if usuario is None:
+            return False
+        clave = normalizar_email(nuevo_email)
+        existente = self._indice_email.get(clave)
+        if existente is not None and existente != id_usuario:
+            raise ValueError(f"Ya existe un usuario con el email {nuevo_email}")
+        del self._indice_email[normalizar_email(usuario.email)]
+        usuario.email = nuevo_email
+        self._indice_email[clave] = id_usuario
+        self._marcar_modificado(id_usuario)
+        return True
+    
+    def registrar_acceso(self, id_usuario: int) -> bool:
+        """Registra el acceso de un usuario por su ID."""
+        usuario = self.usuarios.get(id_usuario)
+        if usuario is None:
+            return False
+        usuario.registrar_acceso()
+        return True
+    
+    def listar_usuarios_activos(self, desde_id: int = 0,
+                                limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios activos en orden de id.
+        
+        Args:
+            desde_id: Solo ids mayores o iguales (para paginar, el último id + 1)
+            limite: Cantidad máxima de usuarios a retornar
+        """
+        return list(islice(self._iterar_activos(desde_id), limite))
+    
+    def iterar_activos(self, desde_id: int = 0) -> Iterator[Usuario]:
+        """Itera los usuarios activos en orden de id en O(log n + k)."""
+        return self._iterar_activos(desde_id)
+    
+    def _iterar_activos(self, desde_id: int) -> Iterator[Usuario]:
+        ids = self._ids_activos
+        for i in range(bisect_left(ids, desde_id), len(ids)):
+            yield self.usuarios[ids[i]]
+    
+    def contar_activos(self) -> int:
+        """Retorna la cantidad de usuarios activos."""
+        return len(self._ids_activos)
+    
+    def iterar_por_acceso(self, desde: Optional[datetime] = None,
+                          hasta: Optional[datetime] = None) -> Iterator[Usuario]:
+        """Itera en orden de último acceso los usuarios con acceso en [desde, hasta).
+        
+        Localiza el inicio con búsqueda binaria, así que cuesta O(log n + k).
+        Los usuarios que nunca accedieron no se incluyen.
+        """
+        return self._iterar_por_acceso(desde, hasta)
+    
+    def _iterar_por_acceso(self, desde: Optional[datetime],
+                           hasta: Optional[datetime]) -> Iterator[Usuario]:
+        instantes = self._accesos_us
+        ids = self._accesos_ids
+        actual = self._acceso_actual
+        inicio = bisect_left(instantes, _a_microsegundos(desde)) if desde else 0
+        limite_us = _a_microsegundos(hasta) if hasta else None
+        for i in range(inicio, len(instantes)):
+            acceso_us = instantes[i]
+            if limite_us is not None and acceso_us >= limite_us:
+                return
+            id_usuario = ids[i]
+            if actual[id_usuario] == acceso_us:  # descartar entradas obsoletas
+                yield self.usuarios[id_usuario]
     
-    def listar_usuarios_activos(self) -> List[Usuario]:
-        """Lista todos los usuarios activos."""
-        return [u for u in self.usuarios.values() if u.activo]
+    def usuarios_por_acceso(self, desde: Optional[datetime] = None,
+                            hasta: Optional[datetime] = None,
+                            limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios con último acceso en [desde, hasta), del más antiguo al más reciente."""
+        return list(islice(self._iterar_por_acceso(desde, hasta), limite))
+    
+    def usuarios_sin_acceso_desde(self, fecha: datetime, incluir_sin_acceso: bool = True,
+                                  limite: Optional[int] = None) -> List[Usuario]:
+        """Lista los usuarios no vistos desde ``fecha``.
+        
+        Los que nunca accedieron van primero, en orden de id, y se localizan
+        con ``bytearray.find`` sobre sus marcas (sin ordenar nada).
+        
+        Args:
+            fecha: Fecha de corte
+            incluir_sin_acceso: Si incluir a los usuarios que nunca accedieron
+            limite: Cantidad máxima de usuarios a retornar
+        """
+        resultado = self._iterar_por_acceso(None, fecha)
+        if incluir_sin_acceso:
+            resultado = chain(self._iterar_sin_acceso(), resultado)
+        return list(islice(resultado, limite))
+    
+    def _iterar_sin_acceso(self) -> Iterator[Usuario]:
+        marcas = self._sin_acceso
+        i = marcas.find(1)
+        while i != -1:
+            yield self.usuarios[i]
+            i = marcas.find(1, i + 1)
     
     def eliminar_usuario(self, id_usuario: int) -> bool:
         """Elimina un usuario del sistema."""
-        if id_usuario in self.usuarios:
-            del self.usuarios[id_usuario]
-            return True
-        return False
+        usuario = self.usuarios.pop(id_usuario, None)
+        if usuario is None:
+            return False
+        self._desindexar(usuario)
+        self._desvincular(usuario)
+        self._marcar_eliminado(id_usuario)
+        return True
     
     def guardar_en_archivo(self, nombre_archivo: str):
         """Guarda todos los usuarios en un archivo JSON."""
@@ -104,11 +615,309 @@ class GestorUsuarios:
             with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
                 datos = json.load(archivo)
                 
-            self.usuarios.clear()
-            for usuario_data in datos['usuarios']:
-                usuario = Usuario.from_dict(usuario_data)
-                self.usuarios[usuario.id_usuario] = usuario
+            self._reiniciar()
+            self._cargando = True
+            try:
+                for usuario_data in datos['usuarios']:
+                    self._guardar_usuario(Usuario.from_dict(usuario_data))
+            finally:
+                self._cargando = False
+                self._reconstruir_indices_actividad()
             
             self.proximo_id = datos['proximo_id']
         except FileNotFoundError:
-            print(f"Archivo {nombre_archivo} no encontrado. Iniciando con lista vacía.")
\ No newline at end of file
+            print(f"Archivo {nombre_archivo} no encontrado. Iniciando con lista vacía.")
+    
+    def _reiniciar(self) -> None:
+        """Vacía usuarios, índices y cambios pendientes."""
+        if isinstance(self.usuarios, dict):
+            for usuario in self.usuarios.values():
+                usuario._observador = None
+        self.usuarios.clear()
+        self._indice_email.clear()
+        self._limpiar_indices_actividad()
+        self._modificados.clear()
+        self._eliminados.clear()
+        self._registro_activo = False
+    
+    def guardar_cambios(self, nombre_archivo: str) -> int:
+        """Anexa al registro JSON Lines solo los usuarios que cambiaron.
+        
+        Cada línea es un registro completo (``put``, ``del`` o ``meta``) y el
+        lote se sincroniza a disco con ``fsync``. Si el archivo no existe, no
+        se cargó ni escribió con este gestor, o acumula demasiadas entradas
+        obsoletas, se compacta.
+        
+        Returns:
+            Cantidad de líneas escritas
+        """
+        if (not self._registro_activo or not os.path.exists(nombre_archivo) or
+                self._entradas_registro > 2 * len(self.usuarios) + 1000):
+            return self.compactar_registro(nombre_archivo)
+        
+        _truncar_linea_incompleta(nombre_archivo)
+        with open(nombre_archivo, 'a', encoding='utf-8') as archivo:
+            escritas = self._escribir_registros(archivo, sorted(self._modificados),
+                                                sorted(self._eliminados))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        self._entradas_registro += escritas
+        self._modificados.clear()
+        self._eliminados.clear()
+        return escritas
+    
+    def compactar_registro(self, nombre_archivo: str) -> int:
+        """Reescribe el registro con el estado actual de forma atómica.
+        
+        Se escribe un archivo temporal que luego reemplaza al original, así un
+        fallo a mitad de la escritura deja intacto el registro anterior.
+        
+        Returns:
+            Cantidad de líneas escritas
+        """
+        temporal = f"{nombre_archivo}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as archivo:
+            escritas = self._escribir_registros(archivo, self.usuarios, ())
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, nombre_archivo)
+        self._entradas_registro = escritas
+        self._modificados.clear()
+        self._eliminados.clear()
+        self._registro_activo = True
+        return escritas
+    
+    def _escribir_registros(self, archivo, ids_modificados, ids_eliminados) -> int:
+        escritas = 0
+        for id_usuario in ids_modificados:
+            usuario = self.usuarios.get(id_usuario)
+            if usuario is not None:
+                archivo.write(json.dumps({'op': 'put', 'usuario': usuario.to_dict()},
+                                         ensure_ascii=False) + '\n')
+                escritas += 1
+        for id_usuario in ids_eliminados:
+            archivo.write(json.dumps({'op': 'del', 'id_usuario': id_usuario}) + '\n')
+            escritas += 1
+        archivo.write(json.dumps({'op': 'meta', 'proximo_id': self.proximo_id}) + '\n')
+        return escritas + 1
+    
+    def cargar_registro(self, nombre_archivo: str) -> int:
+        """Carga usuarios desde un registro JSON Lines leyéndolo línea a línea.
+        
+        Una última línea incompleta (por ejemplo, por un fallo durante la
+        escritura) se ignora.
+        
+        Returns:
+            Cantidad de usuarios cargados
+        """
+        self._reiniciar()
+        self._entradas_registro = 0
+        self._cargando = True
+        try:
+            with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
+                for linea in archivo:
+                    if not linea.endswith('\n'):
+                        break  # escritura interrumpida
+                    registro = json.loads(linea)
+                    self._aplicar_registro(registro)
+                    self._entradas_registro += 1
+        except FileNotFoundError:
+            print(f"Archivo {nombre_archivo} no encontrado. Iniciando con lista vacía.")
+        finally:
+            self._cargando = False
+            self._reconstruir_indices_actividad()
+        self._modificados.clear()
+        self._eliminados.clear()
+        self._registro_activo = True
+        return len(self.usuarios)
+    
+    def _aplicar_registro(self, registro: dict) -> None:
+        op = registro['op']
+        if op == 'put':
+            usuario = Usuario.from_dict(registro['usuario'])
+            anterior = self.usuarios.get(usuario.id_usuario)
+            if anterior is not None:
+                self._desindexar(anterior)
+                self._desvincular(anterior)
+            self._guardar_usuario(usuario)
+        elif op == 'del':
+            self.eliminar_usuario(registro['id_usuario'])
+        elif op == 'meta':
+            self.proximo_id = registro['proximo_id']
+
+def _sincronizado(metodo):
+    """Ejecuta un método de ``GestorUsuarios`` con el lock del gestor tomado."""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+def _sincronizado_con_accesos(metodo):
+    """Como ``_sincronizado``, pero antes aplica los accesos pendientes."""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        self.vaciar_accesos()
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+def _instantanea(metodo, vaciar_accesos: bool = False):
+    """Recorre un iterador del gestor con el lock tomado y retorna una copia.
+    
+    Así quien itera no ve los índices a medio modificar por otros hilos.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if vaciar_accesos:
+            self.vaciar_accesos()
+        with self._lock:
+            return iter(list(metodo(self, *args, **kwargs)))
+    return envoltura
+
+def _sincronizado_recarga(metodo):
+    """Para las cargas: toma también el lock de ids y descarta lo anterior a la recarga.
+    
+    Los ids reservados antes de la recarga quedan invalidados (ver
+    ``crear_usuario``) y los accesos pendientes se descartan.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._lock, self._lock_ids:
+            self._generacion += 1
+            self._accesos_pendientes.clear()
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+class GestorUsuariosConcurrente(GestorUsuarios):
+    """Gestor de usuarios seguro para compartir entre hilos.
+    
+    - Los ids se reservan con un lock propio y el ``Usuario`` se construye fuera
+      del lock principal, que solo protege la comprobación de email y la
+      actualización del almacén y los índices.
+    - ``registrar_acceso(id)`` solo anexa ``(id, time.time())`` a un buffer;
+      los accesos se agrupan (quedándose con el último por usuario) y se
+      aplican en lote con ``vaciar_accesos``, que se ejecuta al llenarse el
+      buffer, periódicamente si se indica ``intervalo_vaciado`` y antes de
+      cualquier consulta o guardado que dependa de los accesos.
+    - Las lecturas toman el lock principal; ``iterar_activos`` e
+      ``iterar_por_acceso`` retornan una instantánea tomada con el lock.
+    """
+    
+    def __init__(self, compacto: bool = False, max_accesos_pendientes: int = 10_000,
+                 intervalo_vaciado: Optional[float] = None):
+        self._lock = threading.RLock()
+        self._lock_ids = threading.Lock()
+        # Se incrementa en cada recarga; invalida los ids reservados antes
+        self._generacion = 0
+        super().__init__(compacto)
+        self.max_accesos_pendientes = max_accesos_pendientes
+        self._accesos_pendientes = deque()
+        self._vaciador = None
+        self._detener_vaciado = threading.Event()
+        if intervalo_vaciado is not None:
+            self.iniciar_vaciado(intervalo_vaciado)
+    
+    def crear_usuario(self, nombre: str, email: str) -> Usuario:
+        """Crea un nuevo usuario."""
+        clave = normalizar_email(email)
+        # Comprobación previa sin lock para no gastar ids en duplicados evidentes
+        if clave in self._indice_email:
+            raise ValueError(f"Ya existe un usuario con el email {email}")
+        
+        while True:
+            with self._lock_ids:
+                id_usuario = self.proximo_id
+                self.proximo_id += 1
+                generacion = self._generacion
+            usuario = Usuario(id_usuario, nombre, email)
+            
+            with self._lock:
+                if generacion != self._generacion:
+                    continue  # hubo una recarga: el id reservado pudo quedar ocupado
+                if clave in self._indice_email:
+                    raise ValueError(f"Ya existe un usuario con el email {email}")
+                self._guardar_usuario(usuario)
+                self._marcar_modificado(id_usuario)
+                return self.usuarios[id_usuario]
+    
+    def registrar_acceso(self, id_usuario: int) -> bool:
+        """Encola el acceso de un usuario; se aplica en el próximo vaciado."""
+        if id_usuario not in self.usuarios:
+            return False
+        self._accesos_pendientes.append((id_usuario, time.time()))
+        if len(self._accesos_pendientes) >= self.max_accesos_pendientes:
+            self.vaciar_accesos()
+        return True
+    
+    def vaciar_accesos(self) -> int:
+        """Aplica en lote los accesos pendientes y retorna cuántos usuarios se actualizaron."""
+        pendientes = self._accesos_pendientes
+        ultimos = {}
+        # Solo se retiran los elementos presentes ahora; los que otros hilos
+        # anexen mientras tanto quedan para el próximo vaciado
+        for _ in range(len(pendientes)):
+            try:
+                id_usuario, instante = pendientes.popleft()
+            except IndexError:  # otro hilo vació el buffer a la vez
+                break
+            if instante > ultimos.get(id_usuario, 0.0):
+                ultimos[id_usuario] = instante
+        if not ultimos:
+            return 0
+        
+        actualizados = 0
+        # En orden cronológico el índice de accesos solo crece por el final
+        lote = sorted(ultimos.items(), key=itemgetter(1))
+        with self._lock:
+            for id_usuario, instante in lote:
+                usuario = self.usuarios.get(id_usuario)
+                if usuario is None:
+                    continue
+                fecha = datetime.fromtimestamp(instante)
+                acceso_us = _a_microsegundos(fecha)
+                if self._acceso_de(id_usuario) >= acceso_us:
+                    continue  # ya hay un acceso más reciente registrado
+                usuario.ultimo_acceso = fecha
+                self._marcar_modificado(id_usuario)
+                self._indexar_acceso(id_usuario, acceso_us)
+                actualizados += 1
+        return actualizados
+    
+    def iniciar_vaciado(self, intervalo: float = 1.0) -> None:
+        """Inicia un hilo que aplica los accesos pendientes cada ``intervalo`` segundos."""
+        if self._vaciador is not None and self._vaciador.is_alive():
+            return
+        self._detener_vaciado.clear()
+        
+        def ciclo():
+            while not self._detener_vaciado.wait(intervalo):
+                self.vaciar_accesos()
+        
+        self._vaciador = threading.Thread(target=ciclo, name="vaciado-accesos", daemon=True)
+        self._vaciador.start()
+    
+    def detener_vaciado(self) -> None:
+        """Detiene el hilo de vaciado periódico y aplica lo pendiente."""
+        if self._vaciador is not None:
+            self._detener_vaciado.set()
+            self._vaciador.join()
+            self._vaciador = None
+        self.vaciar_accesos()
+    
+    obtener_usuario = _sincronizado(GestorUsuarios.obtener_usuario)
+    buscar_por_email = _sincronizado(GestorUsuarios.buscar_por_email)
+    actualizar_email = _sincronizado(GestorUsuarios.actualizar_email)
+    eliminar_usuario = _sincronizado(GestorUsuarios.eliminar_usuario)
+    contar_activos = _sincronizado(GestorUsuarios.contar_activos)
+    listar_usuarios_activos = _sincronizado(GestorUsuarios.listar_usuarios_activos)
+    iterar_activos = _instantanea(GestorUsuarios.iterar_activos)
+    iterar_por_acceso = _instantanea(GestorUsuarios.iterar_por_acceso, vaciar_accesos=True)
+    _usuario_modificado = _sincronizado(GestorUsuarios._usuario_modificado)
+    cargar_desde_archivo = _sincronizado_recarga(GestorUsuarios.cargar_desde_archivo)
+    cargar_registro = _sincronizado_recarga(GestorUsuarios.cargar_registro)
+    usuarios_por_acceso = _sincronizado_con_accesos(GestorUsuarios.usuarios_por_acceso)
+    usuarios_sin_acceso_desde = _sincronizado_con_accesos(GestorUsuarios.usuarios_sin_acceso_desde)
+    guardar_en_archivo = _sincronizado_con_accesos(GestorUsuarios.guardar_en_archivo)
+    guardar_cambios = _sincronizado_con_accesos(GestorUsuarios.guardar_cambios)
+    compactar_registro = _sincronizado_con_accesos(GestorUsuarios.compactar_registro)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# archivo: test_cache_distribuido.py
+"""Pruebas de TieredCache con dos procesos simulados sobre un mismo Redis (fakeredis)."""
+import time
+from time import monotonic
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from cache_distribuido import TieredCache
+
+
+def _esperar(condicion, timeout: float = 2.0) -> bool:
+    """Espera a que ``condicion()`` sea verdadera (los avisos llegan en otro hilo)."""
+    limite = monotonic() + timeout
+    while monotonic() < limite:
+        if condicion():
+            return True
+        time.sleep(0.01)
+    return condicion()
+
+
+@pytest.fixture
+def servidor():
+    return fakeredis.FakeServer()
+
+
+def _recibidas(cache: TieredCache) -> int:
+    return cache.get_stats()['invalidations_received']
+
+
+@pytest.fixture
+def par(servidor):
+    """Dos TieredCache con su propio L1 que comparten el mismo servidor Redis."""
+    caches = [TieredCache(redis_client=fakeredis.FakeRedis(server=servidor)) for _ in range(2)]
+    # Esperar a que ambos estén suscritos antes de publicar
+    assert _esperar(lambda: all(c.redis.pubsub_numsub(c.channel)[0][1] == 2 for c in caches))
+    yield caches
+    for cache in caches:
+        cache.close()
+
+
+def test_set_invalida_l1_de_otro_proceso(par):
+    a, b = par
+    a.set('clave', 'v1')
+    assert _esperar(lambda: _recibidas(b) == 1)
+    assert b.get('clave') == 'v1'
+    assert b.l1.get('clave') == 'v1'
+
+    a.set('clave', 'v2')
+    assert _esperar(lambda: b.l1.get('clave') is None)
+    assert b.get('clave') == 'v2'
+    assert _recibidas(b) == 2
+    # Quien escribe no se invalida a sí mismo
+    assert a.l1.get('clave') == 'v2'
+    assert _recibidas(a) == 0
+
+
+def test_delete_invalida_l1_de_otro_proceso(par):
+    a, b = par
+    a.set('clave', 1)
+    assert _esperar(lambda: _recibidas(b) == 1)
+    assert b.get('clave') == 1
+
+    assert a.delete('clave') is True
+    assert _esperar(lambda: b.l1.get('clave') is None)
+    assert b.get('clave', 'ausente') == 'ausente'
+    assert a.delete('clave') is False
+
+
+def test_set_many_publica_un_solo_aviso(par):
+    a, b = par
+    a.set_many({'x': 1, 'y': 2})
+    assert _esperar(lambda: _recibidas(b) == 1)
+    assert b.get_many(['x', 'y']) == {'x': 1, 'y': 2}
+
+    a.set_many({'x': 10, 'y': 20})
+    assert _esperar(lambda: b.l1.get('x') is None and b.l1.get('y') is None)
+    assert _recibidas(b) == 2
+    assert b.get_many(['x', 'y']) == {'x': 10, 'y': 20}
+
+
+def test_get_many_usa_un_pipeline_para_los_faltantes(par, monkeypatch):
+    a, b = par
+    a.set_many({f'k{i}': i for i in range(10)})
+    assert _esperar(lambda: _recibidas(b) == 1)
+    b.get('k0')  # k0 ya está en el L1 de b
+
+    comandos_por_pipeline = []
+    original = b.redis.pipeline
+
+    def contar_pipeline(*args, **kwargs):
+        pipe = original(*args, **kwargs)
+        execute = pipe.execute
+
+        def contar_execute(*args, **kwargs):
+            comandos_por_pipeline.append(len(pipe.command_stack))
+            return execute(*args, **kwargs)
+
+        pipe.execute = contar_execute
+        return pipe
+
+    monkeypatch.setattr(b.redis, 'pipeline', contar_pipeline)
+    claves = [f'k{i}' for i in range(10)] + ['no_existe']
+    assert b.get_many(claves) == {f'k{i}': i for i in range(10)}
+    # Un solo viaje con GET y PTTL por cada clave que no estaba en L1 (k1..k9 y no_existe)
+    assert comandos_por_pipeline == [2 * 10]
+
+    stats = b.get_stats()
+    assert stats['l2_hits'] == 10
+    assert stats['l2_misses'] == 1
+
+    # Ahora todo sale de L1, sin volver a Redis
+    assert b.get_many(claves[:-1]) == {f'k{i}': i for i in range(10)}
+    assert comandos_por_pipeline == [2 * 10]
+
+
+def test_ttl_se_propaga_a_redis_y_al_l1(par):
+    a, b = par
+    a.set('con_ttl', 'valor', ttl=30)
+    assert _esperar(lambda: _recibidas(b) == 1)
+    assert 0 < a.redis.pttl(a._key('con_ttl')) <= 30_000
+
+    assert b.get('con_ttl') == 'valor'
+    restante = b.l1._cache['con_ttl'].expires_at - monotonic()
+    assert 0 < restante <= 30
+
+    a.set('sin_ttl', 'valor')
+    assert _esperar(lambda: _recibidas(b) == 2)
+    assert a.redis.pttl(a._key('sin_ttl')) == -1
+    assert b.get('sin_ttl') == 'valor'
+    assert b.l1._cache['sin_ttl'].expires_at is None
+
+
+def test_valor_expirado_desaparece_de_ambos_niveles(par):
+    a, b = par
+    a.set('corto', 'valor', ttl=0.2)
+    assert _esperar(lambda: _recibidas(b) == 1)
+    assert b.get('corto') == 'valor'
+    time.sleep(0.3)
+    assert a.get('corto') is None
+    assert b.get('corto') is None
@@ -0,0 +1,81 @@
+# archivo: test_gestor_usuarios_sqlite.py
+"""Pruebas de GestorUsuariosSQLite: ids, persistencia y consultas con límite."""
+from datetime import datetime
+import sqlite3
+
+import pytest
+
+from gestor_usuarios_sqlite import GestorUsuariosSQLite
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / 'usuarios.db')
+
+
+@pytest.fixture
+def gestor(ruta):
+    gestor = GestorUsuariosSQLite(ruta)
+    yield gestor
+    gestor.cerrar()
+
+
+def test_ids_eliminados_no_se_reutilizan(gestor, ruta):
+    for i in range(3):
+        gestor.crear_usuario(f"Usuario {i}", f"usuario{i}@ejemplo.com")
+    gestor.eliminar_usuario(3)
+    assert gestor.crear_usuario("Nuevo", "nuevo@ejemplo.com").id_usuario == 4
+
+    gestor.crear_usuarios([("A", "a@ejemplo.com"), ("B", "b@ejemplo.com")])
+    gestor.eliminar_usuario(6)
+    gestor.cerrar()
+
+    # El próximo id sobrevive a cerrar y reabrir la base
+    reabierto = GestorUsuariosSQLite(ruta)
+    try:
+        assert reabierto.crear_usuario("C", "c@ejemplo.com").id_usuario == 7
+    finally:
+        reabierto.cerrar()
+
+
+def test_email_duplicado_no_consume_id(gestor):
+    gestor.crear_usuario("Uno", "uno@ejemplo.com")
+    with pytest.raises(ValueError):
+        gestor.crear_usuario("Otro", " UNO@ejemplo.com")
+    with pytest.raises(ValueError):
+        gestor.crear_usuarios([("Dos", "dos@ejemplo.com"), ("Uno", "uno@EJEMPLO.com")])
+    assert gestor.obtener_usuario(2) is None
+    assert gestor.crear_usuario("Dos", "dos@ejemplo.com").id_usuario == 2
+
+
+def test_cambios_del_usuario_se_guardan_en_la_base(gestor):
+    usuario = gestor.crear_usuario("Uno", "uno@ejemplo.com")
+    usuario.desactivar()
+    usuario.registrar_acceso()
+    guardado = gestor.obtener_usuario(usuario.id_usuario)
+    assert not guardado.activo
+    assert guardado.ultimo_acceso == usuario.ultimo_acceso
+    assert gestor.buscar_por_email("UNO@ejemplo.com").id_usuario == usuario.id_usuario
+
+
+def test_limite_en_consultas(gestor):
+    gestor.crear_usuarios((f"Usuario {i}", f"usuario{i}@ejemplo.com") for i in range(10))
+    gestor.obtener_usuario(4).desactivar()
+
+    assert [u.id_usuario for u in gestor.listar_usuarios_activos()] == [1, 2, 3, 5, 6, 7, 8, 9, 10]
+    assert [u.id_usuario for u in gestor.listar_usuarios_activos(desde_id=3, limite=3)] == [3, 5, 6]
+    assert gestor.listar_usuarios_activos(limite=0) == []
+
+    for id_usuario in (2, 5):
+        gestor.obtener_usuario(id_usuario).registrar_acceso()
+    sin_acceso = gestor.usuarios_sin_acceso_desde(datetime.now(), limite=4)
+    assert [u.id_usuario for u in sin_acceso] == [1, 3, 4, 6]
+
+
+@pytest.mark.parametrize('limite', ["1; DROP TABLE usuarios", "2 OR 1=1"])
+def test_limite_no_se_interpola_en_el_sql(gestor, limite):
+    gestor.crear_usuarios((f"Usuario {i}", f"usuario{i}@ejemplo.com") for i in range(3))
+    # El límite se pasa como parámetro: SQLite lo rechaza en vez de ejecutarlo
+    with pytest.raises(sqlite3.Error):
+        gestor.listar_usuarios_activos(limite=limite)
+    assert len(gestor.listar_usuarios_activos()) == 3
@@ -0,0 +1,372 @@
+# archivo: test_sistema_de_cache.py
+"""Pruebas de CacheManager (expiración, presupuesto de bytes y snapshots), @cached y AsyncCacheManager."""
+import asyncio
+import functools
+import gc
+import logging
+import threading
+import time
+
+import pytest
+
+from sistema_de_cache import AsyncCacheManager, CacheManager, ShardedCacheManager, cached
+
+
+def _ejecutar(corrutina):
+    return asyncio.run(corrutina)
+
+
+def test_get_or_compute_agrupa_llamadas_concurrentes():
+    async def principal():
+        cache = AsyncCacheManager(max_size=10)
+        llamadas = 0
+
+        async def calcular():
+            nonlocal llamadas
+            llamadas += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        resultados = await asyncio.gather(*(cache.get_or_compute('k', calcular) for _ in range(5)))
+        assert resultados == [42] * 5
+        assert llamadas == 1
+        assert cache.get_stats()['coalesced_requests'] == 4
+        assert cache.get_stats()['in_flight'] == 0
+        assert await cache.get('k') == 42
+
+    _ejecutar(principal())
+
+
+def test_cancelar_al_primero_no_cancela_a_los_demas():
+    async def principal():
+        cache = AsyncCacheManager(max_size=10)
+        llamadas = 0
+
+        async def calcular():
+            nonlocal llamadas
+            llamadas += 1
+            await asyncio.sleep(0.05)
+            return 'valor'
+
+        primero = asyncio.create_task(cache.get_or_compute('k', calcular))
+        await asyncio.sleep(0)
+        otros = [asyncio.create_task(cache.get_or_compute('k', calcular)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        primero.cancel()
+
+        assert await asyncio.gather(*otros) == ['valor'] * 3
+        with pytest.raises(asyncio.CancelledError):
+            await primero
+        assert llamadas == 1
+        assert await cache.get('k') == 'valor'
+
+    _ejecutar(principal())
+
+
+def test_calculo_continua_aunque_todos_cancelen():
+    async def principal():
+        cache = AsyncCacheManager(max_size=10)
+
+        async def calcular():
+            await asyncio.sleep(0.02)
+            return 'valor'
+
+        tarea = asyncio.create_task(cache.get_or_compute('k', calcular))
+        await asyncio.sleep(0)
+        tarea.cancel()
+        await asyncio.sleep(0.05)
+        assert await cache.get('k') == 'valor'
+        assert cache.get_stats()['in_flight'] == 0
+
+    _ejecutar(principal())
+
+
+def test_error_se_propaga_a_todos_y_no_queda_en_vuelo():
+    async def principal():
+        cache = AsyncCacheManager(max_size=10)
+
+        async def fallar():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('fallo')
+
+        resultados = await asyncio.gather(*(cache.get_or_compute('k', fallar) for _ in range(3)),
+                                          return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in resultados)
+        assert cache.get_stats()['in_flight'] == 0
+        assert await cache.get('k', 'ausente') == 'ausente'
+        # Una función síncrona se ejecuta en el executor
+        assert await cache.get_or_compute('k', lambda: 7) == 7
+
+    _ejecutar(principal())
+
+
+def test_factory_sincrona_que_devuelve_una_corrutina():
+    async def principal():
+        cache = AsyncCacheManager(max_size=10)
+
+        async def calcular(x):
+            await asyncio.sleep(0.01)
+            return x * 2
+
+        # Se guarda el resultado de la corrutina, no el objeto corrutina
+        assert await cache.get_or_compute('k', lambda: calcular(21)) == 42
+        assert await cache.get('k') == 42
+        assert await cache.get_or_compute('p', functools.partial(calcular, 5)) == 10
+        assert await cache.get('p') == 10
+
+    _ejecutar(principal())
+
+
+# --- @cached ---
+
+def test_cached_sincrono_single_flight():
+    cache = CacheManager(max_size=100)
+    llamadas = []
+    inicio = threading.Barrier(8)
+
+    @cached(cache, ttl=60)
+    def lento(x):
+        llamadas.append(x)
+        time.sleep(0.05)
+        return x * 2
+
+    resultados = []
+
+    def trabajo():
+        inicio.wait()
+        resultados.append(lento(21))
+
+    hilos = [threading.Thread(target=trabajo) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert resultados == [42] * 8
+    assert llamadas == [21]
+
+    lento.invalidate(21)
+    assert lento(21) == 42
+    assert llamadas == [21, 21]
+
+
+def test_cached_async_cancelar_a_un_llamador_no_afecta_a_los_demas():
+    async def principal():
+        cache = CacheManager(max_size=100)
+        llamadas = 0
+
+        @cached(cache, ttl=60)
+        async def calcular(x):
+            nonlocal llamadas
+            llamadas += 1
+            await asyncio.sleep(0.05)
+            return x + 1
+
+        primero = asyncio.create_task(calcular(1))
+        await asyncio.sleep(0)
+        otros = [asyncio.create_task(calcular(1)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        primero.cancel()
+        assert await asyncio.gather(*otros) == [2] * 3
+        assert llamadas == 1
+        assert await calcular(1) == 2
+        assert llamadas == 1
+
+    _ejecutar(principal())
+
+
+def test_cached_async_stale_while_revalidate(caplog):
+    async def principal():
+        cache = CacheManager(max_size=100)
+        version = 0
+        fallar = False
+
+        @cached(cache, ttl=0.05, stale_ttl=10)
+        async def leer():
+            nonlocal version
+            await asyncio.sleep(0.01)
+            if fallar:
+                raise RuntimeError('origen caído')
+            version += 1
+            return version
+
+        assert await leer() == 1
+        await asyncio.sleep(0.06)
+        # Obsoleto: se sirve al instante y se refresca en segundo plano
+        assert await leer() == 1
+        await asyncio.sleep(0.03)
+        assert await leer() == 2
+
+        await asyncio.sleep(0.06)
+        fallar = True
+        with caplog.at_level(logging.WARNING, logger='sistema_de_cache'):
+            assert await leer() == 2
+            await asyncio.sleep(0.03)
+        # El error del refresco se registra y se sigue sirviendo el valor obsoleto
+        assert 'origen caído' in caplog.text
+        assert await leer() == 2
+
+    _ejecutar(principal())
+    gc.collect()
+
+
+def test_cached_sincrono_stale_while_revalidate(caplog):
+    cache = CacheManager(max_size=100)
+    version = 0
+    fallar = False
+
+    @cached(cache, ttl=0.05, stale_ttl=10)
+    def leer():
+        nonlocal version
+        time.sleep(0.01)
+        if fallar:
+            raise RuntimeError('origen caído')
+        version += 1
+        return version
+
+    def esperar_refrescos():
+        for hilo in threading.enumerate():
+            if hilo is not threading.current_thread() and hilo.daemon:
+                hilo.join(1)
+
+    assert leer() == 1
+    time.sleep(0.06)
+    # Obsoleto: se sirve al instante y se refresca en un hilo aparte
+    assert leer() == 1
+    esperar_refrescos()
+    assert leer() == 2
+
+    time.sleep(0.06)
+    fallar = True
+    with caplog.at_level(logging.WARNING, logger='sistema_de_cache'):
+        assert leer() == 2
+        esperar_refrescos()
+    # El error del refresco se registra y se sigue sirviendo el valor obsoleto
+    assert 'origen caído' in caplog.text
+    assert leer() == 2
+
+
+def test_cached_requiere_ttl_para_stale_ttl():
+    with pytest.raises(ValueError):
+        cached(CacheManager(), stale_ttl=5)
+
+
+# --- Presupuesto de bytes ---
+
+def test_presupuesto_de_bytes_expulsa_y_rechaza_valores_grandes():
+    cache = CacheManager(max_size=100, max_bytes=100, sizer=len)
+    cache.set_many({'a': 'x' * 40, 'b': 'x' * 40})
+    cache.set('c', 'x' * 40)
+    # 'a' es la entrada menos reciente: se expulsa para respetar los 100 bytes
+    assert cache.get('a') is None
+    assert cache.get_stats()['current_bytes'] == 80
+
+    cache.set('b', 'x' * 500)
+    # El valor que no cabe no se guarda y la versión anterior de la clave se retira
+    assert cache.get('b') is None
+    assert cache.get('c') == 'x' * 40
+    stats = cache.get_stats()
+    assert stats['rejected_oversized'] == 1
+    assert stats['current_bytes'] == 40
+
+
+def test_sizer_se_llama_sin_el_lock():
+    cache = None
+    tomado = []
+
+    def tomar_lock():
+        if cache._lock.acquire(timeout=1):
+            cache._lock.release()
+            tomado.append(True)
+        else:
+            tomado.append(False)
+
+    def sizer(valor):
+        # Otro hilo debe poder tomar el lock mientras se mide el valor
+        hilo = threading.Thread(target=tomar_lock)
+        hilo.start()
+        hilo.join()
+        return len(valor)
+
+    cache = CacheManager(max_size=10, max_bytes=1000, sizer=sizer)
+    cache.set('a', 'valor')
+    cache.set_many({'b': 'otro', 'c': 'más'})
+    assert tomado == [True, True, True]
+    assert cache.get_stats()['current_bytes'] == len('valor') + len('otro') + len('más')
+
+
+def test_sharded_reparte_el_presupuesto_entre_segmentos():
+    cache = ShardedCacheManager(max_size=160, max_bytes=1600, num_shards=16, sizer=len)
+    assert cache.shard_max_bytes == 100
+    cache.set('pequeno', 'x' * 50)
+    # Cabe en max_bytes pero no en el presupuesto de un segmento
+    cache.set('grande', 'x' * 200)
+    assert cache.get('pequeno') == 'x' * 50
+    assert cache.get('grande') is None
+    stats = cache.get_stats()
+    assert stats['rejected_oversized'] == 1
+    assert stats['shard_max_bytes'] == 100
+
+
+# --- Expiración ---
+
+def test_compactar_el_indice_de_expiracion_conserva_la_clave_nueva():
+    cache = CacheManager(max_size=10)
+    # Reescribir la misma clave deja entradas obsoletas en el índice hasta compactarlo
+    umbral = 2 * 1 + 1024
+    for i in range(umbral):
+        cache.set('k', i, ttl=60)
+    assert len(cache._expiry_heap) == umbral
+    # La clave nueva llega justo en el límite y las siguientes escrituras compactan
+    cache.set('nueva', 'valor', ttl=0.05)
+    assert any(clave == 'nueva' for _, _, clave in cache._expiry_heap)
+    cache.set('k', 'otro', ttl=60)
+    cache.set('k', 'otro', ttl=60)
+    assert len(cache._expiry_heap) == 2
+    assert any(clave == 'nueva' for _, _, clave in cache._expiry_heap)
+
+    time.sleep(0.06)
+    assert cache.cleanup_expired() == 1
+    assert 'nueva' not in cache._cache
+    assert cache.size() == 1
+
+
+def test_cleanup_expired_respeta_el_limite():
+    cache = CacheManager(max_size=100)
+    for i in range(10):
+        cache.set(f'k{i}', i, ttl=0.01)
+    cache.set('permanente', 'valor')
+    time.sleep(0.02)
+    assert cache.cleanup_expired(limit=4) == 4
+    assert cache.cleanup_expired() == 6
+    assert cache.get('permanente') == 'valor'
+
+
+# --- Snapshots ---
+
+@pytest.mark.parametrize('clase', [CacheManager, ShardedCacheManager])
+def test_snapshot_y_restore_conservan_ttl_y_bytes(tmp_path, clase):
+    ruta = str(tmp_path / 'cache.snap')
+    original = clase(max_size=100, max_bytes=1000, sizer=len)
+    original.set('vencida', 'x' * 10, ttl=0.01)
+    time.sleep(0.02)
+    original.set('permanente', 'x' * 30)
+    original.set('larga', 'x' * 20, ttl=60)
+    original.set('corta', 'x' * 40, ttl=0.05)
+    # Lo que ya expiró no se escribe
+    assert original.snapshot(ruta) == 3
+
+    time.sleep(0.06)
+    # 'corta' expira entre el snapshot y la carga: se omite al leer
+    restaurado = clase(max_size=100, max_bytes=1000, sizer=len)
+    assert restaurado.restore(ruta) == 2
+    assert restaurado.get('corta') is None
+    assert restaurado.get('permanente') == 'x' * 30
+    assert restaurado.get('larga') == 'x' * 20
+    assert restaurado.get_stats()['current_bytes'] == 50
+
+    def item(clave):
+        segmento = restaurado._shard_for(clave) if clase is ShardedCacheManager else restaurado
+        return segmento._cache[clave]
+
+    assert 59 < item('larga').expires_at - time.monotonic() <= 60
+    assert item('permanente').expires_at is None
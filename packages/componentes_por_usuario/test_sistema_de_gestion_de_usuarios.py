@@ -0,0 +1,262 @@
+# archivo: test_sistema_de_gestion_de_usuarios.py
+"""Pruebas del registro JSON Lines (recuperación tras un fallo) y del gestor concurrente."""
+import os
+import threading
+from datetime import datetime
+
+import pytest
+
+from sistema_de_gestion_de_usuarios import GestorUsuarios, GestorUsuariosConcurrente
+
+
+@pytest.fixture(params=[False, True], ids=['dict', 'compacto'])
+def compacto(request):
+    return request.param
+
+
+@pytest.fixture
+def registro(tmp_path):
+    return str(tmp_path / 'usuarios.jsonl')
+
+
+def _estado(gestor: GestorUsuarios) -> dict:
+    return {id_usuario: gestor.usuarios[id_usuario].to_dict() for id_usuario in gestor.usuarios}
+
+
+def _poblar(gestor: GestorUsuarios, cantidad: int = 5) -> None:
+    for i in range(cantidad):
+        gestor.crear_usuario(f"Usuario {i}", f"usuario{i}@ejemplo.com")
+
+
+def test_guardar_cambios_solo_anexa_lo_modificado(registro, compacto):
+    gestor = GestorUsuarios(compacto=compacto)
+    _poblar(gestor)
+    gestor.guardar_cambios(registro)
+
+    gestor.usuarios[2].desactivar()
+    gestor.eliminar_usuario(4)
+    # Un put, un del y la línea meta
+    assert gestor.guardar_cambios(registro) == 3
+    assert gestor.guardar_cambios(registro) == 1
+
+    recargado = GestorUsuarios(compacto=compacto)
+    assert recargado.cargar_registro(registro) == 4
+    assert _estado(recargado) == _estado(gestor)
+    assert recargado.proximo_id == gestor.proximo_id
+    assert [u.id_usuario for u in recargado.listar_usuarios_activos()] == [1, 3, 5]
+
+
+def test_linea_incompleta_al_final_se_ignora_y_se_trunca(registro, compacto):
+    gestor = GestorUsuarios(compacto=compacto)
+    _poblar(gestor)
+    gestor.guardar_cambios(registro)
+    esperado = _estado(gestor)
+
+    # Fallo a mitad de una escritura: la última línea queda sin terminar
+    with open(registro, 'a', encoding='utf-8') as archivo:
+        archivo.write('{"op": "put", "usuario": {"id_usuario": 9')
+
+    recargado = GestorUsuarios(compacto=compacto)
+    assert recargado.cargar_registro(registro) == 5
+    assert _estado(recargado) == esperado
+
+    # El siguiente guardado descarta el fragmento antes de anexar
+    recargado.crear_usuario("Nuevo", "nuevo@ejemplo.com")
+    recargado.guardar_cambios(registro)
+    with open(registro, encoding='utf-8') as archivo:
+        assert archivo.read().endswith('\n')
+
+    final = GestorUsuarios(compacto=compacto)
+    assert final.cargar_registro(registro) == 6
+    assert _estado(final) == _estado(recargado)
+
+
+def test_compactacion_interrumpida_conserva_el_registro_anterior(registro):
+    gestor = GestorUsuarios()
+    _poblar(gestor)
+    gestor.compactar_registro(registro)
+    esperado = _estado(gestor)
+
+    # Un temporal a medio escribir de una compactación que no llegó a os.replace
+    with open(f"{registro}.tmp", 'w', encoding='utf-8') as archivo:
+        archivo.write('{"op": "put", "usu')
+
+    recargado = GestorUsuarios()
+    recargado.cargar_registro(registro)
+    assert _estado(recargado) == esperado
+
+    recargado.compactar_registro(registro)
+    assert not os.path.exists(f"{registro}.tmp")
+    assert GestorUsuarios().cargar_registro(registro) == 5
+
+
+def test_registro_inexistente_se_compacta_al_guardar(registro):
+    gestor = GestorUsuarios()
+    _poblar(gestor, 3)
+    gestor.eliminar_usuario(1)
+    # Sin registro previo no hay nada a qué anexar: se escribe el estado completo
+    assert gestor.guardar_cambios(registro) == 3
+    recargado = GestorUsuarios()
+    assert recargado.cargar_registro(registro) == 2
+    assert _estado(recargado) == _estado(gestor)
+
+
+def test_usuario_obsoleto_tras_recargar_no_modifica_el_gestor(registro):
+    gestor = GestorUsuarios()
+    _poblar(gestor, 3)
+    gestor.guardar_cambios(registro)
+    obsoleto = gestor.usuarios[1]
+
+    gestor.cargar_registro(registro)
+    obsoleto.desactivar()
+    obsoleto.registrar_acceso()
+
+    assert gestor.usuarios[1].activo
+    assert gestor.usuarios[1].ultimo_acceso is None
+    assert gestor.contar_activos() == 3
+    assert gestor.guardar_cambios(registro) == 1  # solo la línea meta
+
+
+def test_cambios_sin_registro_no_se_acumulan():
+    gestor = GestorUsuarios()
+    _poblar(gestor, 100)
+    for id_usuario in range(1, 101):
+        gestor.registrar_acceso(id_usuario)
+    assert not gestor._modificados
+
+
+# --- GestorUsuariosConcurrente ---
+
+def _en_hilos(funcion, num_hilos: int = 8) -> None:
+    """Ejecuta ``funcion(hilo)`` en varios hilos que arrancan a la vez y propaga sus errores."""
+    barrera = threading.Barrier(num_hilos)
+    errores = []
+
+    def trabajo(hilo):
+        barrera.wait()
+        try:
+            funcion(hilo)
+        except BaseException as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=trabajo, args=(h,)) for h in range(num_hilos)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        raise errores[0]
+
+
+def test_concurrente_ids_unicos_y_emails_sin_duplicar(compacto):
+    gestor = GestorUsuariosConcurrente(compacto=compacto)
+    duplicados = []
+
+    def crear(hilo):
+        for i in range(500):
+            gestor.crear_usuario(f"Usuario {i}", f"h{hilo}-u{i}@ejemplo.com")
+            try:
+                # Todos los hilos compiten por los mismos emails compartidos
+                gestor.crear_usuario("Compartido", f"COMPARTIDO{i}@ejemplo.com")
+            except ValueError:
+                duplicados.append(i)
+
+    _en_hilos(crear)
+    assert len(gestor.usuarios) == 8 * 500 + 500
+    assert len(duplicados) == 7 * 500
+    assert sorted(gestor.usuarios) == sorted(set(gestor.usuarios))
+    assert all(gestor.buscar_por_email(f"compartido{i}@ejemplo.com") for i in range(500))
+    assert gestor.contar_activos() == len(gestor.usuarios)
+
+
+def test_concurrente_accesos_en_lote_conservan_el_ultimo(compacto):
+    gestor = GestorUsuariosConcurrente(compacto=compacto, max_accesos_pendientes=64)
+    _poblar(gestor, 50)
+
+    def acceder(hilo):
+        for i in range(2000):
+            gestor.registrar_acceso((hilo * 7 + i) % 50 + 1)
+
+    _en_hilos(acceder)
+    gestor.vaciar_accesos()
+    assert not gestor._accesos_pendientes
+
+    por_acceso = list(gestor.iterar_por_acceso())
+    assert sorted(u.id_usuario for u in por_acceso) == list(range(1, 51))
+    accesos = [u.ultimo_acceso for u in por_acceso]
+    assert accesos == sorted(accesos)
+    assert gestor.usuarios_sin_acceso_desde(datetime.min) == []
+
+
+def test_concurrente_iterar_mientras_se_elimina():
+    gestor = GestorUsuariosConcurrente()
+    _poblar(gestor, 2000)
+
+    def trabajo(hilo):
+        if hilo % 2:
+            for id_usuario in range(hilo, 2001, 8):
+                gestor.eliminar_usuario(id_usuario)
+        else:
+            for _ in range(20):
+                ids = [u.id_usuario for u in gestor.iterar_activos()]
+                assert ids == sorted(ids)
+
+    _en_hilos(trabajo)
+    restantes = [u.id_usuario for u in gestor.iterar_activos()]
+    assert restantes == sorted(gestor.usuarios)
+    assert gestor.contar_activos() == len(restantes)
+
+
+def test_concurrente_recarga_mientras_se_crean_usuarios(registro):
+    gestor = GestorUsuariosConcurrente()
+    _poblar(gestor, 100)
+    gestor.compactar_registro(registro)
+
+    def trabajo(hilo):
+        if hilo == 0:
+            for _ in range(20):
+                gestor.cargar_registro(registro)
+        else:
+            for i in range(200):
+                gestor.crear_usuario(f"Usuario {i}", f"h{hilo}-u{i}@ejemplo.com")
+
+    _en_hilos(trabajo)
+    # Ningún usuario creado durante una recarga reutiliza un id ocupado
+    assert len(gestor.usuarios) == len(gestor._indice_email)
+    assert gestor.proximo_id > max(gestor.usuarios)
+    assert all(gestor.buscar_por_email(u.email).id_usuario == id_usuario
+               for id_usuario, u in gestor.usuarios.items())
+
+
+def test_email_reutilizado_tras_eliminar_sobrevive_a_la_recarga(registro, compacto):
+    gestor = GestorUsuarios(compacto=compacto)
+    gestor.crear_usuario("A", "x@e.com")
+    gestor.guardar_cambios(registro)
+    gestor.eliminar_usuario(1)
+    gestor.crear_usuario("B", "x@e.com")
+    # El lote anexa el put del usuario 2 antes que el del del usuario 1
+    gestor.guardar_cambios(registro)
+
+    recargado = GestorUsuarios(compacto=compacto)
+    recargado.cargar_registro(registro)
+    assert recargado.buscar_por_email('x@e.com').id_usuario == 2
+    with pytest.raises(ValueError):
+        recargado.crear_usuario("C", "x@e.com")
+
+
+def test_intercambio_de_emails_sobrevive_a_la_recarga(registro, compacto):
+    gestor = GestorUsuarios(compacto=compacto)
+    gestor.crear_usuario("A", "a@e.com")
+    gestor.crear_usuario("B", "b@e.com")
+    gestor.guardar_cambios(registro)
+    gestor.actualizar_email(2, 'z@e.com')
+    gestor.actualizar_email(1, 'b@e.com')
+    gestor.guardar_cambios(registro)
+
+    recargado = GestorUsuarios(compacto=compacto)
+    recargado.cargar_registro(registro)
+    for gestor_actual in (gestor, recargado):
+        assert gestor_actual.buscar_por_email('b@e.com').id_usuario == 1
+        assert gestor_actual.buscar_por_email('z@e.com').id_usuario == 2
+        assert gestor_actual.buscar_por_email('a@e.com') is None
+    assert recargado._indice_email == gestor._indice_email
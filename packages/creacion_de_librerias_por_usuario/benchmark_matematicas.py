@@ -0,0 +1,205 @@
+"""
+Benchmarks de utilidades.matematicas.
+
+Uso (desde este directorio):
+    python benchmark_matematicas.py
+"""
+
+import math
+import random
+import time
+import tracemalloc
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, List
+
+from utilidades.matematicas import (AcumuladorEstadisticas, calcular_estadisticas,
+                                    contar_primos, es_primo, es_primo_lote, factorial,
+                                    factorial_rango, fibonacci, fibonacci_rango,
+                                    generar_primos, iter_primos)
+
+
+def _medir(funcion: Callable[[], object]) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def _pico_memoria(funcion: Callable[[], object]) -> int:
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico
+
+
+def generar_primos_original(limite: int) -> List[int]:
+    """Implementación anterior (lista de booleanos y bucle interno en Python), como referencia."""
+    if limite < 2:
+        return []
+    es_primo_array = [True] * (limite + 1)
+    es_primo_array[0] = es_primo_array[1] = False
+    for i in range(2, int(math.sqrt(limite)) + 1):
+        if es_primo_array[i]:
+            for j in range(i * i, limite + 1, i):
+                es_primo_array[j] = False
+    return [i for i in range(2, limite + 1) if es_primo_array[i]]
+
+
+def benchmark_primos(exponentes=(6, 7, 8, 9), max_exponente_original: int = 7,
+                     max_exponente_lista: int = 8):
+    """Tabla de tiempos de la criba para límites 10^6..10^9."""
+    print("\n=== Criba de Eratóstenes ===")
+    print(f"{'límite':>8} {'primos':>12} {'original (s)':>13} {'generar_primos (s)':>19} "
+          f"{'contar_primos (s)':>18} {'pico iter_primos':>17}")
+    for exponente in exponentes:
+        limite = 10 ** exponente
+        original = (f"{_medir(lambda: generar_primos_original(limite)):13.2f}"
+                    if exponente <= max_exponente_original else f"{'-':>13}")
+        lista = (f"{_medir(lambda: generar_primos(limite)):19.2f}"
+                 if exponente <= max_exponente_lista else f"{'-':>19}")
+        cantidad = 0
+
+        def contar():
+            nonlocal cantidad
+            cantidad = contar_primos(limite)
+
+        duracion_contar = _medir(contar)
+        # Memoria de recorrer 10^6 números con el iterador (acotada por el segmento)
+        pico = _pico_memoria(lambda: sum(1 for _ in iter_primos(limite, limite + 10 ** 6)))
+        print(f"10^{exponente:<5} {cantidad:>12,} {original} {lista} "
+              f"{duracion_contar:18.2f} {pico / 1024:>13.0f} KiB")
+
+
+def es_primo_original(n: int) -> bool:
+    """Implementación anterior (división de prueba hasta sqrt(n)), como referencia."""
+    if n < 2:
+        return False
+    if n == 2:
+        return True
+    if n % 2 == 0:
+        return False
+    for i in range(3, int(math.sqrt(n)) + 1, 2):
+        if n % i == 0:
+            return False
+    return True
+
+
+def benchmark_primalidad(muestras: int = 2_000):
+    """Compara la división de prueba con Miller-Rabin por tamaño de número."""
+    rng = random.Random(0)
+    print("\n=== Primalidad: microsegundos por número ===")
+    print(f"{'rango':>8} {'original':>12} {'es_primo':>12} {'es_primo_lote':>15}")
+    for bits in (20, 32, 48, 64, 128, 512):
+        numeros = [rng.getrandbits(bits) | 1 for _ in range(muestras)]
+        por_numero = lambda f: _medir(f) / muestras * 1e6
+        original = (f"{por_numero(lambda: [es_primo_original(n) for n in numeros]):12.2f}"
+                    if bits <= 32 else f"{'-':>12}")
+        nuevo = por_numero(lambda: [es_primo(n) for n in numeros])
+        lote = por_numero(lambda: es_primo_lote(numeros))
+        print(f"{bits:>5} b {original} {nuevo:12.2f} {lote:15.2f}")
+
+
+@lru_cache(maxsize=128)
+def factorial_original(n: int) -> int:
+    """Implementación anterior (recursiva con caché de 128 entradas), como referencia."""
+    if n <= 1:
+        return 1
+    return n * factorial_original(n - 1)
+
+
+@lru_cache(maxsize=128)
+def fibonacci_original(n: int) -> int:
+    """Implementación anterior (recursiva con caché de 128 entradas), como referencia."""
+    if n <= 1:
+        return n
+    return fibonacci_original(n - 1) + fibonacci_original(n - 2)
+
+
+def _medir_original(funcion: Callable[[int], int], n: int) -> str:
+    """Mide la versión recursiva con la caché vacía, indicando si agota la recursión."""
+    funcion.cache_clear()
+    try:
+        return f"{_medir(lambda: funcion(n)) * 1e3:13.3f}"
+    except RecursionError:
+        return f"{'recursión':>13}"
+
+
+def benchmark_fibonacci_factorial(posiciones=(100, 500, 2_000, 20_000, 100_000),
+                                  rango: int = 5_000):
+    """Tiempos (ms) de fibonacci/factorial y de sus variantes por rango."""
+    print("\n=== Fibonacci y factorial: milisegundos ===")
+    print(f"{'n':>10} {'fib original':>13} {'fibonacci':>10} {'fact original':>13} "
+          f"{'factorial':>10}")
+    for n in posiciones:
+        fib_original = (_medir_original(fibonacci_original, n)
+                        if n <= 10_000 else f"{'-':>13}")
+        fact_original = (_medir_original(factorial_original, n)
+                         if n <= 10_000 else f"{'-':>13}")
+        print(f"{n:>10,} {fib_original} {_medir(lambda: fibonacci(n)) * 1e3:10.3f} "
+              f"{fact_original} {_medir(lambda: factorial(n)) * 1e3:10.3f}")
+
+    print(f"\nRango 0..{rango:,} completo:")
+    fibonacci_original.cache_clear()
+    # La versión recursiva solo aguanta el rango si se recorre en orden creciente
+    print(f"  fibonacci_original uno a uno   {_medir(lambda: [fibonacci_original(i) for i in range(rango)]):8.3f} s")
+    print(f"  fibonacci uno a uno            {_medir(lambda: [fibonacci(i) for i in range(rango)]):8.3f} s")
+    print(f"  fibonacci_rango                {_medir(lambda: fibonacci_rango(0, rango)):8.3f} s")
+    print(f"  factorial uno a uno            {_medir(lambda: [factorial(i) for i in range(rango)]):8.3f} s")
+    print(f"  factorial_rango                {_medir(lambda: factorial_rango(0, rango)):8.3f} s")
+
+
+def calcular_estadisticas_original(datos: List[float]) -> dict:
+    """Implementación anterior (ordena la lista y hace varias pasadas), como referencia."""
+    datos_ordenados = sorted(datos)
+    n = len(datos)
+    media = sum(datos) / n
+    if n % 2 == 0:
+        mediana = (datos_ordenados[n//2 - 1] + datos_ordenados[n//2]) / 2
+    else:
+        mediana = datos_ordenados[n//2]
+    moda = Counter(datos).most_common(1)[0][0]
+    varianza = sum((x - media) ** 2 for x in datos) / n
+    return {'media': media, 'mediana': mediana, 'moda': moda, 'varianza': varianza,
+            'minimo': min(datos), 'maximo': max(datos)}
+
+
+def benchmark_estadisticas(n: int = 1_000_000):
+    """Tiempo y memoria de calcular_estadisticas frente a la versión anterior."""
+    rng = random.Random(0)
+    flotantes = [rng.lognormvariate(0, 1) for _ in range(n)]
+    enteros = [rng.randint(0, 1_000) for _ in range(n)]
+    print(f"\n=== Estadísticas sobre {n:,} valores ===")
+    print(f"{'variante':<28} {'flotantes (s)':>14} {'enteros (s)':>12}")
+    variantes = [
+        ('original', calcular_estadisticas_original),
+        ('exacta', calcular_estadisticas),
+        ('aproximada', lambda datos: calcular_estadisticas(datos, exacto=False)),
+    ]
+    for nombre, funcion in variantes:
+        print(f"{nombre:<28} {_medir(lambda: funcion(flotantes)):14.2f} "
+              f"{_medir(lambda: funcion(enteros)):12.2f}")
+
+    # Con un flujo la versión aproximada no necesita guardar los datos
+    def flujo():
+        generador = random.Random(0)
+        return (generador.lognormvariate(0, 1) for _ in range(n))
+
+    pico_lista = _pico_memoria(lambda: calcular_estadisticas_original(list(flujo())))
+    pico_flujo = _pico_memoria(lambda: calcular_estadisticas(flujo(), exacto=False))
+    print(f"Pico de memoria con un flujo: original {pico_lista / 2**20:.1f} MiB, "
+          f"aproximada {pico_flujo / 2**20:.1f} MiB")
+
+    ordenados = sorted(flotantes)
+    acumulador = AcumuladorEstadisticas()
+    acumulador.actualizar_lote(flotantes)
+    for q in (0.01, 0.5, 0.99):
+        exacto = ordenados[int(q * (n - 1))]
+        print(f"  cuantil {q:<5} exacto {exacto:9.4f}  aproximado {acumulador.cuantil(q):9.4f}")
+
+
+if __name__ == "__main__":
+    benchmark_primos()
+    benchmark_primalidad()
+    benchmark_fibonacci_factorial()
+    benchmark_estadisticas()
@@ -0,0 +1,249 @@
+"""
+Benchmarks de utilidades.texto sobre un corpus sintético.
+
+Uso (desde este directorio):
+    python benchmark_texto.py
+"""
+
+import itertools
+import mmap
+import os
+import random
+import re
+import string
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, List, Optional
+
+from utilidades import texto
+from utilidades.texto import (ContadorPalabras, IndiceResumen, contar_palabras,
+                              extraer_numeros, extraer_numeros_array, generar_resumen,
+                              iter_numeros, iter_numeros_archivo, limpiar_lote, limpiar_texto,
+                              procesar_corpus)
+
+
+def _medir(funcion: Callable[[], object]) -> float:
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def generar_corpus(documentos: int = 2_000, palabras_por_documento: int = 500,
+                   proporcion_acentos: float = 0.2, semilla: int = 0) -> List[str]:
+    """Documentos con palabras de frecuencia tipo Zipf, puntuación, números y acentos."""
+    rng = random.Random(semilla)
+    letras = string.ascii_letters + 'áéíóúñÁÉÍÓÚÑü'
+    vocabulario = [''.join(rng.choice(letras if rng.random() < proporcion_acentos
+                                      else string.ascii_letters)
+                           for _ in range(rng.randint(2, 10)))
+                   for _ in range(20_000)]
+    pesos = list(itertools.accumulate(1 / (rango + 1) for rango in range(len(vocabulario))))
+    corpus = []
+    for _ in range(documentos):
+        partes = []
+        for palabra in rng.choices(vocabulario, cum_weights=pesos, k=palabras_por_documento):
+            if rng.random() < 0.05:
+                palabra = str(rng.randint(0, 99_999))
+            if rng.random() < 0.1:
+                palabra += rng.choice(',.;:!?')
+            partes.append(palabra)
+            partes.append(rng.choice((' ', ' ', ' ', '  ', '\n')))
+        corpus.append(''.join(partes))
+    return corpus
+
+
+def limpiar_texto_original(texto: str, mantener_numeros: bool = True,
+                           mantener_espacios: bool = True) -> str:
+    """Implementación anterior (filtro carácter a carácter y re.sub), como referencia."""
+    if not texto:
+        return ""
+    texto = texto.lower()
+    caracteres_permitidos = string.ascii_lowercase
+    if mantener_numeros:
+        caracteres_permitidos += string.digits
+    if mantener_espacios:
+        caracteres_permitidos += ' '
+    texto_limpio = ''.join(c for c in texto if c in caracteres_permitidos)
+    if mantener_espacios:
+        texto_limpio = re.sub(r'\s+', ' ', texto_limpio).strip()
+    return texto_limpio
+
+
+def benchmark_limpieza(corpus: List[str]):
+    """Millones de caracteres por segundo de cada variante de limpieza."""
+    caracteres = sum(len(documento) for documento in corpus)
+    print(f"\n=== limpiar_texto: {len(corpus):,} documentos, {caracteres / 1e6:.1f} M caracteres ===")
+    variantes = [
+        ('original', lambda: [limpiar_texto_original(d) for d in corpus]),
+        ('limpiar_texto', lambda: [limpiar_texto(d) for d in corpus]),
+        ('limpiar_lote', lambda: list(limpiar_lote(corpus))),
+        ('original sin números', lambda: [limpiar_texto_original(d, False) for d in corpus]),
+        ('limpiar_lote sin números', lambda: list(limpiar_lote(corpus, False))),
+    ]
+    for nombre, funcion in variantes:
+        duracion = _medir(funcion)
+        print(f"{nombre:<26} {caracteres / duracion / 1e6:8.1f} M car/s")
+
+
+def _pico_memoria(funcion: Callable[[], object]) -> int:
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pico
+
+
+def benchmark_conteo(corpus: List[str]):
+    """Tiempo y pico de memoria de contar palabras de un archivo entero o por bloques."""
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt',
+                                     delete=False) as archivo:
+        for documento in corpus:
+            archivo.write(documento)
+            archivo.write(' ')
+    ruta = archivo.name
+    try:
+        def leer_completo():
+            with open(ruta, encoding='utf-8') as f:
+                return contar_palabras(f.read())
+
+        def por_bloques(capacidad=None):
+            contador = ContadorPalabras(capacidad)
+            contador.actualizar_archivo(ruta)
+            return contador
+
+        megas = os.path.getsize(ruta) / 2**20
+        print(f"\n=== Conteo de palabras de un archivo de {megas:.1f} MiB ===")
+        variantes = [
+            ('contar_palabras(f.read())', leer_completo),
+            ('ContadorPalabras exacto', por_bloques),
+            ('ContadorPalabras(1000)', lambda: por_bloques(1_000)),
+        ]
+        for nombre, funcion in variantes:
+            duracion = _medir(funcion)
+            pico = _pico_memoria(funcion)
+            print(f"{nombre:<28} {megas / duracion:8.1f} MiB/s {pico / 2**20:8.1f} MiB pico")
+
+        exactas = [palabra for palabra, _ in por_bloques().mas_comunes(10)]
+        aproximadas = [palabra for palabra, _ in por_bloques(1_000).mas_comunes(10)]
+        print(f"Top 10 coincide con el exacto: {exactas == aproximadas}")
+    finally:
+        os.remove(ruta)
+
+
+def benchmark_corpus(corpus: List[str], max_workers: Optional[int] = None):
+    """Escalado de procesar_corpus de 1 a N procesos sobre documentos en disco."""
+    max_workers = max_workers or os.cpu_count() or 1
+    # 1, 2, 4, ... hasta max_workers
+    cantidades = sorted({2 ** i for i in range(max_workers.bit_length())} | {max_workers})
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = []
+        for i, documento in enumerate(corpus):
+            ruta = os.path.join(directorio, f"doc_{i:06d}.txt")
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(documento)
+            rutas.append(ruta)
+
+        print(f"\n=== procesar_corpus: {len(rutas):,} documentos, {os.cpu_count()} núcleos ===")
+        print(f"{'workers':>8} {'segundos':>9} {'docs/s':>10} {'M car/s':>8} {'aceleración':>12}")
+        base = None
+        referencia = None
+        for workers in cantidades:
+            resultado = procesar_corpus(rutas, workers=workers)
+            segundos = resultado['segundos']
+            base = base or segundos
+            if referencia is None:
+                referencia = resultado['contar_palabras']
+            assert resultado['contar_palabras'] == referencia
+            print(f"{workers:>8} {segundos:9.2f} {len(rutas) / segundos:10.0f} "
+                  f"{resultado['caracteres'] / segundos / 1e6:8.1f} {base / segundos:11.2f}x")
+
+
+def generar_resumen_original(texto: str, num_oraciones: int = 3) -> str:
+    """Implementación anterior (limpia cada oración dos veces y ordena todo), como referencia."""
+    if not texto:
+        return ""
+    oraciones = [o.strip() for o in re.split(r'[.!?]+', texto) if o.strip()]
+    if len(oraciones) <= num_oraciones:
+        return texto
+    todas_palabras = []
+    for oracion in oraciones:
+        palabras = limpiar_texto_original(oracion, mantener_numeros=False).split()
+        todas_palabras.extend([p for p in palabras if len(p) > 3])
+    frecuencias = Counter(todas_palabras)
+    puntuaciones = []
+    for oracion in oraciones:
+        palabras = limpiar_texto_original(oracion, mantener_numeros=False).split()
+        puntuacion = sum(frecuencias.get(p, 0) for p in palabras if len(p) > 3)
+        puntuaciones.append((puntuacion, oracion))
+    puntuaciones.sort(reverse=True)
+    return '. '.join(oracion for _, oracion in puntuaciones[:num_oraciones]) + '.'
+
+
+def benchmark_resumen(corpus: List[str], longitudes=(1, 3, 5, 10, 20)):
+    """Tiempo de resumir un documento largo con varias longitudes de resumen."""
+    documento = ' '.join(corpus)
+    print(f"\n=== generar_resumen: {len(documento) / 1e6:.1f} M caracteres, "
+          f"{len(longitudes)} longitudes ===")
+    original = _medir(lambda: [generar_resumen_original(documento, n) for n in longitudes])
+    sin_indice = _medir(lambda: [generar_resumen(documento, n) for n in longitudes])
+    construir = _medir(lambda: IndiceResumen(documento))
+    indice = IndiceResumen(documento)
+    reutilizado = _medir(lambda: [generar_resumen(documento, n, indice) for n in longitudes])
+    print(f"original                   {original:8.3f} s")
+    print(f"generar_resumen            {sin_indice:8.3f} s")
+    print(f"construir IndiceResumen    {construir:8.3f} s")
+    print(f"reutilizando el índice     {reutilizado:8.4f} s")
+
+
+def generar_log_numerico(ruta: str, lineas: int = 300_000, semilla: int = 0) -> None:
+    """Escribe un log con marcas de tiempo, latencias, contadores y valores científicos."""
+    rng = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for i in range(lineas):
+            archivo.write(f"2024-05-{i % 28 + 1:02d} t={i} latencia={rng.uniform(0, 500):.3f}ms "
+                          f"bytes={rng.randint(0, 10**7)} error={rng.gauss(0, 1):.4e} "
+                          f"carga=-{rng.random():.2f}\n")
+
+
+def _sumar_array_mmap(ruta: str) -> float:
+    with open(ruta, 'rb') as archivo, \
+            mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        return float(extraer_numeros_array(mapa).sum())
+
+
+def benchmark_numeros(lineas: int = 300_000):
+    """MiB/s y pico de memoria al extraer los números de un log completo."""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'numeros.log')
+        generar_log_numerico(ruta, lineas)
+        megas = os.path.getsize(ruta) / 2**20
+
+        def leer():
+            with open(ruta, encoding='utf-8') as f:
+                return f.read()
+
+        variantes = [
+            ('extraer_numeros(f.read())', lambda: sum(extraer_numeros(leer()))),
+            ('iter_numeros(f.read())', lambda: sum(iter_numeros(leer()))),
+            ('iter_numeros_archivo (mmap)', lambda: sum(iter_numeros_archivo(ruta))),
+        ]
+        if texto.np is not None:
+            variantes.append(('extraer_numeros_array (mmap)',
+                              lambda: _sumar_array_mmap(ruta)))
+
+        print(f"\n=== Extracción de números de un log de {megas:.1f} MiB ===")
+        for nombre, funcion in variantes:
+            duracion = _medir(funcion)
+            pico = _pico_memoria(funcion)
+            print(f"{nombre:<30} {megas / duracion:8.1f} MiB/s {pico / 2**20:8.1f} MiB pico")
+
+
+if __name__ == "__main__":
+    corpus = generar_corpus()
+    benchmark_limpieza(corpus)
+    benchmark_conteo(corpus)
+    benchmark_resumen(corpus)
+    benchmark_corpus(corpus)
+    benchmark_numeros()
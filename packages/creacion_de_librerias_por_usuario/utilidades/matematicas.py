@@ -1,14 +1,24 @@
 """Módulo de utilidades matemáticas."""
 
+import bisect
+import itertools
 import math
-from typing import List, Dict, Union
-from functools import lru_cache
+import random
+from collections import Counter
+from typing import Any, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo acelera el procesamiento de arrays
+    np = None
 
-@lru_cache(maxsize=128)
 def factorial(n: int) -> int:
     """
     Calcula el factorial de un número.
     
+    Usa ``math.factorial``, que multiplica por división binaria (binary
+    splitting) en C: sin recursión en Python ni límite de profundidad.
+    
     Args:
         n: Número entero no negativo
         
@@ -20,15 +30,53 @@ def factorial(n: int) -> int:
     """
     if n < 0:
         raise ValueError("El factorial no está definido para números negativos")
-    if n <= 1:
-        return 1
-    return n * factorial(n - 1)
+    return math.factorial(n)
+
+def factorial_rango(inicio: int, fin: int) -> List[int]:
+    """
+    Calcula los factoriales de inicio..fin-1 en una sola pasada.
+    
+    Solo el primero se calcula completo; cada uno de los siguientes es el
+    anterior por una multiplicación.
+    
+    Args:
+        inicio: Primer número del rango (no negativo)
+        fin: Límite superior (excluido)
+        
+    Returns:
+        Lista ``[inicio!, (inicio + 1)!, ..., (fin - 1)!]``
+        
+    Raises:
+        ValueError: Si inicio es negativo
+    """
+    if inicio < 0:
+        raise ValueError("El factorial no está definido para números negativos")
+    if fin <= inicio:
+        return []
+    actual = math.factorial(inicio)
+    resultado = [actual]
+    for i in range(inicio + 1, fin):
+        actual *= i
+        resultado.append(actual)
+    return resultado
+
+def _fibonacci_par(n: int) -> Tuple[int, int]:
+    """Devuelve (F(n), F(n + 1)) por duplicación rápida, recorriendo los bits de n."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        # F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == '1':
+            a, b = b, a + b
+    return a, b
 
-@lru_cache(maxsize=128)
 def fibonacci(n: int) -> int:
     """
     Calcula el n-ésimo número de Fibonacci.
     
+    Usa duplicación rápida (fast doubling): O(log n) multiplicaciones, sin
+    recursión ni caché.
+    
     Args:
         n: Posición en la secuencia (0-indexada)
         
@@ -37,82 +85,659 @@ def fibonacci(n: int) -> int:
     """
     if n < 0:
         raise ValueError("n debe ser no negativo")
-    if n <= 1:
-        return n
-    return fibonacci(n - 1) + fibonacci(n - 2)
+    return _fibonacci_par(n)[0]
+
+def fibonacci_rango(inicio: int, fin: int) -> List[int]:
+    """
+    Calcula F(inicio)..F(fin-1) en una sola pasada.
+    
+    Los dos primeros términos se obtienen por duplicación rápida y el resto
+    con una suma cada uno.
+    
+    Args:
+        inicio: Primera posición del rango (no negativa)
+        fin: Límite superior (excluido)
+        
+    Returns:
+        Lista ``[F(inicio), F(inicio + 1), ..., F(fin - 1)]``
+    """
+    if inicio < 0:
+        raise ValueError("n debe ser no negativo")
+    if fin <= inicio:
+        return []
+    a, b = _fibonacci_par(inicio)
+    resultado = []
+    for _ in range(fin - inicio):
+        resultado.append(a)
+        a, b = b, a + b
+    return resultado
+
+_PRIMOS_PEQUENOS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61,
+                    67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137,
+                    139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199)
+_CONJUNTO_PRIMOS_PEQUENOS = frozenset(_PRIMOS_PEQUENOS)
+# Producto de los primos pequeños: un solo gcd descarta sus múltiplos
+_PRIMORIAL = math.prod(_PRIMOS_PEQUENOS)
+# Con estas bases Miller-Rabin es determinista para todo n < 3.18 * 10^23 (> 2^64):
+# el límite es el menor pseudoprimo fuerte para todas ellas
+_BASES_DETERMINISTAS = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+_LIMITE_DETERMINISTA = 318665857834031151167461
+# Ancho máximo del rango [mínimo, máximo] que es_primo_lote criba (bytes de la criba * 2)
+_LIMITE_CRIBA_LOTE = 10 ** 7
+# La criba cuesta unos pocos ns por número del rango y es_primo ~1 µs por consulta:
+# solo se criba si el rango no supera esta cantidad de números por consulta
+_RANGO_CRIBA_POR_CONSULTA = 500
+# Cribado vectorizado con numpy: valores que caben en int64 y lotes que
+# compensan el costo fijo de una operación por primo pequeño
+_LIMITE_INT64 = 2 ** 63
+_MINIMO_LOTE_NUMPY = 512
+
+def _miller_rabin(n: int, bases) -> bool:
+    """Prueba de Miller-Rabin para n impar > 3 con las bases dadas."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
 
-def es_primo(n: int) -> bool:
+def es_primo(n: int, rondas: int = 16) -> bool:
     """
     Verifica si un número es primo.
     
+    Descarta primero los múltiplos de primos pequeños con un único ``gcd`` y
+    luego aplica Miller-Rabin, que es determinista (exacto) para n < 2^64 y
+    probabilístico más allá, con error menor a 4^-rondas.
+    
     Args:
         n: Número a verificar
+        rondas: Bases aleatorias adicionales para n fuera del rango determinista
         
     Returns:
         True si es primo, False en caso contrario
     """
     if n < 2:
         return False
-    if n == 2:
+    if n in _CONJUNTO_PRIMOS_PEQUENOS:
         return True
-    if n % 2 == 0:
+    if math.gcd(n, _PRIMORIAL) != 1:
         return False
+    return _es_primo_sin_factores_pequenos(n, rondas)
+
+def _es_primo_sin_factores_pequenos(n: int, rondas: int = 16) -> bool:
+    """Primalidad de n > 199 sin factores primos hasta 199."""
+    if n < 199 * 199:
+        # Sin factores hasta 199 y menor que 199^2: es primo
+        return True
+    if n < _LIMITE_DETERMINISTA:
+        return _miller_rabin(n, _BASES_DETERMINISTAS)
+    bases = _BASES_DETERMINISTAS + tuple(random.randrange(2, n - 1) for _ in range(rondas))
+    return _miller_rabin(n, bases)
+
+def _sin_factores_pequenos(numeros: List[int], minimo: int, maximo: int) -> List[bool]:
+    """Indica qué números no son múltiplos de ningún primo hasta 199.
     
-    # Verificar divisores impares hasta sqrt(n)
-    for i in range(3, int(math.sqrt(n)) + 1, 2):
-        if n % i == 0:
-            return False
-    return True
+    Con numpy (lotes grandes de valores que caben en int64) se prueba cada
+    primo sobre todo el lote a la vez; si no, un ``gcd`` con ``_PRIMORIAL``
+    por número.
+    """
+    if (np is not None and len(numeros) >= _MINIMO_LOTE_NUMPY and
+            minimo >= 0 and maximo < _LIMITE_INT64):
+        valores = np.fromiter(numeros, dtype=np.int64, count=len(numeros))
+        libres = np.ones(len(numeros), dtype=bool)
+        for p in _PRIMOS_PEQUENOS:
+            libres &= valores % p != 0
+        return libres.tolist()
+    return [math.gcd(n, _PRIMORIAL) == 1 for n in numeros]
+
+def es_primo_lote(numeros: Iterable[int]) -> List[bool]:
+    """
+    Verifica la primalidad de muchos números a la vez.
+    
+    Si el rango entre el menor y el mayor es pequeño en relación con la
+    cantidad de números, se criba ese rango una sola vez y cada consulta es
+    una búsqueda en la criba. Si no, se descartan en bloque los múltiplos de
+    primos pequeños (vectorizado con numpy si está disponible) y Miller-Rabin
+    solo se aplica a los que quedan.
+    
+    Args:
+        numeros: Números a verificar
+        
+    Returns:
+        Lista de booleanos en el mismo orden que ``numeros``
+    """
+    numeros = list(numeros)
+    if not numeros:
+        return []
+    maximo = max(numeros)
+    if maximo < 2:
+        return [False] * len(numeros)
+    minimo = min(numeros)
+    rango = maximo - max(minimo, 2)
+    if (rango <= _LIMITE_CRIBA_LOTE and
+            rango + math.isqrt(maximo) <= len(numeros) * _RANGO_CRIBA_POR_CONSULTA):
+        return _es_primo_lote_criba(numeros, max(minimo, 3), maximo)
+    
+    libres = _sin_factores_pequenos(numeros, minimo, maximo)
+    return [_es_primo_sin_factores_pequenos(n) if libre and n > 199
+            else n in _CONJUNTO_PRIMOS_PEQUENOS
+            for n, libre in zip(numeros, libres)]
+
+def _es_primo_lote_criba(numeros: List[int], minimo: int, maximo: int) -> List[bool]:
+    """Criba los impares de [minimo, maximo] y consulta cada número en ella."""
+    origen = minimo | 1
+    # criba[i] indica si el impar origen + 2*i es primo
+    criba = bytearray((maximo - origen) // 2 + 1)
+    for base, segmento in _segmentos_impares(origen, maximo + 1, 1 << 18):
+        inicio = (base - origen) // 2
+        criba[inicio:inicio + len(segmento)] = segmento
+    return [n == 2 if n % 2 == 0 else (n > 1 and criba[(n - origen) // 2] == 1)
+            for n in numeros]
+
+# Tamaño de los bloques en que se consume un iterable: cada bloque se resume
+# con funciones en C (sum, min, max, Counter) y luego se fusiona
+_TAMANO_BLOQUE_ESTADISTICAS = 8192
+
+class DigestCuantiles:
+    """
+    Resumen aproximado de una distribución para estimar cuantiles (t-digest).
+    
+    Agrupa los valores en centroides (media, peso) que son pequeños cerca de
+    los extremos y grandes en el centro, así que los cuantiles extremos son
+    muy precisos con memoria acotada por ``compresion``. Dos digests se
+    pueden fusionar, lo que permite resumir por bloques o procesos.
+    """
+    
+    def __init__(self, compresion: int = 100):
+        if compresion <= 0:
+            raise ValueError("La compresión debe ser positiva")
+        self.compresion = compresion
+        self.total = 0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._medias: List[float] = []
+        self._pesos: List[float] = []
+        self._buffer_medias: List[float] = []
+        self._buffer_pesos: List[float] = []
+        self._limite_buffer = 10 * compresion
+    
+    def _k(self, q: float) -> float:
+        # Función de escala k1: centroides pequeños en las colas
+        return self.compresion * (math.asin(2 * q - 1) / math.pi + 0.5)
+    
+    def _k_inversa(self, k: float) -> float:
+        k = min(k, self.compresion)
+        return (math.sin((k / self.compresion - 0.5) * math.pi) + 1) / 2
+    
+    def agregar(self, valor: float, peso: float = 1) -> None:
+        """
+        Agrega un valor al digest.
+        
+        Args:
+            valor: Valor observado
+            peso: Número de veces que se observó
+        """
+        self._buffer_medias.append(valor)
+        self._buffer_pesos.append(peso)
+        self.total += peso
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        if len(self._buffer_medias) >= self._limite_buffer:
+            self._comprimir()
+    
+    def agregar_lote(self, valores: Sequence[float]) -> None:
+        """
+        Agrega una secuencia de valores de peso uno.
+        
+        Args:
+            valores: Valores observados
+        """
+        if not len(valores):
+            return
+        if np is not None and isinstance(valores, np.ndarray):
+            self._agregar_array(valores)
+            return
+        self._buffer_medias.extend(valores)
+        self._buffer_pesos.extend(itertools.repeat(1, len(valores)))
+        self.total += len(valores)
+        self.minimo = min(self.minimo, min(valores))
+        self.maximo = max(self.maximo, max(valores))
+        if len(self._buffer_medias) >= self._limite_buffer:
+            self._comprimir()
+    
+    def _agregar_array(self, valores) -> None:
+        """Agrupa un array ordenado en centroides de forma vectorizada antes de fusionarlo."""
+        ordenados = np.sort(valores, axis=None).astype(float)
+        n = len(ordenados)
+        # Cada valor va al centroide que le toca según su cuantil dentro del
+        # array, con el doble de resolución que el digest para no perder precisión
+        q = (np.arange(n) + 0.5) / n
+        grupos = np.floor(2 * self.compresion * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        inicios = np.concatenate(([0], np.flatnonzero(np.diff(grupos)) + 1))
+        pesos = np.diff(np.append(inicios, n))
+        medias = np.add.reduceat(ordenados, inicios) / pesos
+        self._buffer_medias.extend(medias.tolist())
+        self._buffer_pesos.extend(pesos.tolist())
+        self.total += n
+        self.minimo = min(self.minimo, float(ordenados[0]))
+        self.maximo = max(self.maximo, float(ordenados[-1]))
+        self._comprimir()
+    
+    def fusionar(self, otro: 'DigestCuantiles') -> 'DigestCuantiles':
+        """
+        Incorpora los centroides de otro digest.
+        
+        Args:
+            otro: Digest a fusionar (no se modifica)
+            
+        Returns:
+            Este mismo digest, para encadenar llamadas
+        """
+        otro._comprimir()
+        self._buffer_medias.extend(otro._medias)
+        self._buffer_pesos.extend(otro._pesos)
+        self.total += otro.total
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._comprimir()
+        return self
+    
+    def _comprimir(self) -> None:
+        """Fusiona el buffer con los centroides respetando el tamaño máximo por cuantil."""
+        if not self._buffer_medias:
+            return
+        pares = sorted(zip(self._medias + self._buffer_medias,
+                           self._pesos + self._buffer_pesos))
+        self._buffer_medias = []
+        self._buffer_pesos = []
+        total = self.total
+        medias: List[float] = []
+        pesos: List[float] = []
+        acumulado = 0
+        media_actual, peso_actual = pares[0]
+        q_limite = self._k_inversa(self._k(0) + 1)
+        for media, peso in itertools.islice(pares, 1, None):
+            if (acumulado + peso_actual + peso) / total <= q_limite:
+                peso_actual += peso
+                media_actual += (media - media_actual) * peso / peso_actual
+            else:
+                medias.append(media_actual)
+                pesos.append(peso_actual)
+                acumulado += peso_actual
+                q_limite = self._k_inversa(self._k(acumulado / total) + 1)
+                media_actual, peso_actual = media, peso
+        medias.append(media_actual)
+        pesos.append(peso_actual)
+        self._medias = medias
+        self._pesos = pesos
+    
+    def cuantil(self, q: float) -> float:
+        """
+        Estima el cuantil q.
+        
+        Args:
+            q: Probabilidad entre 0 y 1
+            
+        Returns:
+            Valor aproximado del cuantil
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q debe estar entre 0 y 1")
+        self._comprimir()
+        if not self._medias:
+            raise ValueError("El digest está vacío")
+        if len(self._medias) == 1:
+            return self._medias[0]
+        
+        # Cada centroide representa el punto medio de su peso acumulado
+        centros = []
+        acumulado = 0
+        for peso in self._pesos:
+            centros.append(acumulado + peso / 2)
+            acumulado += peso
+        objetivo = q * self.total
+        if objetivo <= centros[0]:
+            x0, y0, x1, y1 = 0, self.minimo, centros[0], self._medias[0]
+        elif objetivo >= centros[-1]:
+            x0, y0, x1, y1 = centros[-1], self._medias[-1], self.total, self.maximo
+        else:
+            i = bisect.bisect_right(centros, objetivo) - 1
+            x0, y0, x1, y1 = centros[i], self._medias[i], centros[i + 1], self._medias[i + 1]
+        if x1 == x0:
+            return y0
+        return y0 + (y1 - y0) * (objetivo - x0) / (x1 - x0)
+
+class AcumuladorEstadisticas:
+    """
+    Calcula estadísticas descriptivas en una sola pasada sobre un flujo de datos.
+    
+    Media y varianza se actualizan con el algoritmo de Welford (y la fórmula
+    de Chan para fusionar bloques), mínimo y máximo directamente, y los
+    cuantiles con un ``DigestCuantiles``. En modo exacto se guarda en su lugar
+    un ``Counter`` de los valores: cuantiles y moda son exactos y la memoria
+    crece con la cantidad de valores distintos.
+    
+    Los acumuladores se pueden fusionar, así que cada bloque o proceso puede
+    resumir su parte y combinarse al final.
+    """
+    
+    def __init__(self, exacto: bool = False, compresion: int = 100):
+        self.exacto = exacto
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo: Any = None
+        self.maximo: Any = None
+        self._frecuencias: Optional[Counter] = Counter() if exacto else None
+        self._digest: Optional[DigestCuantiles] = None if exacto else DigestCuantiles(compresion)
+    
+    def actualizar(self, valor: Union[int, float]) -> None:
+        """
+        Incorpora un valor.
+        
+        Args:
+            valor: Número observado
+        """
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+        if self.exacto:
+            self._frecuencias[valor] += 1
+        else:
+            self._digest.agregar(valor)
+    
+    def actualizar_lote(self, datos: Iterable[Union[int, float]]) -> None:
+        """
+        Incorpora todos los valores de un iterable (o array de NumPy).
+        
+        El iterable se consume una sola vez, por bloques de tamaño fijo.
+        
+        Args:
+            datos: Números a incorporar
+        """
+        if np is not None and isinstance(datos, np.ndarray):
+            self._actualizar_array(datos)
+            return
+        iterador = iter(datos)
+        while True:
+            bloque = list(itertools.islice(iterador, _TAMANO_BLOQUE_ESTADISTICAS))
+            if not bloque:
+                break
+            n = len(bloque)
+            media = sum(bloque) / n
+            m2 = sum((x - media) ** 2 for x in bloque)
+            self._combinar_momentos(n, media, m2, min(bloque), max(bloque))
+            if self.exacto:
+                self._frecuencias.update(bloque)
+            else:
+                self._digest.agregar_lote(bloque)
+    
+    def _actualizar_array(self, datos) -> None:
+        """Camino rápido de NumPy: resume el array completo con operaciones vectorizadas."""
+        datos = np.ravel(datos)
+        if not datos.size:
+            return
+        media = float(datos.mean())
+        m2 = float(((datos - media) ** 2).sum())
+        self._combinar_momentos(datos.size, media, m2, datos.min().item(), datos.max().item())
+        if self.exacto:
+            valores, cuentas = np.unique(datos, return_counts=True)
+            self._frecuencias.update(dict(zip(valores.tolist(), cuentas.tolist())))
+        else:
+            self._digest.agregar_lote(datos)
+    
+    def _combinar_momentos(self, n: int, media: float, m2: float, minimo, maximo) -> None:
+        """Combina media, M2 y extremos de un bloque con los acumulados (fórmula de Chan)."""
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self._m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        if self.minimo is None or minimo < self.minimo:
+            self.minimo = minimo
+        if self.maximo is None or maximo > self.maximo:
+            self.maximo = maximo
+    
+    def fusionar(self, otro: 'AcumuladorEstadisticas') -> 'AcumuladorEstadisticas':
+        """
+        Incorpora lo acumulado por otro acumulador (p. ej. de otro proceso).
+        
+        Args:
+            otro: Acumulador del mismo modo (exacto o aproximado)
+            
+        Returns:
+            Este mismo acumulador, para encadenar llamadas
+            
+        Raises:
+            ValueError: Si los modos no coinciden
+        """
+        if otro.exacto != self.exacto:
+            raise ValueError("Solo se pueden fusionar acumuladores del mismo modo")
+        if not otro.n:
+            return self
+        self._combinar_momentos(otro.n, otro.media, otro._m2, otro.minimo, otro.maximo)
+        if self.exacto:
+            self._frecuencias.update(otro._frecuencias)
+        else:
+            self._digest.fusionar(otro._digest)
+        return self
+    
+    @property
+    def varianza(self) -> float:
+        """Varianza poblacional."""
+        return self._m2 / self.n if self.n else 0.0
+    
+    @property
+    def desviacion_estandar(self) -> float:
+        """Desviación estándar poblacional."""
+        return math.sqrt(self.varianza)
+    
+    def cuantil(self, q: float) -> Union[int, float]:
+        """
+        Calcula el cuantil q (exacto o aproximado según el modo).
+        
+        En modo exacto interpola linealmente entre los dos valores vecinos,
+        como la mediana clásica con una cantidad par de datos.
+        
+        Args:
+            q: Probabilidad entre 0 y 1
+            
+        Returns:
+            Valor del cuantil
+        """
+        if not self.n:
+            raise ValueError("No hay datos")
+        if not self.exacto:
+            return self._digest.cuantil(q)
+        if not 0 <= q <= 1:
+            raise ValueError("q debe estar entre 0 y 1")
+        posicion = q * (self.n - 1)
+        inferior = int(posicion)
+        fraccion = posicion - inferior
+        acumulado = 0
+        valor_inferior = None
+        for valor in sorted(self._frecuencias):
+            acumulado += self._frecuencias[valor]
+            if valor_inferior is None and acumulado > inferior:
+                valor_inferior = valor
+                if not fraccion:
+                    return valor
+            if valor_inferior is not None and acumulado > inferior + 1:
+                return valor_inferior + (valor - valor_inferior) * fraccion
+        return valor_inferior
+    
+    def mediana(self) -> Union[int, float]:
+        """Mediana (exacta o aproximada según el modo)."""
+        return self.cuantil(0.5)
+    
+    def moda(self) -> Optional[Union[int, float]]:
+        """Valor más frecuente; solo disponible en modo exacto (si no, None)."""
+        if not self.exacto or not self.n:
+            return None
+        return self._frecuencias.most_common(1)[0][0]
+    
+    def resultado(self) -> Dict[str, Any]:
+        """
+        Resume lo acumulado con las mismas claves que ``calcular_estadisticas``.
+        
+        Returns:
+            Diccionario con media, mediana, moda, desviación estándar, varianza,
+            mínimo, máximo, rango y cantidad de datos
+        """
+        if not self.n:
+            raise ValueError("No hay datos")
+        return {
+            'media': round(self.media, 4),
+            'mediana': self.mediana(),
+            'moda': self.moda(),
+            'desviacion_estandar': round(self.desviacion_estandar, 4),
+            'varianza': round(self.varianza, 4),
+            'minimo': self.minimo,
+            'maximo': self.maximo,
+            'rango': self.maximo - self.minimo,
+            'n': self.n
+        }
 
-def calcular_estadisticas(datos: List[Union[int, float]]) -> Dict[str, float]:
+def calcular_estadisticas(datos: Iterable[Union[int, float]],
+                          exacto: bool = True) -> Dict[str, float]:
     """
-    Calcula estadísticas descriptivas de una lista de números.
+    Calcula estadísticas descriptivas de una colección de números.
+    
+    Recorre los datos una sola vez con un ``AcumuladorEstadisticas``, así que
+    acepta listas, generadores o arrays de NumPy.
     
     Args:
-        datos: Lista de números
+        datos: Números a resumir
+        exacto: Si False, mediana aproximada con memoria acotada y sin moda
         
     Returns:
         Diccionario con estadísticas (media, mediana, moda, desviación estándar)
     """
-    if not datos:
+    acumulador = AcumuladorEstadisticas(exacto=exacto)
+    acumulador.actualizar_lote(datos)
+    if not acumulador.n:
         raise ValueError("La lista no puede estar vacía")
+    return acumulador.resultado()
+
+def _primos_hasta(limite: int) -> List[int]:
+    """Criba simple (solo impares) para obtener los primos base hasta ``limite``."""
+    if limite < 2:
+        return []
+    # criba[i] representa al impar 2*i + 1
+    criba = bytearray([1]) * (limite // 2 + 1)
+    criba[0] = 0
+    for i in range(1, (math.isqrt(limite) - 1) // 2 + 1):
+        if criba[i]:
+            p = 2 * i + 1
+            inicio = p * p // 2
+            criba[inicio::p] = bytes(len(range(inicio, len(criba), p)))
+    primos = [2]
+    primos.extend(itertools.compress(range(1, limite + 1, 2), criba))
+    return primos
+
+def _segmentos_impares(inicio: int, fin: Optional[int],
+                       tamano_segmento: int) -> Iterator[Tuple[int, bytearray]]:
+    """
+    Criba segmentada sobre los impares de [inicio, fin).
+    
+    Genera tuplas ``(base, segmento)`` donde ``segmento[j]`` vale 1 si
+    ``base + 2*j`` es primo. Solo se guarda en memoria un segmento y los
+    primos base hasta la raíz del final del segmento; con ``fin=None`` la
+    criba continúa indefinidamente.
+    """
+    base = max(3, inicio) | 1
+    base_primos: List[int] = []
+    limite_base = 0
+    while fin is None or base < fin:
+        tope = base + 2 * tamano_segmento
+        if fin is not None:
+            tope = min(tope, fin)
+        raiz = math.isqrt(tope - 1)
+        if raiz > limite_base:
+            # Ampliar los primos base (con holgura para no recalcular a menudo)
+            limite_base = max(raiz, 2 * limite_base)
+            base_primos = _primos_hasta(limite_base)[1:]
+        
+        n = (tope - base + 1) // 2
+        segmento = bytearray([1]) * n
+        for p in base_primos:
+            if p > raiz:
+                break
+            # Primer múltiplo impar de p dentro del segmento, no menor que p*p
+            m = max(p * p, -(-base // p) * p)
+            if m % 2 == 0:
+                m += p
+            j = (m - base) // 2
+            if j < n:
+                segmento[j::p] = bytes((n - 1 - j) // p + 1)
+        yield base, segmento
+        base += 2 * n
+
+def iter_primos(inicio: int = 2, fin: Optional[int] = None,
+                tamano_segmento: int = 1 << 18) -> Iterator[int]:
+    """
+    Genera de forma perezosa los números primos en el rango [inicio, fin).
+    
+    Usa una criba de Eratóstenes segmentada que solo considera impares y
+    marca los múltiplos con asignación por slices de ``bytearray``, así que
+    la memoria usada está acotada por ``tamano_segmento`` sin importar el rango.
+    
+    Args:
+        inicio: Inicio del rango (inclusive)
+        fin: Fin del rango (exclusive); None para no detenerse
+        tamano_segmento: Cantidad de impares cribados por segmento
+        
+    Returns:
+        Iterador de números primos en orden creciente
+    """
+    if inicio <= 2 and (fin is None or fin > 2):
+        yield 2
+    for base, segmento in _segmentos_impares(inicio, fin, tamano_segmento):
+        yield from itertools.compress(range(base, base + 2 * len(segmento), 2), segmento)
+
+def contar_primos(limite: int, tamano_segmento: int = 1 << 18) -> int:
+    """
+    Cuenta los números primos menores o iguales a un límite sin generarlos.
     
-    datos_ordenados = sorted(datos)
-    n = len(datos)
-    
-    # Media
-    media = sum(datos) / n
-    
-    # Mediana
-    if n % 2 == 0:
-        mediana = (datos_ordenados[n//2 - 1] + datos_ordenados[n//2]) / 2
-    else:
-        mediana = datos_ordenados[n//2]
-    
-    # Moda (valor más frecuente)
-    from collections import Counter
-    contador = Counter(datos)
-    moda = contador.most_common(1)[0][0]
-    
-    # Desviación estándar
-    varianza = sum((x - media) ** 2 for x in datos) / n
-    desviacion_estandar = math.sqrt(varianza)
-    
-    return {
-        'media': round(media, 4),
-        'mediana': mediana,
-        'moda': moda,
-        'desviacion_estandar': round(desviacion_estandar, 4),
-        'varianza': round(varianza, 4),
-        'minimo': min(datos),
-        'maximo': max(datos),
-        'rango': max(datos) - min(datos)
-    }
+    Args:
+        limite: Número límite (inclusive)
+        tamano_segmento: Cantidad de impares cribados por segmento
+        
+    Returns:
+        Cantidad de primos hasta ``limite``
+    """
+    if limite < 2:
+        return 0
+    return 1 + sum(segmento.count(1)
+                   for _, segmento in _segmentos_impares(3, limite + 1, tamano_segmento))
 
 def generar_primos(limite: int) -> List[int]:
     """
     Genera todos los números primos hasta un límite usando la Criba de Eratóstenes.
     
+    La criba es segmentada y solo de impares (ver ``iter_primos``), por lo
+    que la memoria auxiliar no crece con ``limite``; solo la lista resultante.
+    
     Args:
         limite: Número límite (inclusive)
         
@@ -121,14 +746,4 @@ def generar_primos(limite: int) -> List[int]:
     """
     if limite < 2:
         return []
-    
-    # Criba de Eratóstenes
-    es_primo_array = [True] * (limite + 1)
-    es_primo_array[0] = es_primo_array[1] = False
-    
-    for i in range(2, int(math.sqrt(limite)) + 1):
-        if es_primo_array[i]:
-            for j in range(i*i, limite + 1, i):
-                es_primo_array[j] = False
-    
-    return [i for i in range(2, limite + 1) if es_primo_array[i]]
\ No newline at end of file
+    return list(iter_primos(2, limite + 1))
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Pruebas de la primalidad en lote de matematicas.
+
+Uso (desde este directorio; el __init__ del paquete superior importa
+módulos que no están en el repositorio):
+    python -m pytest --rootdir=. test_matematicas.py
+"""
+
+import random
+
+import pytest
+
+import matematicas
+from matematicas import es_primo, es_primo_lote, generar_primos
+
+
+def _es_primo_por_division(n: int) -> bool:
+    if n < 2:
+        return False
+    i = 2
+    while i * i <= n:
+        if n % i == 0:
+            return False
+        i += 1
+    return True
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def sin_numpy(request, monkeypatch):
+    """Ejecuta la prueba con numpy (si está instalado) y con la alternativa en Python puro."""
+    if request.param == 'python':
+        monkeypatch.setattr(matematicas, 'np', None)
+    elif matematicas.np is None:
+        pytest.skip("numpy no está instalado")
+
+
+def test_es_primo_lote_rango_denso_coincide_con_la_criba():
+    numeros = list(range(-5, 20_000))
+    primos = set(generar_primos(20_000))
+    assert es_primo_lote(numeros) == [n in primos for n in numeros]
+
+
+def test_es_primo_lote_rangos_desplazados():
+    rng = random.Random(0)
+    for _ in range(200):
+        inicio = rng.choice([0, 3, 1_000, 10**7 - 500, 10**9])
+        numeros = [rng.randint(inicio, inicio + rng.choice([10, 1_000, 10**5]))
+                   for _ in range(rng.randint(1, 60))]
+        assert es_primo_lote(numeros) == [_es_primo_por_division(n) for n in numeros]
+
+
+def test_un_numero_grande_no_criba_hasta_el(monkeypatch):
+    def criba(*args):
+        raise AssertionError("no debería cribar un lote disperso")
+
+    monkeypatch.setattr(matematicas, '_es_primo_lote_criba', criba)
+    assert es_primo_lote([9_999_991]) == [True]
+    assert es_primo_lote([2, 9_999_991, 10**12 + 39]) == [True, True, True]
+
+
+def test_es_primo_lote_numeros_grandes(sin_numpy):
+    rng = random.Random(1)
+    numeros = [rng.randrange(10**7, 10**18) for _ in range(2_000)]
+    numeros += [0, 1, 2, 199, 211, 199 * 199, 2**61 - 1, 2**89 - 1, 10**30 + 57, -7]
+    assert es_primo_lote(numeros) == [es_primo(n) for n in numeros]
+
+
+def test_es_primo_lote_vacio_y_pequenos():
+    assert es_primo_lote([]) == []
+    assert es_primo_lote([0, 1, -3]) == [False, False, False]
+    assert es_primo_lote(iter([2, 3, 4])) == [True, True, False]
@@ -0,0 +1,99 @@
+"""
+Pruebas de la extracción de números por ventanas y de los resúmenes de texto.
+
+Uso (desde este directorio; el __init__ del paquete superior importa
+módulos que no están en el repositorio):
+    python -m pytest --rootdir=. test_texto.py
+"""
+
+import gc
+import random
+import tracemalloc
+
+import pytest
+
+from texto import (IndiceResumen, _patron_numeros, generar_resumen, iter_numeros,
+                   iter_numeros_archivo)
+
+FORMATOS = [('.', None, True), (',', '.', True), ('.', ',', False), ('.', ' ', True), (',', ' ', False)]
+
+
+def _sin_ventanas(texto: str, decimal: str, miles, cientifica: bool):
+    """Referencia: todos los números del texto con un solo findall."""
+    numeros = _patron_numeros(decimal, miles, cientifica, False).findall(texto)
+    return [float(n.replace(miles or '', '').replace(decimal, '.')) for n in numeros]
+
+
+@pytest.mark.parametrize('decimal, miles, cientifica', FORMATOS)
+def test_ventanas_pequenas_no_parten_numeros(decimal, miles, cientifica):
+    rng = random.Random(0)
+    alfabeto = '0123456789 .,-+eE\nab;_'
+    for _ in range(500):
+        texto = ''.join(rng.choice(alfabeto) for _ in range(rng.randint(0, 200)))
+        esperado = _sin_ventanas(texto, decimal, miles, cientifica)
+        for ventana in (1, 3, 16):
+            assert list(iter_numeros(texto, decimal, miles, cientifica, ventana)) == esperado
+            assert list(iter_numeros(texto.encode(), decimal, miles, cientifica, ventana)) == esperado
+
+
+def test_miles_con_espacio():
+    texto = 'total 1 234 567,5 y 8 901 unidades'
+    assert list(iter_numeros(texto, decimal=',', miles=' ', tamano_ventana=4)) == [1234567.5, 8901.0]
+
+
+def test_entrada_sin_espacios_usa_memoria_acotada():
+    datos = ';'.join(str(i) for i in range(500_000)).encode()
+    tracemalloc.start()
+    try:
+        cantidad = sum(1 for _ in iter_numeros(datos, tamano_ventana=1 << 16))
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert cantidad == 500_000
+    # Una sola ventana con toda la entrada crearía medio millón de bytes a la vez
+    assert pico < len(datos) // 4
+
+
+def test_iter_numeros_archivo(tmp_path):
+    ruta = tmp_path / 'log.txt'
+    ruta.write_text('t=1 latencia=2.5ms\nerror=-1.5e-3;carga=+4\n', encoding='utf-8')
+    assert list(iter_numeros_archivo(str(ruta))) == [1.0, 2.5, -1.5e-3, 4.0]
+    vacio = tmp_path / 'vacio.txt'
+    vacio.write_bytes(b'')
+    assert list(iter_numeros_archivo(str(vacio))) == []
+
+
+@pytest.mark.parametrize('decimal, miles', [('..', None), ('.', '.'), ('á', None)])
+def test_separadores_invalidos(decimal, miles):
+    with pytest.raises(ValueError):
+        iter_numeros('1', decimal, miles)
+
+
+# --- Resúmenes ---
+
+TEXTO_RESUMEN = ("Python permite escribir programas claros. Los gatos duermen mucho. "
+                 "Python tiene muchas bibliotecas para programas científicos. "
+                 "Hoy llueve. Los programas en Python son fáciles de leer!")
+
+
+def test_resumen_conserva_el_orden_del_texto():
+    # Las dos oraciones mejor puntuadas, en el orden en que aparecen
+    resumen = generar_resumen(TEXTO_RESUMEN, 2)
+    assert resumen == ("Python permite escribir programas claros. "
+                       "Python tiene muchas bibliotecas para programas científicos.")
+    assert generar_resumen(TEXTO_RESUMEN, 10) == TEXTO_RESUMEN
+    assert generar_resumen('', 3) == ''
+
+
+def test_resumen_reutiliza_un_indice():
+    indice = IndiceResumen(TEXTO_RESUMEN)
+    for n in (1, 2, 3):
+        assert generar_resumen(TEXTO_RESUMEN, n, indice) == generar_resumen(TEXTO_RESUMEN, n)
+        assert indice.resumir(n) == generar_resumen(TEXTO_RESUMEN, n)
+
+
+def test_resumen_no_retiene_textos_entre_llamadas():
+    texto = TEXTO_RESUMEN * 50
+    generar_resumen(texto, 2)
+    assert not any(isinstance(objeto, IndiceResumen) and objeto.texto is texto
+                   for objeto in gc.get_objects())
@@ -1,10 +1,36 @@
 """Módulo de utilidades para procesamiento de texto."""
 
+import heapq
+import itertools
+import mmap
+import os
 import re
 import string
-from typing import List, Dict
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from collections import Counter
 
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: solo se usa en extraer_numeros_array
+    np = None
+
+# Bytes ASCII que limpiar_texto descarta, según se conserven números y espacios.
+# Tras lower() todo carácter no ASCII se descarta, así que basta codificar a
+# ASCII ignorando el resto y borrar con bytes.translate (en C, sin bucles en Python)
+_BORRAR_POR_OPCIONES = {
+    (numeros, espacios): bytes(
+        c for c in range(128)
+        if chr(c) not in string.ascii_lowercase
+        + (string.digits if numeros else '') + (' ' if espacios else '')
+    )
+    for numeros in (True, False)
+    for espacios in (True, False)
+}
+
 def limpiar_texto(texto: str, mantener_numeros: bool = True, 
                  mantener_espacios: bool = True) -> str:
     """
@@ -21,24 +47,42 @@ def limpiar_texto(texto: str, mantener_numeros: bool = True,
     if not texto:
         return ""
     
-    # Convertir a minúsculas
-    texto = texto.lower()
+    borrar = _BORRAR_POR_OPCIONES[bool(mantener_numeros), bool(mantener_espacios)]
+    texto_limpio = texto.lower().encode('ascii', 'ignore').translate(None, borrar)
     
-    # Definir caracteres permitidos
-    caracteres_permitidos = string.ascii_lowercase
-    if mantener_numeros:
-        caracteres_permitidos += string.digits
+    # Limpiar espacios múltiples (el único espacio que queda es ' ')
     if mantener_espacios:
-        caracteres_permitidos += ' '
+        texto_limpio = b' '.join(texto_limpio.split())
     
-    # Filtrar caracteres
-    texto_limpio = ''.join(c for c in texto if c in caracteres_permitidos)
+    return texto_limpio.decode('ascii')
+
+def limpiar_lote(textos: Iterable[str], mantener_numeros: bool = True,
+                 mantener_espacios: bool = True) -> Iterator[str]:
+    """
+    Limpia perezosamente una secuencia de textos (líneas, documentos...).
     
-    # Limpiar espacios múltiples
-    if mantener_espacios:
-        texto_limpio = re.sub(r'\s+', ' ', texto_limpio).strip()
+    Equivale a aplicar ``limpiar_texto`` a cada elemento, pero resuelve la
+    tabla de borrado una sola vez y no materializa el lote completo.
     
-    return texto_limpio
+    Args:
+        textos: Textos a limpiar
+        mantener_numeros: Si mantener números
+        mantener_espacios: Si mantener espacios
+        
+    Returns:
+        Iterador con los textos limpios, en el mismo orden
+    """
+    borrar = _BORRAR_POR_OPCIONES[bool(mantener_numeros), bool(mantener_espacios)]
+    for texto in textos:
+        if not texto:
+            yield ""
+            continue
+        texto_limpio = texto.lower().encode('ascii', 'ignore').translate(None, borrar)
+        if mantener_espacios:
+            texto_limpio = b' '.join(texto_limpio.split())
+        yield texto_limpio.decode('ascii')
+
+_PATRON_NUMEROS = re.compile(r'-?\d+\.?\d*')
 
 def extraer_numeros(texto: str) -> List[float]:
     """
@@ -50,9 +94,145 @@ def extraer_numeros(texto: str) -> List[float]:
     Returns:
         Lista de números encontrados
     """
-    patron = r'-?\d+\.?\d*'
-    numeros_str = re.findall(patron, texto)
-    return [float(num) for num in numeros_str if num]
+    return [float(num) for num in _PATRON_NUMEROS.findall(texto)]
+
+@lru_cache(maxsize=None)
+def _patron_numeros(decimal: str, miles: Optional[str], cientifica: bool,
+                    binario: bool) -> 're.Pattern':
+    """Compila (una vez por combinación) el patrón de números de ``iter_numeros``."""
+    entero = r'\d+'
+    if miles:
+        # Grupos de tres cifras completos o, si no, cifras seguidas
+        entero = rf'(?:\d{{1,3}}(?:{re.escape(miles)}\d{{3}})+(?!\d)|\d+)'
+    fuente = rf'[-+]?{entero}(?:{re.escape(decimal)}\d*)?'
+    if cientifica:
+        fuente += r'(?:[eE][-+]?\d+)?'
+    return re.compile(fuente.encode('ascii') if binario else fuente)
+
+@lru_cache(maxsize=None)
+def _patron_corte(decimal: str, miles: Optional[str], cientifica: bool,
+                  binario: bool) -> 're.Pattern':
+    """Compila el patrón de un carácter que no puede formar parte de un número."""
+    simbolos = r'0-9+\-' + re.escape(decimal) + (re.escape(miles) if miles else '')
+    if cientifica:
+        simbolos += 'eE'
+    fuente = f'[^{simbolos}]'
+    return re.compile(fuente.encode('ascii') if binario else fuente)
+
+def _ventanas(fuente, tamano: int, corte: 're.Pattern') -> Iterator[Any]:
+    """
+    Divide un texto o buffer en ventanas que terminan en un carácter de ``corte``.
+    
+    ``corte`` reconoce los caracteres que no pueden formar parte de un número,
+    así que ningún número queda partido entre dos ventanas. Una ventana solo
+    supera ``tamano`` por la secuencia de dígitos y separadores en que cae el
+    corte. Los buffers se recorren con ``memoryview``, sin copiarlos.
+    """
+    vista = fuente if isinstance(fuente, str) else memoryview(fuente)
+    total = len(fuente)
+    inicio = 0
+    while inicio < total:
+        fin = inicio + tamano
+        if fin < total:
+            separador = corte.search(fuente, fin)
+            fin = separador.end() if separador is not None else total
+        yield vista[inicio:fin]
+        inicio = fin
+
+def iter_numeros(fuente: Union[str, bytes, bytearray, memoryview, mmap.mmap],
+                 decimal: str = '.', miles: Optional[str] = None,
+                 cientifica: bool = True, tamano_ventana: int = 1 << 20) -> Iterator[float]:
+    """
+    Recorre perezosamente los números de un texto o de un buffer de bytes.
+    
+    Acepta ``bytes``, ``bytearray`` o ``mmap`` y los recorre con un patrón de
+    bytes precompilado sin copiarlos ni decodificarlos, por ventanas de unos
+    ``tamano_ventana`` bytes que se cortan en caracteres ajenos a los números:
+    la memoria usada no depende del tamaño de la fuente, sino de la ventana
+    (o del número más largo). Admite notación científica (``1.5e-3``) y formatos locales,
+    p. ej. ``decimal=',', miles='.'`` para ``-1.234,5``.
+    
+    Args:
+        fuente: Texto o buffer a recorrer (un ``memoryview``, número a número)
+        decimal: Separador decimal (un carácter ASCII)
+        miles: Separador de miles (un carácter ASCII) o None si no se usa
+        cientifica: Si reconocer exponentes
+        tamano_ventana: Tamaño aproximado de cada ventana
+        
+    Returns:
+        Iterador de floats en el orden en que aparecen
+        
+    Raises:
+        ValueError: Si los separadores no son válidos
+    """
+    if len(decimal) != 1 or not decimal.isascii() or (
+            miles is not None and (len(miles) != 1 or not miles.isascii() or miles == decimal)):
+        raise ValueError("Los separadores deben ser caracteres ASCII distintos")
+    binario = not isinstance(fuente, str)
+    patron = _patron_numeros(decimal, miles, cientifica, binario)
+    # findall por ventana evita crear un objeto Match por número
+    if isinstance(fuente, memoryview):
+        numeros = map(itemgetter(0), patron.finditer(fuente))
+    else:
+        corte = _patron_corte(decimal, miles, cientifica, binario)
+        numeros = itertools.chain.from_iterable(
+            map(patron.findall, _ventanas(fuente, tamano_ventana, corte)))
+    if decimal == '.' and miles is None:
+        # float() acepta bytes directamente
+        return map(float, numeros)
+    
+    if binario:
+        tabla = bytes.maketrans(decimal.encode('ascii'), b'.')
+        borrar = miles.encode('ascii') if miles else b''
+        return (float(numero.translate(tabla, borrar)) for numero in numeros)
+    tabla = str.maketrans(decimal, '.', miles or '')
+    return (float(numero.translate(tabla)) for numero in numeros)
+
+def iter_numeros_archivo(ruta: str, decimal: str = '.', miles: Optional[str] = None,
+                         cientifica: bool = True) -> Iterator[float]:
+    """
+    Recorre perezosamente los números de un archivo mapeándolo en memoria.
+    
+    El archivo no se lee completo: el sistema operativo carga las páginas
+    a medida que el patrón avanza. Se asume una codificación compatible con
+    ASCII (UTF-8, Latin-1...).
+    
+    Args:
+        ruta: Ruta del archivo
+        decimal: Separador decimal
+        miles: Separador de miles o None
+        cientifica: Si reconocer exponentes
+        
+    Returns:
+        Iterador de floats en el orden en que aparecen
+    """
+    with open(ruta, 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            return
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            yield from iter_numeros(mapa, decimal, miles, cientifica)
+
+def extraer_numeros_array(fuente: Union[str, bytes, bytearray, memoryview, mmap.mmap],
+                          decimal: str = '.', miles: Optional[str] = None,
+                          cientifica: bool = True) -> 'np.ndarray':
+    """
+    Extrae los números de un texto o buffer directamente a un array de NumPy.
+    
+    Args:
+        fuente: Texto o buffer a recorrer
+        decimal: Separador decimal
+        miles: Separador de miles o None
+        cientifica: Si reconocer exponentes
+        
+    Returns:
+        Array float64 con los números encontrados
+        
+    Raises:
+        ImportError: Si numpy no está instalado
+    """
+    if np is None:
+        raise ImportError("extraer_numeros_array requiere el paquete 'numpy' (pip install numpy)")
+    return np.fromiter(iter_numeros(fuente, decimal, miles, cientifica), dtype=np.float64)
 
 def capitalizar_palabras(texto: str, excepciones: List[str] = None) -> str:
     """
@@ -83,6 +263,11 @@ def capitalizar_palabras(texto: str, excepciones: List[str] = None) -> str:
     
     return ' '.join(palabras_capitalizadas)
 
+def _palabras_ascii(texto: str) -> List[bytes]:
+    """Palabras de ``contar_palabras`` como bytes, sin reconstruir el texto limpio."""
+    borrar = _BORRAR_POR_OPCIONES[False, True]
+    return texto.lower().encode('ascii', 'ignore').translate(None, borrar).split()
+
 def contar_palabras(texto: str) -> Dict[str, int]:
     """
     Cuenta la frecuencia de palabras en un texto.
@@ -93,48 +278,312 @@ def contar_palabras(texto: str) -> Dict[str, int]:
     Returns:
         Diccionario con el conteo de palabras
     """
-    texto_limpio = limpiar_texto(texto, mantener_numeros=False)
-    palabras = texto_limpio.split()
-    return dict(Counter(palabras))
+    conteos = Counter(_palabras_ascii(texto))
+    return {palabra.decode('ascii'): conteo for palabra, conteo in conteos.items()}
+
+class ContadorPalabras:
+    """
+    Contador incremental de frecuencias de palabras.
+    
+    Cuenta las mismas palabras que ``contar_palabras`` pero sin necesitar el
+    texto completo en memoria: acepta textos sueltos, fragmentos consecutivos
+    de un flujo o archivos leídos por bloques.
+    
+    Sin ``capacidad`` los conteos son exactos. Con ``capacidad`` se usa un
+    resumen Space-Saving que guarda como mucho ese número de palabras: las
+    frecuentes se conservan con conteos que pueden sobrestimar en, a lo sumo,
+    ``error(palabra)``, y la memoria queda acotada aunque el vocabulario no lo
+    esté. Los contadores se pueden fusionar (p. ej. los de varios procesos).
+    """
+    
+    def __init__(self, capacidad: Optional[int] = None):
+        if capacidad is not None and capacidad <= 0:
+            raise ValueError("La capacidad debe ser positiva")
+        self.capacidad = capacidad
+        self.total = 0
+        self._conteos: Counter = Counter()
+        self._errores: Dict[bytes, int] = {}
+    
+    def actualizar(self, texto: str) -> None:
+        """
+        Cuenta las palabras de un texto completo.
+        
+        Args:
+            texto: Texto a analizar
+        """
+        self._contar(texto)
+    
+    def actualizar_flujo(self, fragmentos: Iterable[str]) -> None:
+        """
+        Cuenta las palabras de un texto que llega en fragmentos consecutivos.
+        
+        Una palabra partida entre dos fragmentos se cuenta una sola vez: lo
+        que sigue al último espacio de cada fragmento se guarda y se antepone
+        al siguiente.
+        
+        Args:
+            fragmentos: Fragmentos del texto, en orden
+        """
+        pendiente = ''
+        for fragmento in fragmentos:
+            corte = fragmento.rfind(' ')
+            if corte == -1:
+                pendiente += fragmento
+                continue
+            self._contar(pendiente + fragmento[:corte])
+            pendiente = fragmento[corte + 1:]
+        if pendiente:
+            self._contar(pendiente)
+    
+    def actualizar_archivo(self, ruta: str, tamano_bloque: int = 1 << 20,
+                           encoding: str = 'utf-8') -> None:
+        """
+        Cuenta las palabras de un archivo leyéndolo por bloques.
+        
+        Args:
+            ruta: Ruta del archivo de texto
+            tamano_bloque: Caracteres leídos por bloque
+            encoding: Codificación del archivo
+        """
+        with open(ruta, 'r', encoding=encoding, errors='replace') as archivo:
+            self.actualizar_flujo(iter(lambda: archivo.read(tamano_bloque), ''))
+    
+    def _contar(self, texto: str) -> None:
+        palabras = _palabras_ascii(texto)
+        self.total += len(palabras)
+        self._incorporar(Counter(palabras))
+    
+    def _incorporar(self, conteos: Counter, errores: Optional[Dict[bytes, int]] = None,
+                    minimo_otro: int = 0) -> None:
+        """
+        Suma unos conteos y, si hay capacidad, recorta a las palabras más frecuentes.
+        
+        Sigue la fusión de resúmenes Space-Saving: a una palabra que falta en
+        un resumen lleno se le suma el mínimo de ese resumen como cota de lo
+        que pudo no registrarse, y se conservan las ``capacidad`` mayores.
+        """
+        if self.capacidad is None:
+            self._conteos.update(conteos)
+            return
+        
+        minimo_propio = self._minimo()
+        propios = self._conteos
+        errores = errores or {}
+        for palabra in (propios.keys() - conteos.keys() if minimo_otro else ()):
+            propios[palabra] += minimo_otro
+            self._errores[palabra] = self._errores.get(palabra, 0) + minimo_otro
+        for palabra, conteo in conteos.items():
+            if palabra in propios:
+                propios[palabra] += conteo
+                self._errores[palabra] = self._errores.get(palabra, 0) + errores.get(palabra, 0)
+            else:
+                propios[palabra] = conteo + minimo_propio
+                self._errores[palabra] = errores.get(palabra, 0) + minimo_propio
+        
+        if len(propios) > self.capacidad:
+            conservadas = heapq.nlargest(self.capacidad, propios.items(), key=itemgetter(1))
+            self._conteos = Counter(dict(conservadas))
+            self._errores = {palabra: self._errores[palabra] for palabra, _ in conservadas}
+    
+    def _minimo(self) -> int:
+        """Conteo mínimo del resumen si está lleno (cota de lo no registrado), o 0."""
+        if self.capacidad is None or len(self._conteos) < self.capacidad:
+            return 0
+        return min(self._conteos.values())
+    
+    def fusionar(self, otro: 'ContadorPalabras') -> 'ContadorPalabras':
+        """
+        Incorpora los conteos de otro contador (p. ej. de otro proceso).
+        
+        Args:
+            otro: Contador a fusionar (no se modifica)
+            
+        Returns:
+            Este mismo contador, para encadenar llamadas
+        """
+        self._incorporar(otro._conteos, otro._errores, otro._minimo())
+        self.total += otro.total
+        return self
+    
+    def mas_comunes(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Devuelve las n palabras más frecuentes (todas si n es None).
+        
+        Args:
+            n: Cantidad de palabras
+            
+        Returns:
+            Lista de tuplas (palabra, conteo) de mayor a menor conteo
+        """
+        if n is None:
+            pares = sorted(self._conteos.items(), key=itemgetter(1), reverse=True)
+        else:
+            pares = heapq.nlargest(n, self._conteos.items(), key=itemgetter(1))
+        return [(palabra.decode('ascii'), conteo) for palabra, conteo in pares]
+    
+    def error(self, palabra: str) -> int:
+        """Cuánto puede sobrestimar el conteo de una palabra (0 en modo exacto)."""
+        return self._errores.get(palabra.encode('ascii', 'ignore'), 0)
+    
+    def a_diccionario(self) -> Dict[str, int]:
+        """Conteos como diccionario, en el mismo formato que ``contar_palabras``."""
+        return {palabra.decode('ascii'): conteo for palabra, conteo in self._conteos.items()}
 
-def generar_resumen(texto: str, num_oraciones: int = 3) -> str:
+_SEPARADOR_ORACIONES = re.compile(r'[.!?]+')
+
+class IndiceResumen:
+    """
+    Índice de oraciones de un texto para generar resúmenes extractivos.
+    
+    El texto se divide y se tokeniza una sola vez: cada oración queda con su
+    puntuación (la suma de las frecuencias en todo el texto de sus palabras
+    de más de 3 letras). Así se pueden pedir resúmenes de distinta longitud
+    sin volver a procesar el texto.
+    """
+    
+    def __init__(self, texto: str):
+        self.texto = texto
+        self.oraciones = [o.strip() for o in _SEPARADOR_ORACIONES.split(texto) if o.strip()]
+        palabras_por_oracion = [[p for p in _palabras_ascii(oracion) if len(p) > 3]
+                                for oracion in self.oraciones]
+        frecuencias = Counter(p for palabras in palabras_por_oracion for p in palabras)
+        self.puntuaciones = [sum(frecuencias[p] for p in palabras)
+                             for palabras in palabras_por_oracion]
+    
+    def resumir(self, num_oraciones: int = 3) -> str:
+        """
+        Devuelve las oraciones mejor puntuadas en el orden en que aparecen.
+        
+        Args:
+            num_oraciones: Número de oraciones en el resumen
+            
+        Returns:
+            Resumen del texto (el texto completo si tiene pocas oraciones)
+        """
+        if not self.texto:
+            return ""
+        if len(self.oraciones) <= num_oraciones:
+            return self.texto
+        # Entre oraciones empatadas gana la que aparece antes
+        mejores = heapq.nlargest(num_oraciones, range(len(self.oraciones)),
+                                 key=self.puntuaciones.__getitem__)
+        return '. '.join(self.oraciones[i] for i in sorted(mejores)) + '.'
+
+def generar_resumen(texto: str, num_oraciones: int = 3,
+                    indice: Optional[IndiceResumen] = None) -> str:
     """
     Genera un resumen simple del texto basado en frecuencia de palabras.
     
+    Las oraciones elegidas se devuelven en el orden del texto. Para resumir
+    el mismo texto con varias longitudes, construya un ``IndiceResumen`` y
+    páselo en ``indice`` (o llame a su método ``resumir``).
+    
     Args:
         texto: Texto a resumir
         num_oraciones: Número de oraciones en el resumen
+        indice: Índice ya construido de ``texto`` o None para indexarlo
         
     Returns:
         Resumen del texto
     """
     if not texto:
         return ""
+    if indice is None:
+        indice = IndiceResumen(texto)
+    return indice.resumir(num_oraciones)
+
+# Operaciones que acepta procesar_corpus
+OPERACIONES_CORPUS = ('limpiar_texto', 'contar_palabras', 'extraer_numeros')
+
+def _procesar_lote_corpus(rutas: Sequence[str], operaciones: Sequence[str],
+                          encoding: str) -> Dict[str, Any]:
+    """Aplica las operaciones a un lote de documentos (se ejecuta en cada proceso)."""
+    resultado: Dict[str, Any] = {'documentos': len(rutas), 'caracteres': 0}
+    contador = ContadorPalabras() if 'contar_palabras' in operaciones else None
+    limpios = {} if 'limpiar_texto' in operaciones else None
+    numeros = {} if 'extraer_numeros' in operaciones else None
+    for ruta in rutas:
+        with open(ruta, 'r', encoding=encoding, errors='replace') as archivo:
+            texto = archivo.read()
+        resultado['caracteres'] += len(texto)
+        if contador is not None:
+            contador.actualizar(texto)
+        if limpios is not None:
+            limpios[ruta] = limpiar_texto(texto)
+        if numeros is not None:
+            numeros[ruta] = extraer_numeros(texto)
+    resultado['contar_palabras'] = contador
+    resultado['limpiar_texto'] = limpios
+    resultado['extraer_numeros'] = numeros
+    return resultado
+
+def procesar_corpus(rutas: Iterable[str], operaciones: Iterable[str] = OPERACIONES_CORPUS,
+                    workers: Optional[int] = None, tamano_lote: Optional[int] = None,
+                    encoding: str = 'utf-8') -> Dict[str, Any]:
+    """
+    Procesa un corpus de archivos de texto en varios procesos.
     
-    # Dividir en oraciones
-    oraciones = re.split(r'[.!?]+', texto)
-    oraciones = [o.strip() for o in oraciones if o.strip()]
-    
-    if len(oraciones) <= num_oraciones:
-        return texto
-    
-    # Contar palabras importantes (más de 3 caracteres)
-    todas_palabras = []
-    for oracion in oraciones:
-        palabras = limpiar_texto(oracion, mantener_numeros=False).split()
-        todas_palabras.extend([p for p in palabras if len(p) > 3])
-    
-    frecuencias = Counter(todas_palabras)
-    
-    # Puntuar oraciones basado en palabras importantes
-    puntuaciones = []
-    for oracion in oraciones:
-        palabras = limpiar_texto(oracion, mantener_numeros=False).split()
-        puntuacion = sum(frecuencias.get(p, 0) for p in palabras if len(p) > 3)
-        puntuaciones.append((puntuacion, oracion))
+    Los documentos se reparten en lotes entre un ``ProcessPoolExecutor``;
+    cada proceso lee sus archivos, aplica las operaciones y devuelve un
+    resultado parcial que se combina al final (los conteos de palabras se
+    fusionan con ``ContadorPalabras``). Con ``workers=1`` todo se ejecuta en
+    el proceso actual.
     
-    # Seleccionar las mejores oraciones
-    puntuaciones.sort(reverse=True)
-    mejores_oraciones = [oracion for _, oracion in puntuaciones[:num_oraciones]]
+    Args:
+        rutas: Rutas de los documentos
+        operaciones: Nombres de ``OPERACIONES_CORPUS`` a aplicar
+        workers: Número de procesos (por defecto, los núcleos disponibles)
+        tamano_lote: Documentos por tarea (por defecto, unas 4 tareas por proceso)
+        encoding: Codificación de los archivos
+        
+    Returns:
+        Diccionario con 'documentos', 'caracteres', 'segundos' y, según las
+        operaciones, 'contar_palabras' (conteo total), 'limpiar_texto' y
+        'extraer_numeros' (por ruta)
+        
+    Raises:
+        ValueError: Si alguna operación no existe
+    """
+    rutas = list(rutas)
+    operaciones = tuple(operaciones)
+    desconocidas = set(operaciones) - set(OPERACIONES_CORPUS)
+    if desconocidas:
+        raise ValueError(f"Operaciones desconocidas: {', '.join(sorted(desconocidas))}")
+    workers = workers or os.cpu_count() or 1
+    if tamano_lote is None:
+        tamano_lote = max(1, len(rutas) // (workers * 4))
+    lotes = [rutas[i:i + tamano_lote] for i in range(0, len(rutas), tamano_lote)]
+    tarea = partial(_procesar_lote_corpus, operaciones=operaciones, encoding=encoding)
     
-    return '. '.join(mejores_oraciones) + '.'
\ No newline at end of file
+    inicio = time.perf_counter()
+    if workers == 1:
+        resultado = _combinar_parciales(map(tarea, lotes), operaciones)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            resultado = _combinar_parciales(executor.map(tarea, lotes), operaciones)
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def _combinar_parciales(parciales: Iterable[Dict[str, Any]],
+                        operaciones: Sequence[str]) -> Dict[str, Any]:
+    """Combina en orden los resultados de cada lote de ``procesar_corpus``."""
+    resultado: Dict[str, Any] = {'documentos': 0, 'caracteres': 0}
+    contador = ContadorPalabras()
+    limpios: Dict[str, str] = {}
+    numeros: Dict[str, List[float]] = {}
+    for parcial in parciales:
+        resultado['documentos'] += parcial['documentos']
+        resultado['caracteres'] += parcial['caracteres']
+        if parcial['contar_palabras'] is not None:
+            contador.fusionar(parcial['contar_palabras'])
+        if parcial['limpiar_texto'] is not None:
+            limpios.update(parcial['limpiar_texto'])
+        if parcial['extraer_numeros'] is not None:
+            numeros.update(parcial['extraer_numeros'])
+    if 'contar_palabras' in operaciones:
+        resultado['contar_palabras'] = contador.a_diccionario()
+    if 'limpiar_texto' in operaciones:
+        resultado['limpiar_texto'] = limpios
+    if 'extraer_numeros' in operaciones:
+        resultado['extraer_numeros'] = numeros
+    return resultado